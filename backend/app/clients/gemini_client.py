@@ -1,28 +1,199 @@
+import asyncio
+import json
+from typing import Dict
 import google.generativeai as genai
-from app.config.settings import GEMINI_API_KEY
+from app.config.settings import (
+    GEMINI_API_KEY, GEMINI_MAX_CONCURRENCY, GEMINI_MAX_RETRIES, GEMINI_RETRY_BASE_DELAY_SECONDS,
+    GEMINI_RETRY_MAX_DELAY_SECONDS, GEMINI_BREAKER_FAILURE_THRESHOLD, GEMINI_BREAKER_COOLDOWN_SECONDS
+)
+from app.core.resilience import (
+    CircuitBreaker, FATAL, RATE_LIMITED, backoff_delay, classify_error, retry_hint
+)
+from app.core.cache import make_cache_key
+from app.exceptions.api_exceptions import AIServiceUnavailableError
 
 class GeminiClient:
-    def __init__(self):
-        if not GEMINI_API_KEY:
-            raise ValueError("GEMINI_API_KEY is not set")
-        genai.configure(api_key=GEMINI_API_KEY)
-        self.model = genai.GenerativeModel('gemini-flash-latest')
+    # Shared by every client instance so the cap applies to the whole worker,
+    # not to each service that happens to own a client.
+    _semaphore: asyncio.Semaphore = None
+    in_flight = 0
+    breaker = CircuitBreaker(GEMINI_BREAKER_FAILURE_THRESHOLD, GEMINI_BREAKER_COOLDOWN_SECONDS)
+    retries = 0
+    # Single-flight: identical concurrent calls share one upstream request
+    _flights: Dict[str, asyncio.Task] = {}
+    calls = 0
+    coalesced = 0
 
-    async def generate_text(self, prompt: str) -> str:
+    def __init__(self, model=None):
+        if model is None:
+            if not GEMINI_API_KEY:
+                raise ValueError("GEMINI_API_KEY is not set")
+            genai.configure(api_key=GEMINI_API_KEY)
+            model = genai.GenerativeModel('gemini-flash-latest')
+        self.model = model
+
+    @classmethod
+    def _get_semaphore(cls) -> asyncio.Semaphore:
+        if cls._semaphore is None:
+            cls._semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        return cls._semaphore
+
+    async def _generate(self, prompt: str, generation_config: dict = None, coalesce: bool = True):
+        """
+        Run one Gemini call, joining an identical call already in flight
+        (same model, prompt and generation config) unless coalesce is False.
+        """
+        GeminiClient.calls += 1
+        if not coalesce:
+            return await self._generate_once(prompt, generation_config)
+
+        key = make_cache_key(getattr(self.model, "model_name", type(self.model).__name__), prompt, generation_config)
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.create_task(self._generate_once(prompt, generation_config))
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            GeminiClient.coalesced += 1
+        # Shielded: a cancelled caller must not cancel the call others are waiting on
+        return await asyncio.shield(task)
+
+    async def _generate_once(self, prompt: str, generation_config: dict = None):
+        """
+        Run one non-blocking Gemini call, waiting for a free slot if the
+        per-worker concurrency cap is reached. Retryable failures are retried
+        with backoff outside the slot.
+        """
+        attempt = 0
+        while True:
+            self._check_breaker()
+            try:
+                async with self._get_semaphore():
+                    GeminiClient.in_flight += 1
+                    try:
+                        response = await self.model.generate_content_async(
+                            prompt,
+                            generation_config=generation_config
+                        )
+                    finally:
+                        GeminiClient.in_flight -= 1
+            except asyncio.CancelledError:
+                # e.g. the losing side of a hedged request; don't hold the probe slot
+                self.breaker.release()
+                raise
+            except Exception as e:
+                await self._handle_failure(e, attempt)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return response
+
+    def _check_breaker(self) -> None:
+        if not self.breaker.allow():
+            raise AIServiceUnavailableError(retry_after=self.breaker.retry_after())
+
+    async def _handle_failure(self, error: Exception, attempt: int) -> None:
+        """
+        Classify a failed call: re-raise fatal errors, fail fast once retries
+        are exhausted, the breaker has opened or the server asks for a longer
+        wait than we allow, and otherwise sleep before the next attempt
+        (server hint or jittered backoff).
+        """
+        kind = classify_error(error)
+        if kind == FATAL:
+            self.breaker.release()
+            raise error
+
+        hint = retry_hint(error)
+        too_long = hint is not None and hint > GEMINI_RETRY_MAX_DELAY_SECONDS
+        # A long server hint opens the breaker for that long: nobody should call before then
+        self.breaker.record_failure(open_for=hint if too_long else None)
+        if attempt >= GEMINI_MAX_RETRIES or too_long or self.breaker.state == CircuitBreaker.OPEN:
+            print(f"Gemini unavailable ({kind}) after {attempt + 1} attempt(s): {error}")
+            raise AIServiceUnavailableError(
+                retry_after=hint or self.breaker.retry_after() or GEMINI_RETRY_BASE_DELAY_SECONDS
+            ) from error
+
+        delay = backoff_delay(attempt, GEMINI_RETRY_BASE_DELAY_SECONDS, GEMINI_RETRY_MAX_DELAY_SECONDS)
+        if hint is not None:
+            delay = max(delay, hint)
+        elif kind == RATE_LIMITED:
+            # Quota errors without a hint: never retry sooner than the base delay
+            delay = max(delay, GEMINI_RETRY_BASE_DELAY_SECONDS)
+        GeminiClient.retries += 1
+        print(f"DEBUG: Gemini {kind}, retrying in {delay:.1f}s (attempt {attempt + 1}/{GEMINI_MAX_RETRIES})")
+        await asyncio.sleep(delay)
+
+    async def generate_text(self, prompt: str, coalesce: bool = True) -> str:
         try:
-            response = self.model.generate_content(prompt)
+            response = await self._generate(prompt, coalesce=coalesce)
             return response.text
         except Exception as e:
             print(f"Error calling Gemini: {e}")
             raise e
 
+    async def stream_text(self, prompt: str):
+        """
+        Yield text chunks as Gemini produces them.
+        Holds a concurrency slot for the whole lifetime of the stream. A call
+        that fails before the first chunk is retried like any other call;
+        once text has been sent, failures are raised to the caller.
+        """
+        attempt = 0
+        while True:
+            self._check_breaker()
+            started = False
+            try:
+                async with self._get_semaphore():
+                    GeminiClient.in_flight += 1
+                    try:
+                        response = await self.model.generate_content_async(prompt, stream=True)
+                        async for chunk in response:
+                            try:
+                                text = chunk.text
+                            except ValueError:
+                                # Chunk without text parts (e.g. finish/safety metadata)
+                                continue
+                            if text:
+                                started = True
+                                yield text
+                    finally:
+                        GeminiClient.in_flight -= 1
+            except (asyncio.CancelledError, GeneratorExit):
+                # Cancelled or client disconnected mid-stream
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if started:
+                    print(f"Error streaming from Gemini: {e}")
+                    if classify_error(e) == FATAL:
+                        self.breaker.release()
+                    else:
+                        self.breaker.record_failure()
+                    raise e
+                await self._handle_failure(e, attempt)
+                attempt += 1
+                continue
+            self.breaker.record_success()
+            return
+
+    @classmethod
+    def stats(cls) -> dict:
+        return {
+            **cls.breaker.stats(),
+            "retries": cls.retries,
+            "in_flight": cls.in_flight,
+            "calls": cls.calls,
+            "coalesced": cls.coalesced,
+            "coalesce_rate": round(cls.coalesced / cls.calls, 3) if cls.calls else 0.0
+        }
+
     async def generate_json(self, prompt: str) -> dict:
         try:
-            response = self.model.generate_content(
+            response = await self._generate(
                 prompt,
                 generation_config={"response_mime_type": "application/json"}
             )
-            import json
             return json.loads(response.text)
         except Exception as e:
             print(f"Error calling Gemini for JSON: {e}")
@@ -0,0 +1,124 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any, Dict
+from urllib.parse import urlparse
+import httpx
+from app.config.settings import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_KEEPALIVE_EXPIRY_SECONDS, HTTP_ENABLE_HTTP2
+)
+
+# Hosts kept in the per-host request counters (least recently used dropped first)
+HOST_STATS_MAX_ENTRIES = 1000
+
+class HttpClientPool:
+    """
+    Application-scoped async HTTP client shared by every outbound fetch.
+    Connections are kept alive and reused across requests; concurrent requests
+    to a single host are capped so one slow shop can't take the whole pool.
+    Started and closed by the FastAPI lifespan; created lazily elsewhere (scripts).
+    """
+
+    def __init__(self):
+        self._client: httpx.AsyncClient = None
+        self.http2 = False
+        self._start_lock = asyncio.Lock()
+        # Only hosts with requests in flight have a semaphore: [semaphore, users]
+        self._host_slots: Dict[str, list] = {}
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+        self.requests_by_host: "OrderedDict[str, int]" = OrderedDict()
+
+    def _http2_available(self) -> bool:
+        if not HTTP_ENABLE_HTTP2:
+            return False
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            print("WARNING: HTTP_ENABLE_HTTP2 is set but the 'h2' package is not installed. Using HTTP/1.1.")
+            return False
+
+    async def start(self) -> None:
+        async with self._start_lock:
+            if self._client is None:
+                self._client = self._create_client()
+                print("HTTP client pool started.")
+
+    def _create_client(self) -> httpx.AsyncClient:
+        self.http2 = self._http2_available()
+        # httpx negotiates gzip/deflate (and br/zstd when those packages are installed)
+        return httpx.AsyncClient(
+            timeout=10.0,
+            follow_redirects=True,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            print("HTTP client pool closed.")
+
+    def _acquire_slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = [asyncio.Semaphore(HTTP_MAX_CONNECTIONS_PER_HOST), 0]
+        slot[1] += 1
+        return slot[0]
+
+    def _release_slot(self, host: str) -> None:
+        slot = self._host_slots[host]
+        slot[1] -= 1
+        if slot[1] == 0:
+            # Nobody holds or waits on it: drop it so idle hosts don't accumulate
+            del self._host_slots[host]
+
+    def _count_host(self, host: str) -> None:
+        self.requests_by_host[host] = self.requests_by_host.get(host, 0) + 1
+        self.requests_by_host.move_to_end(host)
+        while len(self.requests_by_host) > HOST_STATS_MAX_ENTRIES:
+            self.requests_by_host.popitem(last=False)
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        if self._client is None:
+            await self.start()
+        host = urlparse(url).hostname or ""
+        try:
+            async with self._acquire_slot(host):
+                self.in_flight += 1
+                self.requests_total += 1
+                self._count_host(host)
+                try:
+                    return await self._client.request(method, url, **kwargs)
+                except Exception:
+                    self.errors_total += 1
+                    raise
+                finally:
+                    self.in_flight -= 1
+        finally:
+            self._release_slot(host)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        top_hosts = sorted(self.requests_by_host.items(), key=lambda item: item[1], reverse=True)[:10]
+        return {
+            "started": self._client is not None,
+            "http2": self.http2,
+            "requests_in_flight": self.in_flight,
+            "hosts_in_flight": len(self._host_slots),
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "top_hosts": dict(top_hosts)
+        }
+
+
+http_pool = HttpClientPool()
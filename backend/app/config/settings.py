@@ -8,3 +8,91 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 if not GEMINI_API_KEY:
     # Warning or Error - for now just print
     print("WARNING: GEMINI_API_KEY not found in environment variables.")
+
+# Maximum number of Gemini requests allowed in flight per worker process
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+
+# Gemini retries (exponential backoff with jitter, server retry hints honored
+# up to the max delay) and circuit breaker for a saturated upstream
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+GEMINI_RETRY_BASE_DELAY_SECONDS = float(os.getenv("GEMINI_RETRY_BASE_DELAY_SECONDS", "1"))
+GEMINI_RETRY_MAX_DELAY_SECONDS = float(os.getenv("GEMINI_RETRY_MAX_DELAY_SECONDS", "20"))
+GEMINI_BREAKER_FAILURE_THRESHOLD = int(os.getenv("GEMINI_BREAKER_FAILURE_THRESHOLD", "5"))
+GEMINI_BREAKER_COOLDOWN_SECONDS = float(os.getenv("GEMINI_BREAKER_COOLDOWN_SECONDS", "30"))
+
+# Draft generation result cache ("memory" or "firestore")
+DRAFT_CACHE_BACKEND = os.getenv("DRAFT_CACHE_BACKEND", "memory")
+DRAFT_CACHE_TTL_SECONDS = int(os.getenv("DRAFT_CACHE_TTL_SECONDS", "1800"))
+DRAFT_CACHE_MAX_ENTRIES = int(os.getenv("DRAFT_CACHE_MAX_ENTRIES", "256"))
+
+# Website scrape cache: serve fresh until the soft TTL, serve stale while
+# revalidating until the hard TTL, refetch afterwards
+SCRAPE_CACHE_SOFT_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_SOFT_TTL_SECONDS", "900"))
+SCRAPE_CACHE_HARD_TTL_SECONDS = int(os.getenv("SCRAPE_CACHE_HARD_TTL_SECONDS", "86400"))
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "512"))
+
+# Shared outbound HTTP client pool (scraping, logo download)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "6"))
+HTTP_KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30"))
+HTTP_ENABLE_HTTP2 = os.getenv("HTTP_ENABLE_HTTP2", "false").lower() == "true"
+
+# HTML parser for page analysis: auto | selectolax | lxml | html.parser
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "auto")
+
+# Minimum local ranking confidence (0-1) to pick a phone without asking Gemini
+PHONE_LOCAL_CONFIDENCE_THRESHOLD = float(os.getenv("PHONE_LOCAL_CONFIDENCE_THRESHOLD", "0.7"))
+
+# Tone recommendation memo table
+TONE_CACHE_TTL_SECONDS = int(os.getenv("TONE_CACHE_TTL_SECONDS", "86400"))
+TONE_CACHE_MAX_ENTRIES = int(os.getenv("TONE_CACHE_MAX_ENTRIES", "1024"))
+
+# Batch refinement: drafts packed per Gemini call, prompt size cap and parallel calls
+REFINE_BATCH_MAX_ITEMS = int(os.getenv("REFINE_BATCH_MAX_ITEMS", "6"))
+REFINE_BATCH_MAX_CHARS = int(os.getenv("REFINE_BATCH_MAX_CHARS", "4000"))
+REFINE_BATCH_MAX_CONCURRENCY = int(os.getenv("REFINE_BATCH_MAX_CONCURRENCY", "3"))
+
+# Fan-out draft generation: drafts per concurrent group, and hedging of slow
+# groups once they exceed the given latency percentile (default delay until
+# enough samples are collected)
+DRAFT_FANOUT_ENABLED = os.getenv("DRAFT_FANOUT_ENABLED", "false").lower() == "true"
+DRAFT_FANOUT_GROUP_SIZE = max(1, int(os.getenv("DRAFT_FANOUT_GROUP_SIZE", "3")))
+DRAFT_HEDGE_PERCENTILE = float(os.getenv("DRAFT_HEDGE_PERCENTILE", "95"))
+DRAFT_HEDGE_DEFAULT_DELAY_SECONDS = float(os.getenv("DRAFT_HEDGE_DEFAULT_DELAY_SECONDS", "8"))
+
+# Token budgets for the compacted website context in draft and phone prompts
+SCRAPE_CONTEXT_TOKEN_BUDGET = int(os.getenv("SCRAPE_CONTEXT_TOKEN_BUDGET", "500"))
+PHONE_CONTEXT_TOKEN_BUDGET = int(os.getenv("PHONE_CONTEXT_TOKEN_BUDGET", "250"))
+
+# Verified Firebase ID tokens are cached until exp; revocation is rechecked per user at this interval
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_TOKEN_CACHE_MAX_ENTRIES", "10000"))
+AUTH_REVOCATION_CHECK_INTERVAL_SECONDS = int(os.getenv("AUTH_REVOCATION_CHECK_INTERVAL_SECONDS", "300"))
+
+# Worker threads for blocking Firestore calls made from async endpoints
+FIRESTORE_MAX_WORKERS = max(1, int(os.getenv("FIRESTORE_MAX_WORKERS", "16")))
+
+# Cascading deletes wait this long before returning 202 with a job to poll instead of 204
+DELETION_SYNC_WAIT_SECONDS = float(os.getenv("DELETION_SYNC_WAIT_SECONDS", "2"))
+# Running deletion jobs without a batch committed for this long are reported as failed (their process died)
+DELETION_STALE_AFTER_SECONDS = float(os.getenv("DELETION_STALE_AFTER_SECONDS", "120"))
+
+# Campaign status transitions run at the next start/end boundary; this caps the wait
+# so boundaries written by other processes are still picked up
+STATUS_CHECK_MAX_INTERVAL_HOURS = float(os.getenv("STATUS_CHECK_MAX_INTERVAL_HOURS", "6"))
+
+# Only the process holding the scheduler lease runs scheduled jobs; a holder that stops
+# heartbeating loses the lease after the TTL
+SCHEDULER_LEASE_TTL_SECONDS = float(os.getenv("SCHEDULER_LEASE_TTL_SECONDS", "30"))
+SCHEDULER_LEASE_HEARTBEAT_SECONDS = float(os.getenv("SCHEDULER_LEASE_HEARTBEAT_SECONDS", "10"))
+
+# Each scheduled job run is kept in scheduler_runs with expires_at this far ahead,
+# for a Firestore TTL policy to purge
+SCHEDULER_RUN_RETENTION_DAYS = float(os.getenv("SCHEDULER_RUN_RETENTION_DAYS", "14"))
+
+# Page size for list endpoints (campaigns, customers, saved messages)
+LIST_PAGE_SIZE_DEFAULT = int(os.getenv("LIST_PAGE_SIZE_DEFAULT", "50"))
+LIST_PAGE_SIZE_MAX = int(os.getenv("LIST_PAGE_SIZE_MAX", "200"))
+
+# Per-process user preferences cache (writes in this process update it in place)
+PREFERENCES_CACHE_TTL_SECONDS = int(os.getenv("PREFERENCES_CACHE_TTL_SECONDS", "60"))
+PREFERENCES_CACHE_MAX_ENTRIES = int(os.getenv("PREFERENCES_CACHE_MAX_ENTRIES", "1024"))
@@ -1,15 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from datetime import date, timedelta
+from typing import Optional, Dict, Any
 from app.models.campaign_models import (
-    Campaign, CampaignCreate, CampaignUpdate, 
+    Campaign, CampaignCreate, CampaignUpdate, CampaignStatus,
     SavedMessage, SavedMessageCreate
 )
+from app.models.deletion_models import DeletionJob
+from app.models.pagination_models import Page
+from app.core.pagination import parse_fields
+from app.config.settings import LIST_PAGE_SIZE_DEFAULT, LIST_PAGE_SIZE_MAX
 from app.services.campaign_service import CampaignService
+from app.controllers.deletion_controller import deletion_response
 from app.middleware.auth_middleware import get_current_user
 
 router = APIRouter(prefix="/campaigns", tags=["campaigns"])
 campaign_service = CampaignService()
 
+# Fields a list request may project to (id is always included)
+CAMPAIGN_FIELDS = set(Campaign.model_fields) - {"id"}
+MESSAGE_FIELDS = set(SavedMessage.model_fields) - {"id"}
+
 @router.post("/", response_model=Campaign, status_code=status.HTTP_201_CREATED)
 async def create_campaign(
     campaign_data: CampaignCreate,
@@ -20,22 +30,31 @@ async def create_campaign(
     """
     return await campaign_service.create_campaign(campaign_data, user["uid"])
 
-@router.get("/", response_model=List[Campaign])
+@router.get("/", response_model=Page[Campaign])
 async def list_campaigns(
     customer_id: Optional[str] = None,
+    status: Optional[CampaignStatus] = None,
+    limit: int = Query(LIST_PAGE_SIZE_DEFAULT, ge=1, le=LIST_PAGE_SIZE_MAX),
+    page_token: Optional[str] = None,
+    fields: Optional[str] = None,
     user: dict = Depends(get_current_user)
 ):
     """
-    List all campaigns belonging to the authenticated user.
-    Optionally filter by customer_id.
+    List the authenticated user's campaigns, newest first, one page at a time.
+    Optionally filter by customer_id and/or status. fields (comma-separated)
+    limits each item to those fields plus id; pass next_page_token back as
+    page_token.
     """
     try:
-        return campaign_service.get_campaigns(user["uid"], customer_id)
+        field_list = parse_fields(fields, CAMPAIGN_FIELDS)
+        return await campaign_service.get_campaigns(user["uid"], customer_id, limit, page_token, field_list, status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         if "FAILED_PRECONDITION" in str(e):
              raise HTTPException(
                 status_code=500,
-                detail="This query requires a Firestore index. Check the server logs for the creation link."
+                detail="This query requires a Firestore index (see backend/firestore.indexes.json)."
             )
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -47,7 +66,26 @@ async def get_weekly_trend(
     Get weekly message production trend for the authenticated user.
     Returns message counts aggregated by day for the last 7 days.
     """
-    return campaign_service.get_weekly_trend(user["uid"])
+    return await campaign_service.get_weekly_trend(user["uid"])
+
+@router.get("/analytics/summary", response_model=Dict[str, Any])
+async def get_campaign_analytics(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    granularity: str = "day",
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get campaign counts for a date range: total, by status, by customer and
+    a day/week/month series of campaigns created.
+    Defaults to the last 30 days.
+    """
+    end = end or date.today()
+    start = start or end - timedelta(days=29)
+    try:
+        return await campaign_service.get_campaign_analytics(user["uid"], start, end, granularity)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/analytics/campaign-stats", response_model=Dict[str, Any])
 async def get_campaign_stats(
@@ -57,7 +95,7 @@ async def get_campaign_stats(
     Get campaign statistics including growth trend.
     Compares this month's campaign count vs last month's.
     """
-    return campaign_service.get_campaign_stats(user["uid"])
+    return await campaign_service.get_campaign_stats(user["uid"])
 
 @router.get("/{campaign_id}", response_model=Campaign)
 async def get_campaign(
@@ -67,7 +105,7 @@ async def get_campaign(
     """
     Get details of a specific campaign.
     """
-    campaign = campaign_service.get_campaign(campaign_id, user["uid"])
+    campaign = await campaign_service.get_campaign(campaign_id, user["uid"])
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
@@ -81,23 +119,25 @@ async def update_campaign(
     """
     Update a campaign's information.
     """
-    campaign = campaign_service.update_campaign(campaign_id, campaign_data, user["uid"])
+    campaign = await campaign_service.update_campaign(campaign_id, campaign_data, user["uid"])
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found or unauthorized")
     return campaign
 
-@router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{campaign_id}", status_code=status.HTTP_204_NO_CONTENT, responses={202: {"model": DeletionJob}})
 async def delete_campaign(
     campaign_id: str,
     user: dict = Depends(get_current_user)
 ):
     """
     Delete a campaign and its saved messages.
+    Large campaigns continue in the background: 202 with a job to poll at
+    GET /deletions/{job_id}.
     """
-    success = campaign_service.delete_campaign(campaign_id, user["uid"])
-    if not success:
+    job = await campaign_service.delete_campaign(campaign_id, user["uid"])
+    if not job:
         raise HTTPException(status_code=404, detail="Campaign not found or unauthorized")
-    return None
+    return deletion_response(job)
 
 @router.post("/{campaign_id}/messages", response_model=SavedMessage, status_code=status.HTTP_201_CREATED)
 async def save_message(
@@ -113,15 +153,22 @@ async def save_message(
         raise HTTPException(status_code=404, detail="Campaign not found or unauthorized")
     return message
 
-@router.get("/{campaign_id}/messages", response_model=List[SavedMessage])
+@router.get("/{campaign_id}/messages", response_model=Page[SavedMessage])
 async def list_saved_messages(
     campaign_id: str,
+    limit: int = Query(LIST_PAGE_SIZE_DEFAULT, ge=1, le=LIST_PAGE_SIZE_MAX),
+    page_token: Optional[str] = None,
+    fields: Optional[str] = None,
     user: dict = Depends(get_current_user)
 ):
     """
-    List all saved messages for a specific campaign.
+    List a campaign's saved messages, newest first, one page at a time.
     """
-    return campaign_service.get_saved_messages(campaign_id, user["uid"])
+    try:
+        field_list = parse_fields(fields, MESSAGE_FIELDS)
+        return await campaign_service.get_saved_messages(campaign_id, user["uid"], limit, page_token, field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{campaign_id}/messages/{message_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_saved_message(
@@ -132,7 +179,7 @@ async def delete_saved_message(
     """
     Delete a saved message from a campaign.
     """
-    success = campaign_service.delete_saved_message(campaign_id, message_id, user["uid"])
+    success = await campaign_service.delete_saved_message(campaign_id, message_id, user["uid"])
     if not success:
         raise HTTPException(status_code=404, detail="Message/Campaign not found or unauthorized")
     return None
@@ -1,35 +1,65 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
-from app.models.customer_models import Customer, CustomerCreate, CustomerUpdate
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from typing import Optional
+from app.models.customer_models import Customer, CustomerCreate, CustomerUpdate, CustomerEnrichment
+from app.models.deletion_models import DeletionJob
+from app.models.pagination_models import Page
+from app.core.pagination import parse_fields
+from app.config.settings import LIST_PAGE_SIZE_DEFAULT, LIST_PAGE_SIZE_MAX
 from app.services.customer_service import CustomerService
+from app.controllers.deletion_controller import deletion_response
 from app.middleware.auth_middleware import get_current_user
 
 router = APIRouter(prefix="/customers", tags=["customers"])
 customer_service = CustomerService()
 
+# Fields a list request may project to (id is always included)
+CUSTOMER_FIELDS = set(Customer.model_fields) - {"id"}
+
 @router.post("/", response_model=Customer, status_code=status.HTTP_201_CREATED)
 async def create_customer(
     customer_data: CustomerCreate,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
     Create a new customer for the authenticated user.
+    Logo and phone enrichment continue in the background; poll
+    GET /customers/{customer_id}/enrichment for completion.
     """
-    return await customer_service.create_customer(customer_data, user["uid"])
+    customer = await customer_service.create_customer(customer_data, user["uid"])
+    background_tasks.add_task(
+        customer_service.enrich_customer,
+        customer.id,
+        customer.website_url,
+        not customer.phone_number
+    )
+    return customer
 
-@router.get("/", response_model=List[Customer])
-async def list_customers(user: dict = Depends(get_current_user)):
+@router.get("/", response_model=Page[Customer])
+async def list_customers(
+    limit: int = Query(LIST_PAGE_SIZE_DEFAULT, ge=1, le=LIST_PAGE_SIZE_MAX),
+    page_token: Optional[str] = None,
+    fields: Optional[str] = None,
+    sort: str = "created_at",
+    user: dict = Depends(get_current_user)
+):
     """
-    List all customers belonging to the authenticated user.
+    List the authenticated user's customers one page at a time, oldest first
+    or by sort (created_at, -created_at or name). fields (comma-separated)
+    limits each item to those fields plus id; pass next_page_token back as
+    page_token with the same sort.
     """
     try:
-        return customer_service.get_customers(user["uid"])
+        field_list = parse_fields(fields, CUSTOMER_FIELDS)
+        return await customer_service.get_customers(user["uid"], limit, page_token, field_list, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Handle cases where Firestore index is needed but not yet created
         if "FAILED_PRECONDITION" in str(e):
              raise HTTPException(
                 status_code=500,
-                detail="This query requires a Firestore index. Check the server logs for the creation link."
+                detail="This query requires a Firestore index (see backend/firestore.indexes.json)."
             )
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -41,11 +71,24 @@ async def get_customer(
     """
     Get details of a specific customer.
     """
-    customer = customer_service.get_customer(customer_id, user["uid"])
+    customer = await customer_service.get_customer(customer_id, user["uid"])
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
     return customer
 
+@router.get("/{customer_id}/enrichment", response_model=CustomerEnrichment)
+async def get_customer_enrichment(
+    customer_id: str,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get the background enrichment status (logo/phone) of a customer.
+    """
+    enrichment = await customer_service.get_enrichment(customer_id, user["uid"])
+    if not enrichment:
+        raise HTTPException(status_code=404, detail="Customer not found")
+    return enrichment
+
 @router.put("/{customer_id}", response_model=Customer)
 async def update_customer(
     customer_id: str,
@@ -55,20 +98,22 @@ async def update_customer(
     """
     Update a customer's information.
     """
-    customer = customer_service.update_customer(customer_id, customer_data, user["uid"])
+    customer = await customer_service.update_customer(customer_id, customer_data, user["uid"])
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found or unauthorized")
     return customer
 
-@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{customer_id}", status_code=status.HTTP_204_NO_CONTENT, responses={202: {"model": DeletionJob}})
 async def delete_customer(
     customer_id: str,
     user: dict = Depends(get_current_user)
 ):
     """
-    Delete a customer.
+    Delete a customer with its campaigns and their saved messages.
+    Large trees continue in the background: 202 with a job to poll at
+    GET /deletions/{job_id}.
     """
-    success = customer_service.delete_customer(customer_id, user["uid"])
-    if not success:
+    job = await customer_service.delete_customer(customer_id, user["uid"])
+    if not job:
         raise HTTPException(status_code=404, detail="Customer not found or unauthorized")
-    return None
+    return deletion_response(job)
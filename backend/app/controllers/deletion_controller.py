@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.models.deletion_models import DeletionJob, DeletionStatus
+from app.services.deletion_service import DeletionService
+from app.middleware.auth_middleware import get_current_user
+
+router = APIRouter(prefix="/deletions", tags=["deletions"])
+deletion_service = DeletionService()
+
+
+def deletion_response(job: DeletionJob) -> Response:
+    """
+    204 once the cascade has finished, 202 with the job while it continues
+    in the background.
+    """
+    if job.status == DeletionStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Deletion failed: {job.error}")
+    if job.status == DeletionStatus.RUNNING:
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=jsonable_encoder(job))
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/{job_id}", response_model=DeletionJob)
+async def get_deletion_job(
+    job_id: str,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Get the progress of a background cascading delete.
+    """
+    job = await deletion_service.get_job(job_id, user["uid"])
+    if not job:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    return job
@@ -1,8 +1,11 @@
+from typing import List
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from app.middleware.auth_middleware import get_current_user
-from app.models.request_models import SMSRequest, RefineRequest
+from app.models.request_models import SMSRequest, RefineRequest, BatchRefineRequest
 from app.models.response_models import SMSResponse, SMSDraft
 from app.services.sms_service import SMSService
+from app.exceptions.api_exceptions import AIServiceUnavailableError
 
 router = APIRouter()
 sms_service = SMSService()
@@ -11,13 +14,59 @@ sms_service = SMSService()
 async def generate_sms(request: SMSRequest, user: dict = Depends(get_current_user)):
     try:
         return await sms_service.generate_campaign_drafts(request, user["uid"])
+    except AIServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/generate-sms/stream")
+async def generate_sms_stream(request: SMSRequest, user: dict = Depends(get_current_user)):
+    """
+    Stream SMS drafts as Server-Sent Events.
+    Emits a "draft" event per completed draft and a final "done" event
+    carrying the recommended draft index; failures are sent as an "error" event.
+    """
+    return StreamingResponse(
+        sms_service.stream_campaign_drafts(request, user["uid"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/generate-sms/cache-stats")
+async def get_draft_cache_stats(user: dict = Depends(get_current_user)):
+    return sms_service.draft_cache.stats()
+
+@router.get("/generate-sms/context-stats")
+async def get_context_stats(user: dict = Depends(get_current_user)):
+    return sms_service.scraper.compactor.stats()
+
+@router.get("/generate-sms/parser-stats")
+async def get_parser_stats(user: dict = Depends(get_current_user)):
+    return sms_service.parser.stats()
+
+@router.get("/generate-sms/fanout-stats")
+async def get_fanout_stats(user: dict = Depends(get_current_user)):
+    return sms_service.hedger.stats()
+
 @router.post("/refine-sms", response_model=SMSDraft)
 async def refine_sms(request: RefineRequest, user: dict = Depends(get_current_user)):
     try:
         return await sms_service.refine_sms_draft(request)
+    except AIServiceUnavailableError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/refine-sms/batch", response_model=List[SMSDraft])
+async def refine_sms_batch(request: BatchRefineRequest, user: dict = Depends(get_current_user)):
+    """
+    Refine several drafts (or one draft with several actions) in as few
+    AI calls as possible. Drafts are returned in the request order.
+    """
+    try:
+        return await sms_service.refine_sms_drafts(request.items)
+    except AIServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -40,5 +89,11 @@ async def get_tone_recommendations(
             audience
         )
         return {"recommendations": recs}
+    except AIServiceUnavailableError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/tone-recommendations/stats")
+async def get_tone_recommendation_stats(user: dict = Depends(get_current_user)):
+    return sms_service.tone_recommender.stats()
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from app.core.executor import firestore_executor
+
+
+def make_cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from JSON-serializable parts.
+    """
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class CacheBackend:
+    """
+    Minimal key/value interface shared by every cache backend.
+    Values are plain dicts so they can be stored outside the process.
+    Backends whose calls block on network I/O set blocking = True.
+    """
+    blocking = False
+
+    def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Per-process cache with TTL expiry and LRU eviction once max_entries is reached.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class FirestoreCache(CacheBackend):
+    """
+    Cache shared by every worker and replica, stored in a Firestore collection.
+    Point FIRESTORE_EMULATOR_HOST at a local emulator to run it without a project.
+    Expired documents are ignored on read; a Firestore TTL policy on `expires_at`
+    can purge them.
+    """
+    # Every call is a synchronous Firestore RPC
+    blocking = True
+
+    def __init__(self, collection_name: str):
+        from firebase_admin import firestore
+        self.collection = firestore.client().collection(collection_name)
+
+    def get(self, key: str) -> Optional[dict]:
+        doc = self.collection.document(key).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        expires_at = data.get("expires_at")
+        if not expires_at or expires_at <= datetime.now(timezone.utc):
+            return None
+        return data.get("value")
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        self.collection.document(key).set({
+            "value": value,
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=ttl)
+        })
+
+    def delete(self, key: str) -> None:
+        self.collection.document(key).delete()
+
+
+def create_cache_backend(backend: str, max_entries: int, collection_name: str) -> CacheBackend:
+    """
+    Build the configured backend ("memory" or "firestore").
+    """
+    if backend == "firestore":
+        return FirestoreCache(collection_name)
+    return InMemoryCache(max_entries=max_entries)
+
+
+class ResultCache:
+    """
+    Cache front-end with a fixed TTL and hit/miss/bypass counters.
+    Backend failures are logged and treated as misses so they never break a request.
+    Counters are updated from firestore_executor threads, so they take a lock.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float):
+        self.backend = backend
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            print(f"Cache read error: {e}")
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: dict) -> None:
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            print(f"Cache write error: {e}")
+
+    def invalidate(self, key: str) -> None:
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            print(f"Cache delete error: {e}")
+
+    async def get_async(self, key: str) -> Optional[dict]:
+        """
+        get() for async callers: blocking backends run on firestore_executor
+        so a remote lookup doesn't stall the event loop.
+        """
+        if not self.backend.blocking:
+            return self.get(key)
+        return await firestore_executor.run(self.get, key)
+
+    async def set_async(self, key: str, value: dict) -> None:
+        if not self.backend.blocking:
+            return self.set(key, value)
+        await firestore_executor.run(self.set, key, value)
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypasses += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses, bypasses = self.hits, self.misses, self.bypasses
+        lookups = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "bypasses": bypasses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0
+        }
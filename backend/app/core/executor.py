@@ -0,0 +1,66 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from app.config.settings import FIRESTORE_MAX_WORKERS
+
+
+class BlockingExecutor:
+    """
+    Bounded thread pool for blocking client libraries.
+    run() awaits a synchronous call on a worker thread so the event loop keeps
+    serving other requests meanwhile. At most max_workers calls run at once;
+    the rest wait in the pool's queue, which also caps concurrent upstream RPCs.
+    """
+
+    def __init__(self, max_workers: int, name: str):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.running = 0
+        self.completed = 0
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self.submitted += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, functools.partial(self._call, func, *args, **kwargs))
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            self.running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": self.submitted - self.completed - self.running,
+                "completed": self.completed
+            }
+
+
+# Firestore's Python SDK is synchronous; services run their reads and writes here
+firestore_executor = BlockingExecutor(FIRESTORE_MAX_WORKERS, "firestore")
+
+
+def firestore_io(func: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Turn a blocking Firestore function or method into a coroutine function
+    that runs it on firestore_executor.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await firestore_executor.run(func, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,104 @@
+import asyncio
+import math
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent call latencies (seconds) with percentile lookup.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Return the p-th percentile (0-100), or None until min_samples calls
+        have been recorded.
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, math.ceil(p / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+class Hedger:
+    """
+    Hedged requests: if a call has not finished after the tracked latency
+    percentile, a duplicate is started and whichever finishes first wins.
+    At most one duplicate is sent per call.
+    """
+
+    def __init__(self, percentile: float, default_delay: float, tracker: LatencyTracker = None):
+        self.percentile = percentile
+        self.default_delay = default_delay
+        self.tracker = tracker if tracker is not None else LatencyTracker()
+        self.calls = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def hedge_delay(self) -> float:
+        delay = self.tracker.percentile(self.percentile)
+        return self.default_delay if delay is None else delay
+
+    async def run(self, make_call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await make_call(), hedging with a second make_call() when the first is
+        slow. If the winner raised, the other attempt's result is used instead.
+        """
+        self.calls += 1
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        primary = asyncio.ensure_future(make_call())
+        pending = {primary}
+        error = None
+        try:
+            # Cancelling the caller (e.g. an SSE client disconnecting) at any await
+            # cancels whichever attempts are still running
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay())
+            if done:
+                if primary.exception() is None:
+                    self.tracker.record(loop.time() - started)
+                return primary.result()
+
+            self.hedges_sent += 1
+            hedge = asyncio.ensure_future(make_call())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        # Time since the primary started: the primary's latency, or a
+                        # lower bound of it when the hedge won
+                        self.tracker.record(loop.time() - started)
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "hedges_sent": self.hedges_sent,
+            "hedges_won": self.hedges_won,
+            "hedge_rate": round(self.hedges_sent / self.calls, 3) if self.calls else 0.0,
+            "hedge_delay_seconds": round(self.hedge_delay(), 3),
+            "latency_samples": len(self.tracker)
+        }
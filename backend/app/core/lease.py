@@ -0,0 +1,115 @@
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+from firebase_admin import firestore
+
+
+class FirestoreLease:
+    """
+    Leader election through a lease document in Firestore.
+
+    Every process heartbeats the same lease document: in a transaction, it
+    takes the lease if it is free or expired, or extends it if it already
+    holds it. The holder considers itself leader until its own last renewal
+    plus the TTL, minus one heartbeat of margin, so a leader that stops
+    heartbeating (crash, network partition) stops acting before another
+    process can take over. Expiry times use wall clocks, so hosts need
+    roughly synchronized time (well under the heartbeat margin).
+    """
+
+    def __init__(self, name: str, ttl: float, heartbeat_interval: float):
+        self.name = name
+        self.ttl = ttl
+        self.heartbeat_interval = heartbeat_interval
+        self.holder_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.db = firestore.client()
+        self.ref = self.db.collection("scheduler_leases").document(name)
+        self._leader_until = 0.0
+        self._on_elected: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+        self.times_elected = 0
+        self.heartbeat_failures = 0
+
+    def start(self, scheduler, on_elected: Callable[[], None] = None) -> None:
+        """
+        Heartbeat on the given APScheduler scheduler, starting now.
+        on_elected runs each time this process becomes leader.
+        """
+        self._on_elected = on_elected
+        scheduler.add_job(self.heartbeat, "interval", seconds=self.heartbeat_interval,
+                          id=f"lease_{self.name}", next_run_time=datetime.now(), replace_existing=True)
+
+    def is_leader(self) -> bool:
+        return time.time() < self._leader_until
+
+    def heartbeat(self) -> None:
+        was_leader = self.is_leader()
+        started = time.time()
+        try:
+            held = self._claim(self.db.transaction(), started)
+        except Exception as e:
+            self.heartbeat_failures += 1
+            print(f"Lease '{self.name}' heartbeat failed: {e}")
+            return
+
+        with self._lock:
+            self._leader_until = started + self.ttl - self.heartbeat_interval if held else 0.0
+        if held and not was_leader:
+            self.times_elected += 1
+            print(f"Lease '{self.name}' acquired by {self.holder_id}")
+            if self._on_elected:
+                self._on_elected()
+        elif was_leader and not held:
+            print(f"Lease '{self.name}' lost by {self.holder_id}")
+
+    def _claim(self, transaction, now: float) -> bool:
+        @firestore.transactional
+        def claim(transaction) -> bool:
+            snapshot = self.ref.get(transaction=transaction)
+            lease = snapshot.to_dict() if snapshot.exists else {}
+            holder = lease.get("holder")
+            if holder not in (None, self.holder_id) and lease.get("expires_at", 0) > now:
+                return False
+            transaction.set(self.ref, {
+                "holder": self.holder_id,
+                "expires_at": now + self.ttl,
+                "heartbeat_at": now,
+                "acquired_at": lease.get("acquired_at", now) if holder == self.holder_id else now
+            })
+            return True
+        return claim(transaction)
+
+    def release(self) -> None:
+        """
+        Give the lease up (on shutdown) so another process can take over
+        without waiting for the TTL.
+        """
+        if not self.is_leader():
+            return
+        self._leader_until = 0.0
+
+        @firestore.transactional
+        def release(transaction) -> None:
+            snapshot = self.ref.get(transaction=transaction)
+            if snapshot.exists and snapshot.to_dict().get("holder") == self.holder_id:
+                transaction.delete(self.ref)
+        try:
+            release(self.db.transaction())
+            print(f"Lease '{self.name}' released by {self.holder_id}")
+        except Exception as e:
+            print(f"Lease '{self.name}' release failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "holder_id": self.holder_id,
+            "is_leader": self.is_leader(),
+            "leader_for_seconds": round(max(0.0, self._leader_until - time.time()), 1),
+            "times_elected": self.times_elected,
+            "heartbeat_failures": self.heartbeat_failures
+        }
+
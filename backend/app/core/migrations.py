@@ -0,0 +1,50 @@
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Set
+from firebase_admin import firestore
+
+
+class MigrationMarkers:
+    """
+    Completion markers for one-off data migrations: one document per
+    migration in the migrations collection, written once it has finished.
+    Finished migrations are remembered in memory, so checking them again
+    costs no read.
+    """
+
+    def __init__(self):
+        self.collection = firestore.client().collection("migrations")
+        self._done: Set[str] = set()
+
+    def is_done(self, name: str) -> bool:
+        if name in self._done:
+            return True
+        if self.collection.document(name).get().exists:
+            self._done.add(name)
+            return True
+        return False
+
+    def mark_done(self, name: str, result: Dict[str, Any] = None, duration: float = None) -> None:
+        self.collection.document(name).set({
+            "completed_at": datetime.now(),
+            "duration_ms": round(duration * 1000) if duration is not None else None,
+            "result": result or {}
+        })
+        self._done.add(name)
+
+    def run_once(self, name: str, migrate: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Run migrate() unless the migration has finished before, and mark it
+        finished. Returns its result, or None if it had already run.
+        Migrations must be safe to rerun: one interrupted before it was
+        marked runs again from the start.
+        """
+        if self.is_done(name):
+            return None
+        print(f"Running data migration '{name}'...")
+        started = time.perf_counter()
+        result = migrate()
+        duration = time.perf_counter() - started
+        self.mark_done(name, result, duration)
+        print(f"Data migration '{name}' finished in {duration:.1f}s: {result}")
+        return result
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from google.cloud.firestore_v1.field_path import FieldPath
+
+
+def encode_page_token(order_value: Union[datetime, str], doc_id: str) -> str:
+    """
+    Opaque cursor: the last item's sort value (a timestamp or a string) and
+    document id.
+    """
+    if isinstance(order_value, datetime):
+        raw = json.dumps([order_value.isoformat(), doc_id])
+    else:
+        raw = json.dumps([order_value, doc_id, "s"])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_page_token(token: str) -> Tuple[Union[datetime, str], str]:
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        order_value, doc_id, *kind = json.loads(raw)
+        if kind == ["s"]:
+            return str(order_value), str(doc_id)
+        return datetime.fromisoformat(order_value), str(doc_id)
+    except Exception:
+        raise ValueError("Invalid page_token")
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated field projection, rejecting unknown fields.
+    None means all fields.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def fetch_page(
+    query,
+    order_field: str,
+    direction: str,
+    limit: int,
+    page_token: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Tuple[list, Optional[str]]:
+    """
+    Read one page of a query ordered by order_field, then document id for
+    ties, both in the given direction. Reads one document past the page to
+    know whether another page exists.
+
+    The caller's filters plus this ordering need a composite index (see
+    firestore.indexes.json). With fields, only those fields (and the sort
+    field, needed for the cursor) are fetched.
+
+    Returns the page's snapshots and the token for the next page, if any.
+    """
+    query = query.order_by(order_field, direction=direction).order_by(FieldPath.document_id(), direction=direction)
+    if fields is not None:
+        query = query.select(sorted(set(fields) | {order_field}))
+    if page_token:
+        order_value, doc_id = decode_page_token(page_token)
+        query = query.start_after({order_field: order_value, FieldPath.document_id(): doc_id})
+
+    docs = list(query.limit(limit + 1).stream())
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_page_token(docs[-1].get(order_field), docs[-1].id)
+
+
+def project(doc, fields: List[str]) -> Dict[str, Any]:
+    """
+    A projected document as a plain dict: its id plus the requested fields.
+    """
+    data = doc.to_dict()
+    return {"id": doc.id, **{f: data.get(f) for f in fields}}
@@ -0,0 +1,128 @@
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Error classes
+RATE_LIMITED = "rate_limited"
+UNAVAILABLE = "unavailable"
+FATAL = "fatal"
+
+_STATUS_CLASSES = {429: RATE_LIMITED, 500: UNAVAILABLE, 502: UNAVAILABLE, 503: UNAVAILABLE, 504: UNAVAILABLE}
+_STATUS_IN_MESSAGE = re.compile(r'\b(429|500|502|503|504)\b')
+# "Please retry in 37.5s." or a serialized RetryInfo "retry_delay { seconds: 37 }"
+_RETRY_IN_MESSAGE = re.compile(r'retry in (\d+(?:\.\d+)?)\s*s|retry_delay\s*\{\s*seconds:\s*(\d+)', re.IGNORECASE)
+
+
+def classify_error(error: Exception) -> str:
+    """
+    Sort an upstream error into RATE_LIMITED, UNAVAILABLE (both retryable)
+    or FATAL (bad request, auth, blocked content: retrying can't help).
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return UNAVAILABLE
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return _STATUS_CLASSES.get(code, FATAL)
+    match = _STATUS_IN_MESSAGE.search(str(error))
+    if match:
+        return _STATUS_CLASSES[int(match.group(1))]
+    return FATAL
+
+
+def retry_hint(error: Exception) -> Optional[float]:
+    """
+    Return the delay (seconds) the server asked for before retrying, if any.
+    """
+    for detail in getattr(error, "details", None) or []:
+        delay = getattr(detail, "retry_delay", None)
+        if delay is not None and hasattr(delay, "seconds"):
+            return delay.seconds + getattr(delay, "nanos", 0) / 1e9
+    match = _RETRY_IN_MESSAGE.search(str(error))
+    if match:
+        return float(match.group(1) or match.group(2))
+    return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Exponential backoff with full jitter for the given retry attempt (0-based).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+    Opens after failure_threshold retryable failures in a row and rejects
+    calls for the cooldown (or longer, if the server asked for it); then lets
+    a single probe through and closes again if the probe succeeds.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, cooldown: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_until = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_until - time.monotonic())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() < self.opened_until:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self, open_for: Optional[float] = None) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold or open_for:
+                self._open(max(self.cooldown, open_for or 0.0))
+            self._probe_in_flight = False
+
+    def release(self) -> None:
+        """
+        End a call that neither proved nor disproved upstream health (e.g. a
+        rejected prompt), freeing the half-open probe slot.
+        """
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _open(self, duration: float) -> None:
+        if self.state != self.OPEN:
+            self.times_opened += 1
+        self.state = self.OPEN
+        self.opened_until = max(self.opened_until, time.monotonic() + duration)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
@@ -1,7 +1,36 @@
+import math
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
+
+class AIServiceUnavailableError(Exception):
+    """
+    The AI upstream is rate limited or down and calls are failing fast.
+    Served as 503 with a Retry-After header.
+    """
+
+    def __init__(self, message: str = "AI servisi şu anda yoğun, lütfen biraz sonra tekrar deneyin.", retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class EnrichmentStepError(Exception):
+    """
+    A background enrichment step (logo, phone) could not complete.
+    Recorded on the customer as enrichment_error; never served.
+    """
+
+
 def register_exceptions(app: FastAPI):
+    @app.exception_handler(AIServiceUnavailableError)
+    async def ai_unavailable_handler(request: Request, exc: AIServiceUnavailableError):
+        headers = {"Retry-After": str(math.ceil(exc.retry_after))} if exc.retry_after else None
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers=headers,
+        )
+
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         print(f"CRITICAL ERROR: {str(exc)}")  # Log internally
@@ -1,4 +1,4 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -9,6 +9,14 @@ from app.core.limiter import limiter
 from contextlib import asynccontextmanager
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.services.campaign_service import CampaignService
+from app.services.status_scheduler import status_scheduler
+from app.clients.http_client import http_pool
+from app.clients.gemini_client import GeminiClient
+from app.middleware.auth_middleware import get_current_user, token_verifier
+from app.core.executor import firestore_executor
+from app.services.user_preferences_service import UserPreferencesService
+from app.core.lease import FirestoreLease
+from app.config.settings import SCHEDULER_LEASE_TTL_SECONDS, SCHEDULER_LEASE_HEARTBEAT_SECONDS
 
 # Initialize Firebase Admin SDK before importing controllers
 initialize_firebase()
@@ -18,26 +26,31 @@ scheduler = BackgroundScheduler()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Schedule the status check job
+    # Startup: Open the shared outbound HTTP client pool
+    await http_pool.start()
+
+    # Schedule the status check job
     campaign_service = CampaignService()
-    
-    # Run immediately on startup
-    scheduler.add_job(campaign_service.check_and_update_statuses, 'date')
-    
-    # Run every hour
-    scheduler.add_job(campaign_service.check_and_update_statuses, 'interval', hours=1)
+    # Every worker runs the scheduler, but only the lease holder runs its jobs
+    lease = FirestoreLease("campaign_scheduler", SCHEDULER_LEASE_TTL_SECONDS, SCHEDULER_LEASE_HEARTBEAT_SECONDS)
     
     scheduler.start()
-    print("Scheduler started: Campaign status automation active (Immediate check triggered).")
+    # Run as soon as this process holds the lease, then at each next start/end boundary
+    status_scheduler.start(scheduler, campaign_service.run_scheduled_maintenance, lease=lease)
+    print("Scheduler started: Campaign status automation active (runs on the lease holder).")
     yield
     # Shutdown
     scheduler.shutdown()
+    lease.release()
     print("Scheduler shut down.")
+    await http_pool.close()
+    firestore_executor.shutdown()
 
 from app.controllers.sms_controller import router as sms_router
 from app.controllers.auth_controller import router as auth_router
 from app.controllers.customer_controller import router as customer_router
 from app.controllers.campaign_controller import router as campaign_router
+from app.controllers.deletion_controller import router as deletion_router
 from app.exceptions.api_exceptions import register_exceptions
 
 app = FastAPI(
@@ -78,6 +91,7 @@ app.include_router(sms_router)
 app.include_router(auth_router)
 app.include_router(customer_router)
 app.include_router(campaign_router)
+app.include_router(deletion_router)
 register_exceptions(app)
 
 @app.get("/")
@@ -87,3 +101,28 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/http-pool")
+async def http_pool_stats(user: dict = Depends(get_current_user)):
+    return http_pool.stats()
+
+@app.get("/health/gemini")
+async def gemini_stats(user: dict = Depends(get_current_user)):
+    return GeminiClient.stats()
+
+@app.get("/health/auth")
+async def auth_cache_stats(user: dict = Depends(get_current_user)):
+    return token_verifier.stats()
+
+@app.get("/health/firestore")
+async def firestore_executor_stats(user: dict = Depends(get_current_user)):
+    return firestore_executor.stats()
+
+@app.get("/health/preferences-cache")
+async def preferences_cache_stats(user: dict = Depends(get_current_user)):
+    return UserPreferencesService.cache_stats()
+
+@app.get("/health/scheduler")
+async def scheduler_stats(user: dict = Depends(get_current_user)):
+    # Run history is read from Firestore
+    return await firestore_executor.run(status_scheduler.stats)
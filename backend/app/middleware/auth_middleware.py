@@ -1,6 +1,100 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict
 from fastapi import Request, HTTPException, Depends
 from firebase_admin import auth
 import firebase_admin
+from app.core.cache import InMemoryCache
+from app.config.settings import AUTH_TOKEN_CACHE_MAX_ENTRIES, AUTH_REVOCATION_CHECK_INTERVAL_SECONDS
+
+
+class CachedTokenVerifier:
+    """
+    Firebase ID-token verification with a verified-token cache.
+
+    A token is verified once (signature and claims, against the public keys
+    cached by the default Firebase app's client, which every request shares)
+    and then served from cache, keyed by its hash, until its exp. Revocation
+    and disabled-user checks cost a Firebase round trip, so they run at most
+    once per AUTH_REVOCATION_CHECK_INTERVAL_SECONDS per user instead of on
+    every request. Firebase SDK calls are blocking and run in a worker
+    thread; concurrent requests carrying the same token share one verification.
+    """
+
+    def __init__(self):
+        self._tokens = InMemoryCache(max_entries=AUTH_TOKEN_CACHE_MAX_ENTRIES)
+        # uid -> time of the last passed revocation check
+        self._revocation_checked: Dict[str, float] = {}
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revocation_checks = 0
+
+    async def verify(self, token: str) -> dict:
+        key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self._tokens.get(key)
+        if claims is not None:
+            self.hits += 1
+            if self._revocation_due(claims["uid"]):
+                await self._shared(key, lambda: self._check_revoked(key, claims))
+            return claims
+
+        self.misses += 1
+        return await self._shared(key, lambda: self._verify_and_store(key, token))
+
+    async def _shared(self, key: str, make_call):
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(make_call())
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _revocation_due(self, uid: str) -> bool:
+        checked_at = self._revocation_checked.get(uid)
+        return checked_at is None or time.monotonic() - checked_at >= AUTH_REVOCATION_CHECK_INTERVAL_SECONDS
+
+    async def _verify_and_store(self, key: str, token: str) -> dict:
+        claims = await asyncio.to_thread(auth.verify_id_token, token)
+        if self._revocation_due(claims["uid"]):
+            await self._check_revoked(key, claims)
+        ttl = claims["exp"] - time.time()
+        if ttl > 0:
+            self._tokens.set(key, claims, ttl)
+        return claims
+
+    async def _check_revoked(self, key: str, claims: dict) -> dict:
+        """
+        Same checks as verify_id_token(check_revoked=True): the user must not
+        be disabled and the token must be issued after the last revocation.
+        """
+        self.revocation_checks += 1
+        user = await asyncio.to_thread(auth.get_user, claims["uid"])
+        if user.disabled or claims["iat"] * 1000 < (user.tokens_valid_after_timestamp or 0):
+            self._tokens.delete(key)
+            self._revocation_checked.pop(claims["uid"], None)
+            if user.disabled:
+                raise auth.UserDisabledError("The user record is disabled.")
+            raise auth.RevokedIdTokenError("The Firebase ID token has been revoked.")
+        if len(self._revocation_checked) >= AUTH_TOKEN_CACHE_MAX_ENTRIES:
+            self._revocation_checked.clear()
+        self._revocation_checked[claims["uid"]] = time.monotonic()
+        return claims
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "cached_tokens": len(self._tokens),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "revocation_checks": self.revocation_checks
+        }
+
+
+token_verifier = CachedTokenVerifier()
+
 
 async def verify_firebase_token(request: Request):
     """
@@ -8,18 +102,18 @@ async def verify_firebase_token(request: Request):
     Expected format: Authorization: Bearer <token>
     """
     auth_header = request.headers.get("Authorization")
-    
+
     if not auth_header or not auth_header.startswith("Bearer "):
         raise HTTPException(
             status_code=401,
             detail="Missing or invalid authentication token"
         )
-    
+
     token = auth_header.split(" ")[1]
-    
+
     try:
-        # Verify the ID token while checking if the token is revoked
-        decoded_token = auth.verify_id_token(token, check_revoked=True)
+        # Verify the ID token (cached until exp, revocation rechecked periodically)
+        decoded_token = await token_verifier.verify(token)
         # Attach user information to the request state
         request.state.user = decoded_token
         return decoded_token
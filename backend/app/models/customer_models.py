@@ -1,6 +1,12 @@
 from pydantic import BaseModel, HttpUrl
 from typing import Optional, List
 from datetime import datetime
+from enum import Enum
+
+class EnrichmentStatus(str, Enum):
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 class CustomerBase(BaseModel):
     name: str
@@ -20,7 +26,18 @@ class Customer(CustomerBase):
     id: str
     user_id: str
     logo_url: Optional[str] = None
+    # None for customers created before background enrichment existed
+    enrichment_status: Optional[EnrichmentStatus] = None
+    # Why enrichment steps failed; set when any step failed
+    enrichment_error: Optional[str] = None
     created_at: datetime
 
     class Config:
         from_attributes = True
+
+class CustomerEnrichment(BaseModel):
+    customer_id: str
+    enrichment_status: Optional[EnrichmentStatus] = None
+    enrichment_error: Optional[str] = None
+    logo_url: Optional[str] = None
+    phone_number: Optional[str] = None
@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+from enum import Enum
+
+class DeletionStatus(str, Enum):
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class DeletionTarget(str, Enum):
+    CUSTOMER = "customer"
+    CAMPAIGN = "campaign"
+
+class DeletionJob(BaseModel):
+    id: str
+    user_id: str
+    target: DeletionTarget
+    target_id: str
+    status: DeletionStatus = DeletionStatus.RUNNING
+    campaigns_total: Optional[int] = None
+    campaigns_deleted: int = 0
+    messages_deleted: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    # Heartbeat: set on every committed batch while the job runs
+    updated_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
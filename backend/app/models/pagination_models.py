@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Generic, List, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    # Partial dicts (id plus the requested fields) when the list was projected
+    items: List[Union[T, Dict[str, Any]]]
+    # Pass back as page_token for the next page; None on the last page
+    next_page_token: Optional[str] = None
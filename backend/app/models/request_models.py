@@ -1,4 +1,4 @@
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
 from typing import List, Optional
 from enum import Enum
 
@@ -17,6 +17,8 @@ class SMSRequest(BaseModel):
     message_count: int = 10
     target_audience: str
     phone_number: Optional[str] = None
+    regenerate: bool = False  # Skip the draft cache and force a fresh generation
+    fan_out: Optional[bool] = None  # Generate drafts in parallel groups; defaults to DRAFT_FANOUT_ENABLED
 
     class Config:
         json_schema_extra = {
@@ -34,3 +36,6 @@ class SMSRequest(BaseModel):
 class RefineRequest(BaseModel):
     content: str
     refinement_type: RefinementType
+
+class BatchRefineRequest(BaseModel):
+    items: List[RefineRequest] = Field(..., min_length=1, max_length=50)
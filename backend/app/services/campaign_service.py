@@ -1,4 +1,4 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List, Optional, Dict, Any
 from firebase_admin import firestore
 from app.models.campaign_models import (
@@ -7,14 +7,30 @@ from app.models.campaign_models import (
 )
 
 from app.services.user_preferences_service import UserPreferencesService
+from app.services.rollup_service import BATCH_LIMIT, RollupService
+from app.services.status_scheduler import status_scheduler
+from app.services.deletion_service import DeletionService
+from app.models.deletion_models import DeletionJob
+from app.core.executor import firestore_io
+from app.core.migrations import MigrationMarkers
+from app.core.pagination import fetch_page, project
+from app.models.pagination_models import Page
+from app.config.settings import LIST_PAGE_SIZE_DEFAULT
+
+# Marker of the one-off migration that fills the normalized date fields of legacy campaigns
+DATES_MIGRATION = "campaign_dates"
 
 class CampaignService:
     def __init__(self):
         self.db = firestore.client()
         self.collection = self.db.collection("campaigns")
         self.prefs_service = UserPreferencesService()
+        self.rollups = RollupService()
+        self.deletions = DeletionService()
+        self.migrations = MigrationMarkers()
 
-    async def create_campaign(self, campaign_data: CampaignCreate, user_id: str) -> Campaign:
+    @firestore_io
+    def create_campaign(self, campaign_data: CampaignCreate, user_id: str) -> Campaign:
         """
         Create a new campaign in Firestore.
         """
@@ -28,96 +44,189 @@ class CampaignService:
             "status": CampaignStatus.TASLAK.value,
             "created_at": datetime.now()
         })
+        campaign_dict.update(self._date_fields(
+            campaign_dict["status"], self._day(campaign_dict["start_date"]), self._day(campaign_dict["end_date"])
+        ))
 
-        doc_ref.set(campaign_dict)
+        batch = self.db.batch()
+        batch.set(doc_ref, campaign_dict)
+        self.rollups.record_campaign(
+            batch, user_id, campaign_dict["created_at"], created=1,
+            status_deltas={campaign_dict["status"]: 1},
+            customer_deltas={campaign_dict.get("customer_id"): 1}
+        )
+        batch.commit()
         return Campaign(**campaign_dict)
 
-    def get_campaigns(self, user_id: str, customer_id: Optional[str] = None) -> List[Campaign]:
+    @firestore_io
+    def get_campaigns(
+        self,
+        user_id: str,
+        customer_id: Optional[str] = None,
+        limit: int = LIST_PAGE_SIZE_DEFAULT,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        status: Optional[CampaignStatus] = None
+    ) -> Page[Campaign]:
         """
-        Get all campaigns belonging to a specific user, optionally filtered by customer.
+        Get a page of the user's campaigns, newest first, optionally filtered
+        by customer and status. With fields, items are dicts with only those
+        fields and id.
         """
         query = self.collection.where("user_id", "==", user_id)
         
         if customer_id:
             query = query.where("customer_id", "==", customer_id)
+        if status:
+            query = query.where("status", "==", status.value)
             
-        # Remove order_by to avoid index requirements
-        docs = query.stream()
-        campaigns = []
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            campaigns.append(Campaign(**data))
-        
-        # Sort in-memory
-        campaigns.sort(key=lambda x: x.created_at, reverse=True)
-        return campaigns
+        docs, next_token = fetch_page(query, "created_at", firestore.Query.DESCENDING, limit, page_token, fields)
+        if fields is not None:
+            return Page(items=[project(doc, fields) for doc in docs], next_page_token=next_token)
+        return Page(items=[Campaign(**{**doc.to_dict(), "id": doc.id}) for doc in docs], next_page_token=next_token)
 
-    def check_and_update_statuses(self):
+    def run_scheduled_maintenance(self) -> Optional[date]:
         """
-        Check all Planned and Active campaigns and update their status based on start/end dates.
-        Run this method via a background scheduler.
+        The status scheduler's job (runs on the lease holder only): apply due
+        status transitions, then any pending one-off data migrations.
+        Returns the next date on which a transition becomes due.
+        """
+        try:
+            # Legacy campaigns lack transition_due_on, so the check below can't see them
+            # until this has run
+            self.migrations.run_once(DATES_MIGRATION, self.migrate_campaign_dates)
+        except Exception as e:
+            print(f"Campaign date migration failed (retried on the next run): {e}")
+        next_due = self.check_and_update_statuses()
+        try:
+            # Builds the analytics counters for data written before they existed
+            self.rollups.ensure_backfilled()
+        except Exception as e:
+            print(f"Analytics rollup backfill failed (retried on the next run): {e}")
+        return next_due
+
+    def check_and_update_statuses(self) -> Optional[date]:
+        """
+        Apply the status transitions that are due (Planlandı -> Aktif once the
+        start date is reached, Aktif -> Tamamlandı after the end date) and
+        return the next date on which a transition becomes due.
+        Run this method via the status scheduler.
         """
         print(f"[{datetime.now()}] Checking campaign statuses...")
-        
-        # Fetch only relevant campaigns to minimize reads
-        # Note: 'in' query supports up to 10 values
-        statuses_to_check = [CampaignStatus.PLANLANDI.value, CampaignStatus.AKTIF.value]
-        docs = self.collection.where("status", "in", statuses_to_check).stream()
-        
-        today = datetime.now().date()
+        today = datetime.now().date().isoformat()
+
+        # Only campaigns whose boundary has passed; others have a later or no due date
+        docs = self.collection.where("transition_due_on", "<=", today).stream()
+        batch = self.db.batch()
+        pending = 0
         updates_count = 0
-        
         for doc in docs:
             data = doc.to_dict()
-            campaign_id = doc.id
             status = data.get("status")
-            
-            # Handle start_date/end_date which might be datetime or string depending on ingestion
-            # Assuming they are stored as Firestore Timestamps or Datetime objects
-            # If stored as YYYY-MM-DD string, we parse.
-            start_date_raw = data.get("start_date")
-            end_date_raw = data.get("end_date")
-            
-            if not start_date_raw or not end_date_raw:
-                continue
-                
-            # Helper to convert to date
+            new_status = self._due_status(status, data.get("start_on"), data.get("end_on"), today)
+            print(f"Updating campaign {doc.id}: {status} -> {new_status}")
+            batch.update(doc.reference, {
+                "status": new_status,
+                **self._date_fields(new_status, data.get("start_on"), data.get("end_on"))
+            })
+            self._record_status_change(batch, data, status, new_status)
+            pending += 1
+            updates_count += 1
+            # Each transition is one update plus three counter writes
+            if pending * 4 >= BATCH_LIMIT - 4:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+
+        upcoming = list(
+            self.collection.where("transition_due_on", ">", today).order_by("transition_due_on").limit(1).stream()
+        )
+        next_due = date.fromisoformat(upcoming[0].to_dict()["transition_due_on"]) if upcoming else None
+        print(f"[{datetime.now()}] Status check complete. Updated {updates_count} campaigns. Next boundary: {next_due}")
+        return next_due
+
+    def migrate_campaign_dates(self) -> Dict[str, int]:
+        """
+        One-off migration: convert legacy string start_date/end_date values to
+        timestamps and fill the normalized date fields the status scheduler
+        queries. Only documents that change are written; safe to rerun.
+        """
+        fields = ["status", "start_date", "end_date", "start_on", "end_on", "transition_due_on"]
+        batch = self.db.batch()
+        pending = 0
+        scanned = 0
+        migrated = 0
+        failed = 0
+        for doc in self.collection.select(fields).stream():
+            scanned += 1
+            data = doc.to_dict()
             try:
-                if isinstance(start_date_raw, str):
-                    start_date = datetime.strptime(start_date_raw.split('T')[0], "%Y-%m-%d").date()
-                else:
-                    # Firestore Timestamp or datetime
-                    start_date = start_date_raw.date()
-                    
-                if isinstance(end_date_raw, str):
-                    end_date = datetime.strptime(end_date_raw.split('T')[0], "%Y-%m-%d").date()
-                else:
-                    end_date = end_date_raw.date()
-            except Exception as e:
-                print(f"Error parsing dates for campaign {campaign_id}: {e}")
+                start_on, end_on = self._day(data.get("start_date")), self._day(data.get("end_date"))
+            except ValueError as e:
+                print(f"Error parsing dates for campaign {doc.id}: {e}")
+                failed += 1
                 continue
 
-            new_status = None
-            
-            # Logic:
-            # Planlandı -> Aktif (if Today >= Start Date)
-            if status == CampaignStatus.PLANLANDI.value:
-                if today >= start_date:
-                    new_status = CampaignStatus.AKTIF.value
-            
-            # Aktif -> Tamamlandı (if Today > End Date)
-            elif status == CampaignStatus.AKTIF.value:
-                if today > end_date:
-                    new_status = CampaignStatus.TAMAMLANDI.value
-            
-            if new_status:
-                print(f"Updating campaign {campaign_id}: {status} -> {new_status}")
-                self.collection.document(campaign_id).update({"status": new_status})
-                updates_count += 1
-                
-        print(f"[{datetime.now()}] Status check complete. Updated {updates_count} campaigns.")
+            update = {k: v for k, v in self._date_fields(data.get("status"), start_on, end_on).items()
+                      if k not in data or data[k] != v}
+            for field, day in (("start_date", start_on), ("end_date", end_on)):
+                if isinstance(data.get(field), str):
+                    update[field] = datetime.fromisoformat(day)
+            if not update:
+                continue
+
+            batch.update(doc.reference, update)
+            pending += 1
+            migrated += 1
+            if pending == BATCH_LIMIT:
+                batch.commit()
+                batch = self.db.batch()
+                pending = 0
+        if pending:
+            batch.commit()
+        return {"scanned": scanned, "migrated": migrated, "failed": failed}
+
+    @staticmethod
+    def _day(raw) -> Optional[str]:
+        """
+        Normalize a stored date (Timestamp, datetime or legacy string) to YYYY-MM-DD.
+        """
+        if not raw:
+            return None
+        if isinstance(raw, str):
+            return datetime.strptime(raw.split('T')[0], "%Y-%m-%d").date().isoformat()
+        if isinstance(raw, datetime):
+            return raw.date().isoformat()
+        return raw.isoformat()
+
+    @staticmethod
+    def _due_status(status: str, start_on: Optional[str], end_on: Optional[str], today: str) -> str:
+        """
+        Status after applying every transition that is due by today.
+        """
+        if status == CampaignStatus.PLANLANDI.value and start_on and today >= start_on:
+            status = CampaignStatus.AKTIF.value
+        if status == CampaignStatus.AKTIF.value and end_on and today > end_on:
+            status = CampaignStatus.TAMAMLANDI.value
+        return status
+
+    @staticmethod
+    def _date_fields(status: str, start_on: Optional[str], end_on: Optional[str]) -> Dict[str, Optional[str]]:
+        """
+        Normalized date fields stored next to start_date/end_date.
+        transition_due_on is the day the campaign's next status transition
+        becomes due, or None if it has none, so the scheduler can range-query it.
+        """
+        due_on = None
+        if status == CampaignStatus.PLANLANDI.value:
+            due_on = start_on
+        elif status == CampaignStatus.AKTIF.value and end_on:
+            due_on = (date.fromisoformat(end_on) + timedelta(days=1)).isoformat()
+        return {"start_on": start_on, "end_on": end_on, "transition_due_on": due_on}
 
+    @firestore_io
     def get_campaign(self, campaign_id: str, user_id: str) -> Optional[Campaign]:
         """
         Get a specific campaign by ID, ensuring it belongs to the user.
@@ -132,6 +241,7 @@ class CampaignService:
                 return Campaign(**data)
         return None
 
+    @firestore_io
     def update_campaign(self, campaign_id: str, campaign_data: CampaignUpdate, user_id: str) -> Optional[Campaign]:
         """
         Update an existing campaign's information.
@@ -150,57 +260,75 @@ class CampaignService:
         if "status" in update_data and isinstance(update_data["status"], CampaignStatus):
             update_data["status"] = update_data["status"].value
         
-        # Immediate Activation Check
-        # If user sets status to "Planlandı", check if it should already be "Aktif"
-        if update_data.get("status") == CampaignStatus.PLANLANDI.value:
-            current_data = doc.to_dict()
-            # Get start_date from update (if changed) or existing doc
-            start_date_raw = update_data.get("start_date") or current_data.get("start_date")
-            
-            if start_date_raw:
-                try:
-                    today = datetime.now().date()
-                    if isinstance(start_date_raw, str):
-                        start_date = datetime.strptime(start_date_raw.split('T')[0], "%Y-%m-%d").date()
-                    else:
-                        start_date = start_date_raw.date()
-                        
-                    if today >= start_date:
-                        print(f"Immediate activation triggered for campaign {campaign_id}")
-                        update_data["status"] = CampaignStatus.AKTIF.value
-                except Exception as e:
-                    print(f"Error checking date for immediate activation: {e}")
-
-        doc_ref.update(update_data)
+        current_data = doc.to_dict()
+        status = update_data.get("status", current_data.get("status"))
+        try:
+            start_on = self._day(update_data.get("start_date") or current_data.get("start_date"))
+            end_on = self._day(update_data.get("end_date") or current_data.get("end_date"))
+        except ValueError as e:
+            # Keep the stored normalized fields rather than dropping the campaign from automation
+            print(f"Error normalizing dates for campaign {campaign_id}: {e}")
+            date_fields = None
+        else:
+            # Immediate Activation Check
+            # If user sets status to "Planlandı", check if it should already be "Aktif"
+            if update_data.get("status") == CampaignStatus.PLANLANDI.value:
+                new_status = self._due_status(status, start_on, end_on, datetime.now().date().isoformat())
+                if new_status != status:
+                    print(f"Immediate transition triggered for campaign {campaign_id}: {status} -> {new_status}")
+                    update_data["status"] = status = new_status
+            date_fields = self._date_fields(status, start_on, end_on)
+            update_data.update(date_fields)
+
+        batch = self.db.batch()
+        batch.update(doc_ref, update_data)
+        if "status" in update_data:
+            self._record_status_change(batch, current_data, current_data.get("status"), update_data["status"])
+        batch.commit()
+        if date_fields and date_fields["transition_due_on"]:
+            status_scheduler.nudge(date.fromisoformat(date_fields["transition_due_on"]))
         updated_doc = doc_ref.get()
         data = updated_doc.to_dict()
         data["id"] = updated_doc.id
         return Campaign(**data)
 
-    def delete_campaign(self, campaign_id: str, user_id: str) -> bool:
+    def _record_status_change(self, batch, campaign_data: Dict[str, Any], old_status: str, new_status: str) -> None:
+        if old_status == new_status or not campaign_data.get("created_at"):
+            return
+        self.rollups.record_campaign(
+            batch, campaign_data["user_id"], campaign_data["created_at"],
+            status_deltas={old_status: -1, new_status: 1}
+        )
+
+    async def delete_campaign(self, campaign_id: str, user_id: str) -> Optional[DeletionJob]:
         """
         Delete a campaign and its saved messages from Firestore.
+        Returns the deletion job (still running for large campaigns), or None
+        if the campaign wasn't found.
         """
-        doc_ref = self.collection.document(campaign_id)
-        doc = doc_ref.get()
-        
-        if not doc.exists or doc.to_dict().get("user_id") != user_id:
-            return False
-            
-        # Delete saved messages subcollection first
-        messages_ref = doc_ref.collection("saved_messages")
-        messages = messages_ref.stream()
-        for msg in messages:
-            msg.reference.delete()
-            
-        # Delete campaign doc
-        doc_ref.delete()
-        return True
+        return await self.deletions.delete_campaign(campaign_id, user_id)
 
     async def save_message(self, campaign_id: str, message_data: SavedMessageCreate, user_id: str) -> Optional[SavedMessage]:
         """
         Save an AI-generated message to the campaign's saved_messages subcollection.
         """
+        saved_msg = await self._store_message(campaign_id, message_data, user_id)
+        if not saved_msg:
+            return None
+
+        # Update User Preferences (Best Effort - Don't block if fails)
+        try:
+            # We need the tone of the message to update preferences.
+            # SavedMessage model has 'type' field which corresponds to tone.
+            if saved_msg.type:
+                await self.prefs_service.update_from_saved_message(user_id, saved_msg, saved_msg.type)
+        except Exception as e:
+            print(f"Error updating user preferences: {e}")
+
+        return saved_msg
+
+    @firestore_io
+    def _store_message(self, campaign_id: str, message_data: SavedMessageCreate, user_id: str) -> Optional[SavedMessage]:
         campaign_ref = self.collection.document(campaign_id)
         campaign_doc = campaign_ref.get()
         
@@ -217,90 +345,90 @@ class CampaignService:
             "created_at": datetime.now()
         })
         
-        message_ref.set(message_dict)
-        saved_msg = SavedMessage(**message_dict)
-        
-        # Update User Preferences (Best Effort - Don't block if fails)
-        try:
-            # We need the tone of the message to update preferences.
-            # SavedMessage model has 'type' field which corresponds to tone.
-            if saved_msg.type:
-                self.prefs_service.update_from_saved_message(user_id, saved_msg, saved_msg.type)
-        except Exception as e:
-            print(f"Error updating user preferences: {e}")
-            
-        return saved_msg
+        # Message and its daily counter are written atomically
+        batch = self.db.batch()
+        batch.set(message_ref, message_dict)
+        self.rollups.record_messages(batch, user_id, {self.rollups.day_key(message_dict["created_at"]): 1})
+        batch.commit()
+        return SavedMessage(**message_dict)
 
-    def get_saved_messages(self, campaign_id: str, user_id: str) -> List[SavedMessage]:
+    @firestore_io
+    def get_saved_messages(
+        self,
+        campaign_id: str,
+        user_id: str,
+        limit: int = LIST_PAGE_SIZE_DEFAULT,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Page[SavedMessage]:
         """
-        Get all saved messages for a specific campaign.
+        Get a page of a campaign's saved messages, newest first.
+        With fields, items are dicts with only those fields and id.
         """
         campaign_ref = self.collection.document(campaign_id)
         campaign_doc = campaign_ref.get()
         
         if not campaign_doc.exists or campaign_doc.to_dict().get("user_id") != user_id:
-            return []
+            return Page(items=[])
             
-        docs = campaign_ref.collection("saved_messages").order_by("created_at", direction=firestore.Query.DESCENDING).stream()
-        messages = []
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            messages.append(SavedMessage(**data))
-        return messages
+        docs, next_token = fetch_page(
+            campaign_ref.collection("saved_messages"), "created_at", firestore.Query.DESCENDING,
+            limit, page_token, fields
+        )
+        if fields is not None:
+            return Page(items=[project(doc, fields) for doc in docs], next_page_token=next_token)
+        return Page(items=[SavedMessage(**{**doc.to_dict(), "id": doc.id}) for doc in docs], next_page_token=next_token)
 
-    def delete_saved_message(self, campaign_id: str, message_id: str, user_id: str) -> bool:
+    async def delete_saved_message(self, campaign_id: str, message_id: str, user_id: str) -> bool:
         """
         Delete a specific saved message from a campaign.
         """
+        msg_data = await self._remove_message(campaign_id, message_id, user_id)
+        if msg_data is None:
+            return False
+
+        # Unlearn from preferences (Best Effort)
+        try:
+            msg_obj = SavedMessage(**msg_data)
+            await self.prefs_service.unlearn_from_deleted_messages(user_id, [msg_obj])
+        except Exception as e:
+            print(f"Warning: Failed to unlearn from deleted message: {e}")
+        return True
+
+    @firestore_io
+    def _remove_message(self, campaign_id: str, message_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Delete the message and return its data, or None if it wasn't found.
+        """
         campaign_ref = self.collection.document(campaign_id)
         campaign_doc = campaign_ref.get()
         
         if not campaign_doc.exists or campaign_doc.to_dict().get("user_id") != user_id:
-            return False
+            return None
             
         msg_ref = campaign_ref.collection("saved_messages").document(message_id)
         msg_doc = msg_ref.get()
         
         if msg_doc.exists:
-            # Unlearn from preferences before actual delete
-            try:
-                msg_data = msg_doc.to_dict()
-                msg_obj = SavedMessage(**msg_data)
-                self.prefs_service.unlearn_from_deleted_message(user_id, msg_obj)
-            except Exception as e:
-                print(f"Warning: Failed to unlearn from deleted message: {e}")
-                
-            msg_ref.delete()
-            return True
-        return False
+            msg_data = msg_doc.to_dict()
+            batch = self.db.batch()
+            batch.delete(msg_ref)
+            if msg_data.get("created_at"):
+                self.rollups.record_messages(batch, user_id, {self.rollups.day_key(msg_data["created_at"]): -1})
+            batch.commit()
+            return msg_data
+        return None
 
+    @firestore_io
     def get_campaign_stats(self, user_id: str) -> Dict[str, Any]:
         """
         Get campaign statistics including growth trend.
         Compares this month's campaign count vs last month's.
         """
-        campaigns = self.get_campaigns(user_id)
-        total_campaigns = len(campaigns)
-        
-        # Get current month and last month boundaries
-        today = datetime.now()
-        first_of_this_month = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        first_of_last_month = (first_of_this_month - timedelta(days=1)).replace(day=1)
-        
-        # Count campaigns by month
-        # Count campaigns by month
-        this_month_count = 0
-        
-        for campaign in campaigns:
-            created_at = campaign.created_at
-            if created_at:
-                # Convert to naive datetime if timezone-aware
-                if hasattr(created_at, 'tzinfo') and created_at.tzinfo is not None:
-                    created_at = created_at.replace(tzinfo=None)
-                
-                if created_at >= first_of_this_month:
-                    this_month_count += 1
+        # All-time and this month's campaign counters, one batched read
+        all_time, this_month = self.rollups.campaign_counters(user_id, datetime.now().strftime("%Y-%m"))
+        total_campaigns = max(0, all_time.get("created", 0))
+        this_month_count = max(0, this_month.get("created", 0))
         
         # Calculate trend percentage (Growth relative to previous total)
         # Previous Total = Total Now - Created This Month
@@ -326,10 +454,20 @@ class CampaignService:
             "trend_label": trend_label
         }
 
+    @firestore_io
+    def get_campaign_analytics(self, user_id: str, start: date, end: date, granularity: str = "day") -> Dict[str, Any]:
+        """
+        Get counts of campaigns created in a date range (inclusive): total,
+        by current status, by customer and per day, week or month.
+        Raises ValueError for an invalid range or granularity.
+        """
+        return self.rollups.campaign_analytics(user_id, start, end, granularity)
+
+    @firestore_io
     def get_weekly_trend(self, user_id: str) -> Dict[str, Any]:
         """
         Get weekly message production trend for the user.
-        Aggregates saved messages by day for the last 7 days.
+        Reads the per-day message counters for the current week (Mon-Sun).
         """
         # Turkish day names (short form)
         day_names = {
@@ -347,45 +485,19 @@ class CampaignService:
         # Get Monday of the current week (weekday() returns 0 for Monday)
         monday = today - timedelta(days=today.weekday())
         
-        # Initialize counts for each day of the week (Mon-Sun)
-        daily_counts: Dict[str, int] = {}
-        for i in range(7):
-            date = monday + timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
-            daily_counts[date_str] = 0
-        
-        # Get all campaigns for the user
-        campaigns = self.get_campaigns(user_id)
-        
-        # Aggregate message counts by day
-        for campaign in campaigns:
-            campaign_ref = self.collection.document(campaign.id)
-            messages = campaign_ref.collection("saved_messages").stream()
-            
-            for msg in messages:
-                msg_data = msg.to_dict()
-                created_at = msg_data.get("created_at")
-                if created_at:
-                    # Handle both datetime objects and Firestore timestamps
-                    if hasattr(created_at, 'date'):
-                        msg_date = created_at.date()
-                    else:
-                        msg_date = created_at
-                    
-                    msg_date_str = msg_date.strftime("%Y-%m-%d") if hasattr(msg_date, 'strftime') else str(msg_date)[:10]
-                    
-                    if msg_date_str in daily_counts:
-                        daily_counts[msg_date_str] += 1
+        # Message counts for each day of the week (Mon-Sun), one batched read
+        week_days = [(monday + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)]
+        daily_counts = self.rollups.message_counts(user_id, week_days)
         
         # Build trend data
         trend = []
         for i in range(7):
-            date = monday + timedelta(days=i)
-            date_str = date.strftime("%Y-%m-%d")
+            day = monday + timedelta(days=i)
+            date_str = day.strftime("%Y-%m-%d")
             count = daily_counts.get(date_str, 0)
             trend.append({
                 "date": date_str,
-                "day_name": day_names[date.weekday()],
+                "day_name": day_names[day.weekday()],
                 "count": count
             })
         
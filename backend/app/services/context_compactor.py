@@ -0,0 +1,149 @@
+import math
+import re
+from typing import Dict, List, Tuple
+
+from app.utils.text import fold_text
+
+# Rough token estimate for Gemini on Turkish/English web text; avoids a
+# count_tokens round trip per request
+CHARS_PER_TOKEN = 4
+SHORT_LINE_WORDS = 3  # Lines this short are menu items or inline fragments
+MENU_RUN = 3          # This many short lines in a row are treated as navigation
+
+# Cookie banners, legal footers and shop chrome, matched on folded text
+BOILERPLATE_PATTERN = re.compile(
+    r'cerez|cookie|kvkk|kisisel verilerin|tum haklari saklidir|all rights reserved|copyright|©|'
+    r'gizlilik politikasi|kullanim kosullari|privacy policy|terms of use|javascript|'
+    r'sepete ekle|sepetim|giris yap|uye ol|oturum ac|sifremi unuttum|e-?bulten'
+)
+CAMPAIGN_CUE_PATTERN = re.compile(r'indirim|kampanya|firsat|ucretsiz|kargo|hediye|yeni|sezon|%\s?\d|\d\s?%')
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?])\s+')
+WORD_PATTERN = re.compile(r'[a-z0-9]+')
+
+CONTACT_KEYWORDS = ["iletisim", "telefon", "musteri hizmetleri", "cagri merkezi", "bize ulasin",
+                    "adres", "whatsapp", "destek", "contact"]
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def keyword_stems(keywords: List[str]) -> List[str]:
+    """
+    Fold keywords into word stems: Turkish suffixes vary ("elbise",
+    "elbiselerde"), so words are matched on their first five letters.
+    """
+    stems = set()
+    for keyword in keywords or []:
+        for word in WORD_PATTERN.findall(fold_text(keyword)):
+            if len(word) >= 3:
+                stems.add(word[:5])
+    return sorted(stems)
+
+
+class ContextCompactor:
+    """
+    Turn the visible text blocks of a page into a short prompt context:
+    boilerplate and duplicate lines are dropped, navigation runs removed,
+    and the sentences most relevant to the given keywords are kept, in page
+    order, until the token budget is used up.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.raw_tokens = 0
+        self.context_tokens = 0
+
+    def _segments(self, blocks: List[str]) -> List[str]:
+        seen = set()
+        segments = []
+        fragments: List[str] = []
+
+        def flush(line: str = None) -> None:
+            # A long run of short lines is a menu; a few are inline fragments of the next line
+            kept = fragments if len(fragments) < MENU_RUN else []
+            if line is not None:
+                segments.append(" ".join(kept + [line]))
+            elif kept:
+                segments.append(" ".join(kept))
+            fragments.clear()
+
+        for block in blocks:
+            line = " ".join(block.split())
+            if not line:
+                continue
+            key = fold_text(line)
+            if key in seen or BOILERPLATE_PATTERN.search(key):
+                continue
+            seen.add(key)
+            if len(line.split()) <= SHORT_LINE_WORDS:
+                fragments.append(line)
+            else:
+                flush(line)
+        flush()
+        return segments
+
+    def _score(self, sentence: str, stems: List[str], position: float) -> float:
+        folded = fold_text(sentence)
+        words = WORD_PATTERN.findall(folded)
+        word_stems = {w[:5] for w in words}
+        score = 3.0 * min(sum(1 for stem in stems if stem in word_stems), 3)
+        score += min(len(CAMPAIGN_CUE_PATTERN.findall(folded)), 2)
+        if any(ch.isdigit() for ch in sentence):
+            score += 0.5
+        if len(words) < 5:
+            score -= 0.5
+        # Earlier text (hero, intro) breaks ties
+        return score + 0.5 * (1.0 - position)
+
+    def compact(self, blocks: List[str], keywords: List[str], token_budget: int) -> Tuple[str, Dict[str, int]]:
+        """
+        Return the compacted context and its token accounting.
+        """
+        raw_tokens = estimate_tokens(" ".join(blocks))
+        sentences = []
+        seen = set()
+        for segment in self._segments(blocks):
+            for sentence in SENTENCE_SPLIT_PATTERN.split(segment):
+                sentence = sentence.strip()
+                key = fold_text(sentence)
+                if sentence and key not in seen:
+                    seen.add(key)
+                    sentences.append(sentence)
+
+        stems = keyword_stems(keywords)
+        total = max(len(sentences), 1)
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: self._score(sentences[i], stems, i / total),
+            reverse=True
+        )
+        selected = []
+        used = 0
+        for i in ranked:
+            cost = estimate_tokens(sentences[i]) + 1
+            if used + cost > token_budget:
+                continue
+            selected.append(i)
+            used += cost
+
+        context = " ".join(sentences[i] for i in sorted(selected))
+        stats = {
+            "raw_tokens": raw_tokens,
+            "context_tokens": estimate_tokens(context),
+            "token_budget": token_budget,
+            "sentences_total": len(sentences),
+            "sentences_kept": len(selected)
+        }
+        self.requests += 1
+        self.raw_tokens += stats["raw_tokens"]
+        self.context_tokens += stats["context_tokens"]
+        return context, stats
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "raw_tokens": self.raw_tokens,
+            "context_tokens": self.context_tokens,
+            "compression_ratio": round(self.context_tokens / self.raw_tokens, 3) if self.raw_tokens else 0.0
+        }
@@ -1,9 +1,26 @@
+import asyncio
 from datetime import datetime
 from typing import List, Optional
 from firebase_admin import firestore
-from app.models.customer_models import Customer, CustomerCreate, CustomerUpdate
+from app.models.customer_models import (
+    Customer, CustomerCreate, CustomerUpdate, CustomerEnrichment, EnrichmentStatus
+)
 from app.services.logo_extraction_service import LogoExtractionService
 from app.services.website_scraper import WebsiteScraper
+from app.services.deletion_service import DeletionService
+from app.models.deletion_models import DeletionJob
+from app.core.executor import firestore_io
+from app.exceptions.api_exceptions import EnrichmentStepError
+from app.core.pagination import fetch_page, project
+from app.models.pagination_models import Page
+from app.config.settings import LIST_PAGE_SIZE_DEFAULT
+
+# List orders: sort name -> (field, direction); each needs an index in firestore.indexes.json
+CUSTOMER_SORTS = {
+    "created_at": ("created_at", firestore.Query.ASCENDING),
+    "-created_at": ("created_at", firestore.Query.DESCENDING),
+    "name": ("name", firestore.Query.ASCENDING)
+}
 
 class CustomerService:
     def __init__(self):
@@ -11,51 +28,24 @@ class CustomerService:
         self.collection = self.db.collection("customers")
         self.logo_service = LogoExtractionService()
         self.scraper = WebsiteScraper()
+        self.deletions = DeletionService()
 
-    async def create_customer(self, customer_data: CustomerCreate, user_id: str) -> Customer:
+    @firestore_io
+    def create_customer(self, customer_data: CustomerCreate, user_id: str) -> Customer:
         """
-        Create a new customer in Firestore and automatically extract/store their logo and phone.
+        Create a new customer in Firestore with a pending enrichment status.
+        Logo and phone extraction run afterwards via enrich_customer.
         """
         # Create a new document to get an ID
         doc_ref = self.collection.document()
         customer_id = doc_ref.id
 
-        # Enrichment section (logo and phone extraction)
-        # We wrap this in a try-except to ensure that even if enrichment fails,
-        # the customer is still saved to Firestore.
-        stored_logo_url = None
-        extracted_phone = None
-        
-        try:
-            print(f"Enriching customer data for: {customer_data.website_url}")
-            # Extract and store logo
-            logo_url = await self.logo_service.extract_logo_from_url(customer_data.website_url)
-            if logo_url:
-                stored_logo_url = await self.logo_service.download_and_store_logo(logo_url, customer_id)
-            else:
-                print("No logo found.")
-
-            # Extract website info (phone candidates etc)
-            scraped_data = await self.scraper.scrape_site_info(customer_data.website_url)
-            extracted_phone = await self.scraper.identify_best_phone(
-                customer_data.website_url,
-                scraped_data["info_text"],
-                scraped_data["candidates"]
-            )
-        except Exception as e:
-            print(f"Background enrichment failed for {customer_data.website_url}: {e}")
-            # We continue even if enrichment fails
-
         customer_dict = customer_data.model_dump()
-        
-        # Auto-fill phone if provided data is empty but scraper found one
-        if not customer_dict.get("phone_number") and extracted_phone:
-            customer_dict["phone_number"] = extracted_phone
-
         customer_dict.update({
             "id": customer_id,
             "user_id": user_id,
-            "logo_url": stored_logo_url, # Will be None if enrichment failed
+            "logo_url": None,
+            "enrichment_status": EnrichmentStatus.PENDING.value,
             "created_at": datetime.now()
         })
 
@@ -64,22 +54,123 @@ class CustomerService:
         
         return Customer(**customer_dict)
 
-    def get_customers(self, user_id: str) -> List[Customer]:
+    async def enrich_customer(self, customer_id: str, website_url: str, needs_phone: bool) -> None:
         """
-        Get all customers belonging to a specific user.
+        Extract/store the customer's logo and identify their phone concurrently,
+        then patch the customer document. Meant to run as a background task.
+
+        Step errors are recorded in enrichment_error; the status is FAILED
+        only when every step failed, since a partial result is still saved.
         """
-        # Remove order_by from query to avoid composite index requirement
-        docs = self.collection.where("user_id", "==", user_id).stream()
-        customers = []
-        for doc in docs:
-            data = doc.to_dict()
-            data["id"] = doc.id
-            customers.append(Customer(**data))
-        
-        # Sort in-memory instead
-        customers.sort(key=lambda x: x.created_at)
-        return customers
+        print(f"Enriching customer data for: {website_url}")
+        steps = [self._extract_logo(website_url, customer_id)]
+        if needs_phone:
+            steps.append(self._extract_phone(website_url))
+        results = await asyncio.gather(*steps, return_exceptions=True)
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        for error in errors:
+            print(f"Background enrichment step failed for {website_url}: {error}")
+
+        failed = len(errors) == len(results)
+        update_data = {
+            "enrichment_status": (EnrichmentStatus.FAILED if failed else EnrichmentStatus.COMPLETED).value,
+            "enrichment_error": "; ".join(dict.fromkeys(str(error) for error in errors)) or None
+        }
+        stored_logo_url = results[0]
+        if stored_logo_url and not isinstance(stored_logo_url, Exception):
+            update_data["logo_url"] = stored_logo_url
+        extracted_phone = results[1] if needs_phone else None
+        if isinstance(extracted_phone, Exception):
+            extracted_phone = None
 
+        try:
+            await self._save_enrichment(customer_id, update_data, extracted_phone)
+        except Exception as e:
+            print(f"Error saving enrichment for customer {customer_id}: {e}")
+
+    @firestore_io
+    def _save_enrichment(self, customer_id: str, update_data: dict, extracted_phone: Optional[str]) -> None:
+        doc_ref = self.collection.document(customer_id)
+
+        @firestore.transactional
+        def save(transaction) -> None:
+            # Read and write in one transaction so edits made meanwhile aren't overwritten
+            doc = doc_ref.get(transaction=transaction)
+            if not doc.exists:
+                # Customer was deleted while enrichment was running
+                return
+            current = doc.to_dict()
+            fields = {
+                "enrichment_status": update_data["enrichment_status"],
+                "enrichment_error": update_data["enrichment_error"]
+            }
+            # Auto-fill logo and phone only if the user hasn't set them in the meantime
+            if update_data.get("logo_url") and not current.get("logo_url"):
+                fields["logo_url"] = update_data["logo_url"]
+            if extracted_phone and not current.get("phone_number"):
+                fields["phone_number"] = extracted_phone
+            transaction.update(doc_ref, fields)
+        save(self.db.transaction())
+
+    async def _extract_logo(self, website_url: str, customer_id: str) -> Optional[str]:
+        logo_url = await self.logo_service.extract_logo_from_url(website_url)
+        if not logo_url:
+            print("No logo found.")
+            return None
+        return await self.logo_service.download_and_store_logo(logo_url, customer_id)
+
+    async def _extract_phone(self, website_url: str) -> Optional[str]:
+        scraped_data = await self.scraper.scrape_site_info(website_url)
+        if not scraped_data["fetched"]:
+            raise EnrichmentStepError(f"Web sitesi alınamadı: {website_url}")
+        return await self.scraper.identify_best_phone(
+            website_url,
+            scraped_data["phone_context"],
+            scraped_data["candidates"],
+            scraped_data.get("phone_evidence")
+        )
+
+    async def get_enrichment(self, customer_id: str, user_id: str) -> Optional[CustomerEnrichment]:
+        """
+        Get the enrichment state of a customer, for polling after creation.
+        """
+        customer = await self.get_customer(customer_id, user_id)
+        if not customer:
+            return None
+        return CustomerEnrichment(
+            customer_id=customer.id,
+            enrichment_status=customer.enrichment_status,
+            enrichment_error=customer.enrichment_error,
+            logo_url=customer.logo_url,
+            phone_number=customer.phone_number
+        )
+
+    @firestore_io
+    def get_customers(
+        self,
+        user_id: str,
+        limit: int = LIST_PAGE_SIZE_DEFAULT,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        sort: str = "created_at"
+    ) -> Page[Customer]:
+        """
+        Get a page of the user's customers in one of CUSTOMER_SORTS orders
+        (oldest first by default); a page_token only continues the sort it
+        came from. With fields, items are dicts with only those fields and id.
+        Raises ValueError for an unknown sort.
+        """
+        if sort not in CUSTOMER_SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(CUSTOMER_SORTS)}")
+        order_field, direction = CUSTOMER_SORTS[sort]
+        query = self.collection.where("user_id", "==", user_id)
+        docs, next_token = fetch_page(query, order_field, direction, limit, page_token, fields)
+        if fields is not None:
+            return Page(items=[project(doc, fields) for doc in docs], next_page_token=next_token)
+        return Page(items=[Customer(**{**doc.to_dict(), "id": doc.id}) for doc in docs], next_page_token=next_token)
+
+    @firestore_io
     def get_customer(self, customer_id: str, user_id: str) -> Optional[Customer]:
         """
         Get a specific customer by ID, ensuring they belong to the user.
@@ -94,6 +185,7 @@ class CustomerService:
                 return Customer(**data)
         return None
 
+    @firestore_io
     def update_customer(self, customer_id: str, customer_data: CustomerUpdate, user_id: str) -> Optional[Customer]:
         """
         Update an existing customer's information.
@@ -116,14 +208,10 @@ class CustomerService:
         data["id"] = updated_doc.id
         return Customer(**data)
 
-    def delete_customer(self, customer_id: str, user_id: str) -> bool:
+    async def delete_customer(self, customer_id: str, user_id: str) -> Optional[DeletionJob]:
         """
-        Delete a customer from Firestore.
+        Delete a customer together with its campaigns and their saved messages.
+        Returns the deletion job (still running for large trees), or None if
+        the customer wasn't found.
         """
-        doc_ref = self.collection.document(customer_id)
-        doc = doc_ref.get()
-        
-        if doc.exists and doc.to_dict().get("user_id") == user_id:
-            doc_ref.delete()
-            return True
-        return False
+        return await self.deletions.delete_customer(customer_id, user_id)
@@ -0,0 +1,248 @@
+import asyncio
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Set
+from firebase_admin import firestore
+from app.config.settings import DELETION_SYNC_WAIT_SECONDS, DELETION_STALE_AFTER_SECONDS
+from app.core.executor import firestore_executor, firestore_io
+from app.models.campaign_models import SavedMessage
+from app.models.deletion_models import DeletionJob, DeletionStatus, DeletionTarget
+from app.services.rollup_service import BATCH_LIMIT, RollupService
+from app.services.user_preferences_service import UserPreferencesService
+
+
+class _CascadeBatch:
+    """
+    Accumulates deletes plus the counter and job-progress updates they imply,
+    and commits them together, so every committed chunk leaves the counters
+    consistent with the documents that remain.
+    """
+
+    def __init__(self, db, rollups: RollupService, job_ref, user_id: str):
+        self.db = db
+        self.rollups = rollups
+        self.job_ref = job_ref
+        self.user_id = user_id
+        self._reset()
+
+    def _reset(self) -> None:
+        self.refs = []
+        self.message_days: Dict[str, int] = defaultdict(int)
+        self.campaign_days: Dict[str, Dict[str, Any]] = {}
+        self.campaigns = 0
+        self.messages = 0
+
+    def _pending_writes(self) -> int:
+        # Each campaign day touches its day, month and all-time counters; +1 for the job
+        return len(self.refs) + len(self.message_days) + 3 * len(self.campaign_days) + 1
+
+    def has_room(self) -> bool:
+        # Room for one more item and its counters
+        return self._pending_writes() + 4 < BATCH_LIMIT
+
+    def delete_message(self, ref, data: Dict[str, Any]) -> None:
+        self.refs.append(ref)
+        self.messages += 1
+        if data.get("created_at"):
+            self.message_days[self.rollups.day_key(data["created_at"])] -= 1
+
+    def delete_campaign(self, ref, data: Dict[str, Any]) -> None:
+        self.refs.append(ref)
+        self.campaigns += 1
+        if data.get("created_at"):
+            day = self.rollups.day_key(data["created_at"])
+            change = self.campaign_days.setdefault(day, {
+                "created_at": data["created_at"], "created": 0,
+                "status": defaultdict(int), "customer": defaultdict(int)
+            })
+            change["created"] -= 1
+            change["status"][data.get("status")] -= 1
+            change["customer"][data.get("customer_id")] -= 1
+
+    def delete(self, ref) -> None:
+        self.refs.append(ref)
+
+    def commit(self, final: Dict[str, Any] = None) -> None:
+        if not self.refs and final is None:
+            return
+        batch = self.db.batch()
+        for ref in self.refs:
+            batch.delete(ref)
+        self.rollups.record_messages(batch, self.user_id, self.message_days)
+        for change in self.campaign_days.values():
+            self.rollups.record_campaign(
+                batch, self.user_id, change["created_at"], created=change["created"],
+                status_deltas=change["status"], customer_deltas=change["customer"]
+            )
+        progress = {
+            "campaigns_deleted": firestore.Increment(self.campaigns),
+            "messages_deleted": firestore.Increment(self.messages),
+            "updated_at": datetime.now(timezone.utc),
+            **(final or {})
+        }
+        batch.set(self.job_ref, progress, merge=True)
+        batch.commit()
+        self._reset()
+
+
+class DeletionService:
+    """
+    Cascading deletion engine: customer -> campaigns -> saved messages.
+
+    Documents are deleted in batched writes of up to BATCH_LIMIT operations,
+    children before parents, so an interrupted job can be rerun by deleting
+    the same target again. Each batch also adjusts the analytics counters and
+    the job's progress. The preference statistics of all deleted messages
+    are reversed in one aggregated update at the end.
+
+    Deletions run in the background; callers wait up to
+    DELETION_SYNC_WAIT_SECONDS, so small trees finish within the request
+    and large ones return a job that can be polled.
+    """
+
+    def __init__(self):
+        self.db = firestore.client()
+        self.jobs = self.db.collection("deletion_jobs")
+        self.customers = self.db.collection("customers")
+        self.campaigns = self.db.collection("campaigns")
+        self.rollups = RollupService()
+        self.prefs_service = UserPreferencesService()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def delete_customer(self, customer_id: str, user_id: str) -> Optional[DeletionJob]:
+        """
+        Delete a customer with its campaigns and their saved messages.
+        Returns None if the customer doesn't exist or belongs to another user.
+        """
+        return await self._start(DeletionTarget.CUSTOMER, customer_id, user_id)
+
+    async def delete_campaign(self, campaign_id: str, user_id: str) -> Optional[DeletionJob]:
+        """
+        Delete a campaign and its saved messages.
+        Returns None if the campaign doesn't exist or belongs to another user.
+        """
+        return await self._start(DeletionTarget.CAMPAIGN, campaign_id, user_id)
+
+    @firestore_io
+    def get_job(self, job_id: str, user_id: str) -> Optional[DeletionJob]:
+        """
+        A running job whose heartbeat is older than DELETION_STALE_AFTER_SECONDS
+        lost its process mid-cascade; it is reported as failed. Deleting the
+        same target again resumes it, since committed batches stay deleted.
+        """
+        doc = self.jobs.document(job_id).get()
+        if not doc.exists or doc.to_dict().get("user_id") != user_id:
+            return None
+        job = DeletionJob(**doc.to_dict())
+        if job.status == DeletionStatus.RUNNING and self._is_stale(job):
+            job.status = DeletionStatus.FAILED
+            job.error = "Deletion stopped making progress; delete the target again to resume"
+        return job
+
+    @staticmethod
+    def _is_stale(job: DeletionJob) -> bool:
+        # Jobs are stamped in UTC and Firestore returns them tz-aware
+        heartbeat = job.updated_at or job.created_at
+        return datetime.now(timezone.utc) - heartbeat > timedelta(seconds=DELETION_STALE_AFTER_SECONDS)
+
+    async def _start(self, target: DeletionTarget, target_id: str, user_id: str) -> Optional[DeletionJob]:
+        job = await self._create_job(target, target_id, user_id)
+        if not job:
+            return None
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        done, _ = await asyncio.wait({task}, timeout=DELETION_SYNC_WAIT_SECONDS)
+        return task.result() if done else job
+
+    @firestore_io
+    def _create_job(self, target: DeletionTarget, target_id: str, user_id: str) -> Optional[DeletionJob]:
+        collection = self.customers if target == DeletionTarget.CUSTOMER else self.campaigns
+        doc = collection.document(target_id).get()
+        if not doc.exists or doc.to_dict().get("user_id") != user_id:
+            return None
+
+        now = datetime.now(timezone.utc)
+        job = DeletionJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            target=target,
+            target_id=target_id,
+            created_at=now,
+            updated_at=now
+        )
+        self.jobs.document(job.id).set({**job.model_dump(), "target": target.value, "status": job.status.value})
+        return job
+
+    async def _run(self, job: DeletionJob) -> DeletionJob:
+        try:
+            messages = await self._cascade(job)
+        except Exception as e:
+            print(f"Deletion job {job.id} ({job.target.value} {job.target_id}) failed: {e}")
+            await firestore_executor.run(self._finish, job, DeletionStatus.FAILED, str(e))
+            return await self.get_job(job.id, job.user_id)
+
+        # Best effort, like the single-message delete
+        try:
+            await self.prefs_service.unlearn_from_deleted_messages(job.user_id, messages)
+        except Exception as e:
+            print(f"Warning: Failed to unlearn from deleted messages: {e}")
+        return await self.get_job(job.id, job.user_id)
+
+    async def _cascade(self, job: DeletionJob) -> List[SavedMessage]:
+        """
+        Delete the job's tree; returns the deleted messages. Every read and
+        batch commit is its own executor call, so a large cascade takes
+        turns with requests for the Firestore workers instead of holding one.
+        """
+        campaigns = await firestore_executor.run(self._target_campaigns, job)
+        job_ref = self.jobs.document(job.id)
+        await firestore_executor.run(
+            job_ref.update, {"campaigns_total": len(campaigns), "updated_at": datetime.now(timezone.utc)}
+        )
+
+        batch = _CascadeBatch(self.db, self.rollups, job_ref, job.user_id)
+        deleted_messages = []
+        for campaign in campaigns:
+            messages = await firestore_executor.run(self._saved_messages, campaign)
+            for msg in messages:
+                data = msg.to_dict()
+                await self._make_room(batch)
+                batch.delete_message(msg.reference, data)
+                try:
+                    deleted_messages.append(SavedMessage(**{"id": msg.id, "campaign_id": campaign.id, **data}))
+                except Exception as e:
+                    print(f"Warning: Skipping malformed message {msg.id} in preference update: {e}")
+            await self._make_room(batch)
+            batch.delete_campaign(campaign.reference, campaign.to_dict())
+        if job.target == DeletionTarget.CUSTOMER:
+            await self._make_room(batch)
+            batch.delete(self.customers.document(job.target_id))
+        await firestore_executor.run(
+            batch.commit, {"status": DeletionStatus.COMPLETED.value, "finished_at": datetime.now(timezone.utc)}
+        )
+        return deleted_messages
+
+    @staticmethod
+    async def _make_room(batch: _CascadeBatch) -> None:
+        if not batch.has_room():
+            await firestore_executor.run(batch.commit)
+
+    def _target_campaigns(self, job: DeletionJob) -> list:
+        if job.target == DeletionTarget.CUSTOMER:
+            return list(
+                self.campaigns.where("user_id", "==", job.user_id).where("customer_id", "==", job.target_id).stream()
+            )
+        doc = self.campaigns.document(job.target_id).get()
+        return [doc] if doc.exists else []
+
+    @staticmethod
+    def _saved_messages(campaign) -> list:
+        return list(campaign.reference.collection("saved_messages").stream())
+
+    def _finish(self, job: DeletionJob, status: DeletionStatus, error: str = None) -> None:
+        self.jobs.document(job.id).set(
+            {"status": status.value, "error": error, "finished_at": datetime.now(timezone.utc)}, merge=True
+        )
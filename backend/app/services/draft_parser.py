@@ -0,0 +1,167 @@
+import re
+from typing import Dict, List, Optional, Tuple
+from app.models.response_models import SMSDraft
+from app.utils.text import fold_text
+
+# A draft header such as ---KLASIK--- on its own line, tolerating markdown
+# decoration (**---KLASIK---**, ## ---KLASIK---) and longer dash runs.
+HEADER_PATTERN = re.compile(r'^[ \t*#>]*-{3,}[ \t]*([^\n-][^\n]*?)[ \t]*-{3,}[ \t*\r]*$', re.MULTILINE)
+# The start of a header cut off by a truncated completion ("\n---MOD")
+PARTIAL_HEADER_PATTERN = re.compile(r'\n[ \t*#>]*-{3,}[^\n]*$')
+SCORE_PATTERN = re.compile(r'\[\s*Puan\s*:\s*(\d{1,3})\s*\]', re.IGNORECASE)
+# Wrapper tags the model sometimes echoes back from the prompt
+ECHO_TAG_PATTERN = re.compile(r'</?(?:refined_message_content|original_message)>', re.IGNORECASE)
+# Placeholder lines copied from the format example ("[Klasik Taslak İçeriği]")
+PLACEHOLDER_PATTERN = re.compile(r'^\[[^\]\n]*(?:İçerik|Taslak)[^\]\n]*\]$', re.MULTILINE)
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+NUMBER_PATTERN = re.compile(r'\d+')
+
+
+def type_key(name: str) -> str:
+    """
+    Fold a draft type name to a lookup key: Turkish letters folded to ASCII,
+    case and punctuation dropped ("Soru & Cevap", "SORU_CEVAP" -> "sorucevap").
+    """
+    return _NON_ALNUM.sub("", fold_text(name))
+
+
+class DraftParser:
+    """
+    Single-pass parser for the ---TYPE--- delimited draft format.
+    Headers are located with one precompiled scan; every block between two
+    headers becomes a draft on its own, so one malformed block never
+    discards the rest of the response.
+    """
+
+    def __init__(self, draft_types: List[str]):
+        self.type_map: Dict[str, str] = {type_key(t): t for t in draft_types}
+        # Raw header text -> resolved type; the model repeats the same headers
+        self._header_memo: Dict[str, Optional[str]] = {}
+        self.parsed_total = 0
+        self.recovered_blocks = 0
+        self.rejected_blocks = 0
+        self.failures = 0
+
+    def resolve_type(self, name: str) -> Optional[str]:
+        if name in self._header_memo:
+            return self._header_memo[name]
+        key = type_key(name)
+        resolved = self.type_map.get(key)
+        if resolved is None:
+            # Decorated headers such as "KLASIK TASLAK" or "1. KLASIK"
+            for known_key, display in self.type_map.items():
+                if known_key and known_key in key:
+                    resolved = display
+                    break
+        if len(self._header_memo) < 256:
+            self._header_memo[name] = resolved
+        return resolved
+
+    def _clean_content(self, body: str) -> Tuple[str, Optional[int]]:
+        """
+        Strip the score tag and prompt echoes from a block body.
+        Returns the content and the score, or None if the block had no score.
+        """
+        score = None
+        score_match = SCORE_PATTERN.search(body)
+        if score_match:
+            score = min(int(score_match.group(1)), 100)
+            body = body[:score_match.start()] + body[score_match.end():]
+            if "[" in body:
+                body = SCORE_PATTERN.sub("", body)
+        if "<" in body:
+            body = ECHO_TAG_PATTERN.sub("", body)
+        if "[" in body:
+            body = PLACEHOLDER_PATTERN.sub("", body)
+        return body.strip(), score
+
+    def parse_blocks(self, text: str) -> List[SMSDraft]:
+        """
+        Parse every complete or partial block in the text, without marking a
+        recommendation. Blocks with an unknown type or no content are skipped.
+        """
+        drafts = []
+        if not text:
+            return drafts
+        headers = list(HEADER_PATTERN.finditer(text))
+        for i, header in enumerate(headers):
+            if i + 1 < len(headers):
+                body = text[header.end():headers[i + 1].start()]
+            else:
+                body = PARTIAL_HEADER_PATTERN.sub("", text[header.end():])
+            draft_type = self.resolve_type(header.group(1))
+            content, score = self._clean_content(body)
+            if not draft_type or not content:
+                self.rejected_blocks += 1
+                continue
+            if score is None:
+                # Missing score: keep the draft, it just can't win the recommendation
+                self.recovered_blocks += 1
+                score = 0
+            drafts.append(SMSDraft(type=draft_type, content=content, score=score))
+        return drafts
+
+    def parse(self, text: str) -> List[SMSDraft]:
+        """
+        Parse a full completion and mark the highest scoring draft as recommended.
+        Falls back to a single "Hata" draft only when nothing could be recovered.
+        """
+        self.parsed_total += 1
+        drafts = self.parse_blocks(text)
+        if not drafts:
+            self.failures += 1
+            print(f"Parsing error: no drafts recovered from {len(text or '')} characters of output")
+            return [SMSDraft(type="Hata", content="AI yanıtı ayrıştırılamadı.", score=0)]
+        best_draft = max(drafts, key=lambda d: d.score)
+        best_draft.is_recommended = True
+        return drafts
+
+    def parse_single(self, text: str, draft_type: str) -> SMSDraft:
+        """
+        Parse a single-message completion (refinement), dropping any header,
+        echoed wrapper tags and the score tag.
+        """
+        text = text or ""
+        headers = list(HEADER_PATTERN.finditer(text))
+        if headers:
+            text = text[headers[0].end():headers[1].start() if len(headers) > 1 else len(text)]
+        content, score = self._clean_content(text)
+        return SMSDraft(type=draft_type, content=content, score=score or 0)
+
+    def split_numbered(self, text: str) -> Dict[int, str]:
+        """
+        Split a batch completion with numbered headers (---1---, ---2---)
+        into block bodies keyed by item number. Later duplicates are ignored.
+        """
+        blocks: Dict[int, str] = {}
+        if not text:
+            return blocks
+        headers = list(HEADER_PATTERN.finditer(text))
+        for i, header in enumerate(headers):
+            number = NUMBER_PATTERN.search(header.group(1))
+            if not number:
+                continue
+            end = headers[i + 1].start() if i + 1 < len(headers) else len(text)
+            blocks.setdefault(int(number.group()), text[header.end():end])
+        return blocks
+
+    def split_closed_blocks(self, buffer: str) -> Tuple[List[str], str]:
+        """
+        For streaming: split off every block whose closing delimiter has
+        already arrived. Returns the closed blocks and the still-open remainder.
+        """
+        starts = [m.start() for m in HEADER_PATTERN.finditer(buffer)]
+        if len(starts) < 2:
+            return [], buffer
+        blocks = [buffer[starts[i]:starts[i + 1]] for i in range(len(starts) - 1)]
+        return blocks, buffer[starts[-1]:]
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "parsed_total": self.parsed_total,
+            "failures": self.failures,
+            "failure_rate": round(self.failures / self.parsed_total, 3) if self.parsed_total else 0.0,
+            "recovered_blocks": self.recovered_blocks,
+            "rejected_blocks": self.rejected_blocks
+        }
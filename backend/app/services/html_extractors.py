@@ -0,0 +1,180 @@
+from typing import Dict, List
+
+# Tags whose text never counts as visible page text
+NON_TEXT_TAGS = {"script", "style"}
+CONTACT_SECTION_MARKERS = ("footer", "contact", "iletisim", "bottom")
+
+
+def new_signals() -> dict:
+    return {
+        "title": "",
+        "meta_description": "",
+        "tel_links": [],
+        # tel: links located inside a footer or contact section
+        "contact_tel_links": [],
+        "text_parts": [],
+        # Logo sources keyed by kind; the first hit of each kind wins
+        "logo_hits": {}
+    }
+
+
+def visit_tag(name: str, attrs: Dict[str, str], signals: dict) -> None:
+    """
+    Collect enrichment signals from one element.
+    Shared by every backend so they produce identical results; multi-valued
+    attributes (class, rel) are passed as space-separated strings.
+    """
+    if name == "a":
+        href = attrs.get("href")
+        if href and href.startswith("tel:"):
+            signals["tel_links"].append(href.replace("tel:", "").strip())
+    elif name == "img":
+        src = attrs.get("src")
+        if not src:
+            return
+        logo_hits = signals["logo_hits"]
+        if 'logo' in (attrs.get("class") or "").lower():
+            logo_hits.setdefault("img_class", src)
+        if 'logo' in (attrs.get("id") or "").lower():
+            logo_hits.setdefault("img_id", src)
+        if 'logo' in (attrs.get("alt") or "").lower():
+            logo_hits.setdefault("img_alt", src)
+        if 'logo' in src.lower():
+            logo_hits.setdefault("img_src", src)
+    elif name == "meta":
+        if attrs.get("property") == "og:image" and attrs.get("content"):
+            signals["logo_hits"].setdefault("og_image", attrs["content"])
+        elif attrs.get("name") == "description" and not signals["meta_description"]:
+            signals["meta_description"] = attrs.get("content") or ""
+    elif name == "link":
+        if 'icon' in (attrs.get("rel") or "").lower() and attrs.get("href"):
+            signals["logo_hits"].setdefault("icon", attrs["href"])
+
+
+def is_contact_section(name: str, attrs: Dict[str, str]) -> bool:
+    if name == "footer":
+        return True
+    marker_text = f"{attrs.get('id') or ''} {attrs.get('class') or ''}".lower()
+    return any(marker in marker_text for marker in CONTACT_SECTION_MARKERS)
+
+
+def _flat_attrs(attrs: dict) -> Dict[str, str]:
+    return {k: " ".join(v) if isinstance(v, list) else v for k, v in attrs.items()}
+
+
+class BeautifulSoupExtractor:
+    """
+    Pure-Python BeautifulSoup walk; works with "html.parser" (no extra
+    dependency) or "lxml" as the tree builder.
+    """
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+        self.name = f"bs4+{features}"
+
+    def extract(self, html: str) -> dict:
+        from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+        soup = BeautifulSoup(html, self.features)
+        signals = new_signals()
+        text_parts: List[str] = signals["text_parts"]
+
+        for element in soup.descendants:
+            if isinstance(element, NavigableString):
+                # Plain text only: skips comments, doctype and script/style contents
+                if type(element) in (NavigableString, CData):
+                    text_parts.append(str(element))
+                continue
+            if not isinstance(element, Tag):
+                continue
+            if element.name == "title":
+                if not signals["title"]:
+                    signals["title"] = element.string or ""
+                continue
+            attrs = _flat_attrs(element.attrs)
+            tel_count = len(signals["tel_links"])
+            visit_tag(element.name, attrs, signals)
+            if len(signals["tel_links"]) > tel_count and any(
+                is_contact_section(parent.name, _flat_attrs(parent.attrs)) for parent in element.parents
+            ):
+                signals["contact_tel_links"].append(signals["tel_links"][-1])
+        return signals
+
+
+class SelectolaxExtractor:
+    """
+    C-backed (lexbor) single traversal; the fastest backend when installed.
+    """
+    name = "selectolax"
+
+    def extract(self, html: str) -> dict:
+        from selectolax.lexbor import LexborHTMLParser
+
+        tree = LexborHTMLParser(html)
+        signals = new_signals()
+        text_parts: List[str] = signals["text_parts"]
+        if tree.root is None:
+            return signals
+
+        for node in tree.root.traverse(include_text=True):
+            tag = node.tag
+            if tag == "-text":
+                parent = node.parent
+                if parent is None or parent.tag not in NON_TEXT_TAGS:
+                    text_parts.append(node.text_content or "")
+                continue
+            if tag.startswith("-"):
+                # Comments, doctype and other non-element nodes
+                continue
+            if tag == "title":
+                if not signals["title"]:
+                    signals["title"] = node.text(deep=True)
+                continue
+            tel_count = len(signals["tel_links"])
+            visit_tag(tag, {k: v or "" for k, v in node.attributes.items()}, signals)
+            if len(signals["tel_links"]) > tel_count and self._in_contact_section(node):
+                signals["contact_tel_links"].append(signals["tel_links"][-1])
+        return signals
+
+    def _in_contact_section(self, node) -> bool:
+        parent = node.parent
+        while parent is not None and not parent.tag.startswith("-"):
+            if is_contact_section(parent.tag, {k: v or "" for k, v in parent.attributes.items()}):
+                return True
+            parent = parent.parent
+        return False
+
+
+def _is_installed(module: str) -> bool:
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def get_extractor(backend: str = "auto"):
+    """
+    Build the HTML extractor for a backend name: "selectolax", "lxml",
+    "html.parser" or "auto" (fastest installed backend).
+    """
+    if backend == "auto":
+        if _is_installed("selectolax"):
+            return SelectolaxExtractor()
+        if _is_installed("lxml"):
+            return BeautifulSoupExtractor("lxml")
+        return BeautifulSoupExtractor("html.parser")
+    if backend == "selectolax":
+        return SelectolaxExtractor()
+    if backend in ("lxml", "html.parser"):
+        return BeautifulSoupExtractor(backend)
+    raise ValueError(f"Unknown HTML parser backend: {backend}")
+
+
+def available_backends() -> List[str]:
+    backends = ["html.parser"]
+    if _is_installed("lxml"):
+        backends.append("lxml")
+    if _is_installed("selectolax"):
+        backends.append("selectolax")
+    return backends
@@ -1,125 +1,76 @@
-import httpx
-import os
 import uuid
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
 from firebase_admin import storage
-import firebase_admin
-
-import idna
-from urllib.parse import urljoin, urlparse, urlunparse
+from app.clients.http_client import http_pool
+from app.core.executor import firestore_executor
+from app.exceptions.api_exceptions import EnrichmentStepError
+from app.services.page_analyzer import PageAnalyzer
 
 class LogoExtractionService:
     def __init__(self):
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-
-    def _normalize_url(self, url: str) -> str:
-        """
-        Convert IDN (Internationalized Domain Names) to Punycode.
-        Example: https://odtüden.com.tr -> https://xn--otden-kva1b.com.tr
-        """
-        try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname
-            if hostname:
-                # Convert hostname to punycode
-                puny_host = idna.encode(hostname).decode('ascii')
-                # Replace hostname in parsed URL
-                return urlunparse(parsed._replace(netloc=puny_host if not parsed.port else f"{puny_host}:{parsed.port}"))
-            return url
-        except Exception as e:
-            print(f"URL normalization error: {e}")
-            return url
+        self.page_analyzer = PageAnalyzer()
 
     async def extract_logo_from_url(self, website_url: str) -> str:
         """
-        Scrape website HTML to identify and return the logo URL.
-        Searches for og:image, favicons, and images with "logo" in class/id/alt.
+        Identify and return the logo URL from the shared page analysis.
+        Candidates are ranked og:image, favicon, then <img> tags with "logo"
+        in class/id/alt, then any image with "logo" in its filename.
+        Returns None when the page has no logo; raises EnrichmentStepError
+        when the page could not be fetched.
         """
-        normalized_url = self._normalize_url(website_url)
-        try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True, headers=self.headers) as client:
-                response = await client.get(normalized_url)
-                if response.status_code != 200:
-                    print(f"Failed to fetch {website_url}: {response.status_code}")
-                    return None
-                
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # 1. Check Open Graph Image (common for brand logos)
-                og_image = soup.find("meta", property="og:image")
-                if og_image and og_image.get("content"):
-                    return urljoin(website_url, og_image.get("content"))
-                
-                # 2. Check for Favicons
-                icon_link = soup.find("link", rel=lambda x: x and 'icon' in x.lower())
-                if icon_link and icon_link.get("href"):
-                    return urljoin(website_url, icon_link.get("href"))
-                
-                # 3. Check for <img> tags with "logo" in class, id, or alt
-                logo_img = soup.find("img", {
-                    "class": lambda x: x and 'logo' in x.lower(),
-                }) or soup.find("img", {
-                    "id": lambda x: x and 'logo' in x.lower(),
-                }) or soup.find("img", {
-                    "alt": lambda x: x and 'logo' in x.lower(),
-                })
-                
-                if logo_img and logo_img.get("src"):
-                    return urljoin(website_url, logo_img.get("src"))
-                
-                # 4. Fallback: Search all images for anything with "logo" in the filename
-                for img in soup.find_all("img", src=True):
-                    if 'logo' in img["src"].lower():
-                        return urljoin(website_url, img["src"])
-
-        except Exception as e:
-            print(f"Logo extraction error for {website_url}: {e}")
-        
+        analysis = await self.page_analyzer.analyze(website_url)
+        if analysis is None:
+            raise EnrichmentStepError(f"Web sitesi alınamadı: {website_url}")
+        if analysis["logo_candidates"]:
+            return analysis["logo_candidates"][0]
         return None
 
     async def download_and_store_logo(self, logo_url: str, customer_id: str) -> str:
         """
         Download logo image and store it in Firebase Storage.
-        Returns the public URL of the stored logo.
+        Returns the public URL of the stored logo, or the original URL when
+        storing fails; raises EnrichmentStepError when the download fails.
         """
         if not logo_url:
             return None
 
         try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True, headers=self.headers) as client:
-                response = await client.get(logo_url)
-                if response.status_code != 200:
-                    print(f"Failed to download logo from {logo_url}: {response.status_code}")
-                    return None
-                
-                content_type = response.headers.get("Content-Type", "image/png")
-                # Extract extension from content type or URL
-                ext = content_type.split("/")[-1] if "/" in content_type else "png"
-                if len(ext) > 4: ext = "png" # Sanity check for long extensions
-                
-                filename = f"logos/{customer_id}_{uuid.uuid4().hex[:8]}.{ext}"
-                
-                # Get the default bucket
-                bucket = storage.bucket()
-                blob = bucket.blob(filename)
-                
-                # Upload the image content
-                blob.upload_from_string(
-                    response.content,
-                    content_type=content_type
-                )
-                
-                # Make the blob public
-                blob.make_public()
-                
-                return blob.public_url
+            response = await http_pool.get(logo_url, headers=self.headers)
+        except Exception as e:
+            raise EnrichmentStepError(f"Logo indirilemedi: {logo_url} ({e})") from e
+        if response.status_code != 200:
+            raise EnrichmentStepError(f"Logo indirilemedi: {logo_url} ({response.status_code})")
+
+        try:
+            content_type = response.headers.get("Content-Type", "image/png")
+            # Extract extension from content type or URL
+            ext = content_type.split("/")[-1] if "/" in content_type else "png"
+            if len(ext) > 4: ext = "png" # Sanity check for long extensions
+            
+            filename = f"logos/{customer_id}_{uuid.uuid4().hex[:8]}.{ext}"
+            
+            # The Storage client is synchronous: upload off the event loop
+            return await firestore_executor.run(self._upload, filename, response.content, content_type)
 
         except Exception as e:
             print(f"Error storing logo for customer {customer_id}: {e}")
             # Fallback: return the original logo URL if storage fails
             return logo_url
+
+    def _upload(self, filename: str, content: bytes, content_type: str) -> str:
+        # Get the default bucket
+        bucket = storage.bucket()
+        blob = bucket.blob(filename)
+        
+        # Upload the image content
+        blob.upload_from_string(
+            content,
+            content_type=content_type
+        )
+        
+        # Make the blob public
+        blob.make_public()
         
-        return logo_url
+        return blob.public_url
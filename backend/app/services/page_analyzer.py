@@ -0,0 +1,176 @@
+import asyncio
+import re
+import time
+import idna
+from urllib.parse import urljoin, urlparse, urlunparse
+from typing import Dict, Optional
+from app.clients.http_client import http_pool
+from app.core.cache import InMemoryCache
+from app.services.html_extractors import get_extractor
+from app.services.phone_ranker import text_mentions
+from app.config.settings import (
+    SCRAPE_CACHE_SOFT_TTL_SECONDS, SCRAPE_CACHE_HARD_TTL_SECONDS, SCRAPE_CACHE_MAX_ENTRIES,
+    HTML_PARSER_BACKEND
+)
+
+PHONE_PATTERN = re.compile(
+    r'((?:\+90|0?)\s?\(?[2-9]\d{2}\)?\s?\d{3}\s?\d{2}\s?\d{2})|(444\s?\d{4})|(0850\s?\d{3}\s?\d{2}\s?\d{2})'
+)
+# Visible text kept per page (characters); compaction picks the prompt context from it
+TEXT_BLOCKS_LIMIT = 50000
+
+class PageAnalyzer:
+    """
+    Fetches a homepage once and walks its DOM once, producing everything the
+    enrichment services need: logo candidates, tel: links, regex phone
+    candidates, title/meta description and visible text blocks.
+
+    Results are cached per URL and shared by WebsiteScraper and
+    LogoExtractionService: fresh entries are served directly, entries past the
+    soft TTL are served stale while a conditional GET revalidates them in the
+    background, and entries past the hard TTL are refetched. Concurrent
+    analyses of the same URL share one fetch.
+    """
+    _cache = InMemoryCache(max_entries=SCRAPE_CACHE_MAX_ENTRIES)
+    _pending: Dict[str, asyncio.Task] = {}
+    _revalidating: set = set()
+    _background_tasks: set = set()
+
+    def __init__(self, parser_backend: str = HTML_PARSER_BACKEND):
+        self.extractor = get_extractor(parser_backend)
+        self.headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        }
+
+    def normalize_url(self, url: str) -> str:
+        """
+        Convert IDN (Internationalized Domain Names) to Punycode.
+        Example: https://odtüden.com.tr -> https://xn--otden-kva1b.com.tr
+        """
+        try:
+            parsed = urlparse(url)
+            hostname = parsed.hostname
+            if hostname:
+                puny_host = idna.encode(hostname).decode('ascii')
+                return urlunparse(parsed._replace(netloc=puny_host if not parsed.port else f"{puny_host}:{parsed.port}"))
+            return url
+        except Exception as e:
+            print(f"URL normalization error: {e}")
+            return url
+
+    def _cache_key(self, normalized_url: str) -> str:
+        parsed = urlparse(normalized_url.strip())
+        return urlunparse(parsed._replace(
+            scheme=parsed.scheme.lower(),
+            netloc=parsed.netloc.lower(),
+            path=parsed.path.rstrip("/"),
+            fragment=""
+        ))
+
+    async def analyze(self, url: str) -> Optional[dict]:
+        """
+        Return the page analysis for a URL, or None if the page could not be fetched.
+        """
+        normalized_url = self.normalize_url(url)
+        key = self._cache_key(normalized_url)
+        entry = self._cache.get(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry["fetched_at"]
+            if age > SCRAPE_CACHE_SOFT_TTL_SECONDS and key not in self._revalidating:
+                self._revalidating.add(key)
+                task = asyncio.create_task(self._revalidate(key, normalized_url, entry))
+                self._background_tasks.add(task)
+                task.add_done_callback(self._background_tasks.discard)
+            return entry["data"]
+
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_store(key, normalized_url))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        entry = await asyncio.shield(task)
+        return entry["data"] if entry else None
+
+    async def _fetch_and_store(self, key: str, normalized_url: str) -> Optional[dict]:
+        entry = await self._fetch(normalized_url)
+        if entry is not None:
+            self._cache.set(key, entry, SCRAPE_CACHE_HARD_TTL_SECONDS)
+        return entry
+
+    async def _revalidate(self, key: str, normalized_url: str, entry: dict) -> None:
+        try:
+            fresh = await self._fetch(normalized_url, entry)
+            if fresh is not None:
+                self._cache.set(key, fresh, SCRAPE_CACHE_HARD_TTL_SECONDS)
+        finally:
+            self._revalidating.discard(key)
+
+    async def _fetch(self, normalized_url: str, cached_entry: dict = None) -> Optional[dict]:
+        """
+        Fetch and analyze the page, sending conditional headers when a cached entry exists.
+        Returns a cache entry, or None if the page could not be fetched.
+        """
+        headers = dict(self.headers)
+        if cached_entry:
+            if cached_entry.get("etag"):
+                headers["If-None-Match"] = cached_entry["etag"]
+            if cached_entry.get("last_modified"):
+                headers["If-Modified-Since"] = cached_entry["last_modified"]
+        try:
+            response = await http_pool.get(normalized_url, headers=headers)
+            if response.status_code == 304 and cached_entry:
+                return {**cached_entry, "fetched_at": time.monotonic()}
+            if response.status_code == 200:
+                return {
+                    "data": self.analyze_html(response.text, str(response.url)),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "fetched_at": time.monotonic()
+                }
+            print(f"Failed to fetch {normalized_url}: {response.status_code}")
+        except Exception as e:
+            print(f"Page fetch error for {normalized_url}: {e}")
+        return None
+
+    def analyze_html(self, html: str, base_url: str) -> dict:
+        """
+        Walk the DOM once (with the configured parser backend) and turn the
+        collected signals into the analysis shared by the enrichment services.
+        """
+        signals = self.extractor.extract(html)
+        text_parts = signals["text_parts"]
+
+        raw_text = "".join(text_parts)
+        mentions = text_mentions(raw_text, PHONE_PATTERN)
+        phone_candidates = [m["raw"] for m in mentions]
+        contact_tel_links = set(signals["contact_tel_links"])
+        phone_evidence = [
+            {"raw": link, "source": "tel", "in_contact": link in contact_tel_links}
+            for link in signals["tel_links"]
+        ] + mentions
+
+        text_blocks = []
+        text_chars = 0
+        for part in text_parts:
+            part = part.strip()
+            if not part:
+                continue
+            if text_chars + len(part) > TEXT_BLOCKS_LIMIT:
+                break
+            text_blocks.append(part)
+            text_chars += len(part)
+
+        logo_hits = signals["logo_hits"]
+        priority = ["og_image", "icon", "img_class", "img_id", "img_alt", "img_src"]
+        logo_candidates = [urljoin(base_url, logo_hits[k]) for k in priority if k in logo_hits]
+
+        return {
+            "title": signals["title"],
+            "meta_description": signals["meta_description"],
+            "text_blocks": text_blocks,
+            "tel_links": signals["tel_links"],
+            "phone_candidates": phone_candidates,
+            "phone_evidence": phone_evidence,
+            "logo_candidates": logo_candidates
+        }
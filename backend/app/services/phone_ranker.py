@@ -0,0 +1,151 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.utils.text import fold_text
+
+# Words that mark a contact / customer service context, folded to ASCII.
+# No word boundaries: page text is joined from adjacent nodes without spaces.
+CONTACT_KEYWORD_PATTERN = re.compile(
+    r'iletisim|musteri hizmetleri|cagri merkezi|bize ulasin|telefon|tel(?![a-z])|santral|destek|contact|call center'
+)
+
+CALL_CENTER = "call_center"
+LANDLINE = "landline"
+MOBILE = "mobile"
+
+# Evidence weights
+TEL_LINK_SCORE = 3.0
+CONTACT_SECTION_SCORE = 2.0
+MENTION_SCORE = 1.0
+MAX_MENTIONS_SCORED = 3
+FOOTER_SCORE = 1.0
+FOOTER_POSITION = 0.75  # Mentions in the last quarter of the page text
+CATEGORY_SCORE = {CALL_CENTER: 2.0, LANDLINE: 1.0, MOBILE: 0.0}
+# Score at which a lone candidate is considered fully established
+CONFIDENT_SCORE = 5.0
+
+
+def normalize_phone(raw: str) -> Optional[str]:
+    """
+    Canonicalize a Turkish phone number to E.164 (+90XXXXXXXXXX, or +90444XXXX
+    for 444 call-center lines). Returns None for foreign or malformed numbers.
+    """
+    if not raw:
+        return None
+    raw = raw.strip()
+    digits = re.sub(r'\D', '', raw)
+    if digits.startswith("0090"):
+        digits = digits[4:]
+    elif digits.startswith("90") and len(digits) in (9, 12):
+        digits = digits[2:]
+    elif raw.startswith("+"):
+        # International prefix other than +90
+        return None
+    if digits.startswith("0"):
+        digits = digits[1:]
+
+    if len(digits) == 7 and digits.startswith("444"):
+        return f"+90{digits}"
+    if len(digits) == 10 and (digits[0] in "2345" or digits[:3] in ("800", "850")):
+        return f"+90{digits}"
+    return None
+
+
+def phone_category(e164: str) -> str:
+    national = e164[3:]
+    if national.startswith(("444", "850", "800")):
+        return CALL_CENTER
+    if national.startswith("5"):
+        return MOBILE
+    return LANDLINE
+
+
+class PhoneRanker:
+    """
+    Deterministic scoring of phone candidates found on a page.
+    Evidence items are dicts with "raw", "source" ("tel" or "text"),
+    "in_contact" (inside a footer/contact section or next to a contact
+    keyword) and, for text mentions, "position" (0-1 through the page text).
+    """
+
+    def rank(self, evidence: List[dict]) -> List[Tuple[str, float]]:
+        """
+        Return (E.164 number, score) pairs, best first.
+        """
+        scores: Dict[str, float] = defaultdict(float)
+        mentions: Dict[str, int] = defaultdict(int)
+        tel_linked = set()
+        in_contact = set()
+        in_footer = set()
+
+        for item in evidence:
+            number = normalize_phone(item.get("raw", ""))
+            if not number:
+                continue
+            scores[number] += 0.0
+            if item.get("source") == "tel":
+                tel_linked.add(number)
+            else:
+                mentions[number] += 1
+                if item.get("position", 0.0) >= FOOTER_POSITION:
+                    in_footer.add(number)
+            if item.get("in_contact"):
+                in_contact.add(number)
+
+        for number in scores:
+            if number in tel_linked:
+                scores[number] += TEL_LINK_SCORE
+            if number in in_contact:
+                scores[number] += CONTACT_SECTION_SCORE
+            if number in in_footer:
+                scores[number] += FOOTER_SCORE
+            scores[number] += MENTION_SCORE * min(mentions[number], MAX_MENTIONS_SCORED)
+            scores[number] += CATEGORY_SCORE[phone_category(number)]
+
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+    def best_phone(self, evidence: List[dict]) -> Tuple[Optional[str], float]:
+        """
+        Return the top candidate and a 0-1 confidence combining how strong its
+        evidence is and how clearly it beats the runner-up.
+        """
+        ranked = self.rank(evidence)
+        if not ranked:
+            return None, 0.0
+        top_number, top_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        if top_score <= 0:
+            return top_number, 0.0
+        margin = top_score / (top_score + runner_up)
+        strength = min(top_score / CONFIDENT_SCORE, 1.0)
+        return top_number, round(margin * strength, 3)
+
+
+def evidence_from_candidates(candidates: List[str]) -> List[dict]:
+    """
+    Build minimal evidence when only raw candidate strings are known.
+    """
+    return [{"raw": c, "source": "text", "in_contact": False, "position": 0.0} for c in candidates]
+
+
+def text_mentions(raw_text: str, pattern: re.Pattern, window: int = 60) -> List[dict]:
+    """
+    Find phone mentions in page text together with their contact context.
+    """
+    folded = fold_text(raw_text)
+    length = max(len(raw_text), 1)
+    evidence = []
+    for match in pattern.finditer(raw_text):
+        num = match.group().strip()
+        if len(re.sub(r'\D', '', num)) < 7:
+            continue
+        # Labels usually precede the number, so look mostly backwards
+        context = folded[max(0, match.start() - window):match.end() + window // 4]
+        evidence.append({
+            "raw": num,
+            "source": "text",
+            "in_contact": bool(CONTACT_KEYWORD_PATTERN.search(context)),
+            "position": match.start() / length
+        })
+    return evidence
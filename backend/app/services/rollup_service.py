@@ -0,0 +1,363 @@
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from firebase_admin import firestore
+from google.cloud.firestore_v1.field_path import FieldPath
+from app.core.migrations import MigrationMarkers
+
+# Firestore caps a write batch at 500 operations
+BATCH_LIMIT = 500
+# Day and week series are built from day counters; cap how many one request reads
+MAX_DAILY_RANGE_DAYS = 366
+
+# Campaign counter periods
+DAY = "d"
+MONTH = "m"
+ALL = "all"
+GRANULARITIES = ("day", "week", "month")
+# Marker of the one-off backfill that builds the counters for pre-existing data
+BACKFILL_MIGRATION = "analytics_rollups"
+
+
+class RollupService:
+    """
+    Materialized per-user counters for dashboard analytics.
+
+    message_rollups: one document per user and day ({user_id}_{YYYY-MM-DD})
+    holding the number of saved messages created that day.
+
+    campaign_rollups: campaigns created per user and day ({user_id}_d_{YYYY-MM-DD}),
+    month ({user_id}_m_{YYYY-MM}) and all time ({user_id}_all), each with a
+    created count plus counts by current status and by customer. Document
+    ids sort by date, so a date range is one document-id range query and
+    needs no composite index.
+
+    Counters change with Increment transforms in the same batch as the
+    write they account for; the backfill jobs rebuild them from scratch.
+    Data written before the counters existed is only counted once the
+    backfill has run (ensure_backfilled, on the scheduler's lease holder);
+    until then reads fall back to counting the documents themselves.
+    """
+
+    def __init__(self):
+        self.db = firestore.client()
+        self.collection = self.db.collection("message_rollups")
+        self.campaigns = self.db.collection("campaign_rollups")
+        self.markers = MigrationMarkers()
+
+    def ready(self) -> bool:
+        """
+        Whether the counters cover all data (the backfill has completed).
+        """
+        return self.markers.is_done(BACKFILL_MIGRATION)
+
+    def ensure_backfilled(self) -> Optional[Dict[str, Any]]:
+        """
+        Run the full backfill unless it has completed before.
+        """
+        return self.markers.run_once(BACKFILL_MIGRATION, self.backfill)
+
+    def backfill(self) -> Dict[str, Any]:
+        """
+        Rebuild every user's campaign and message counters.
+        """
+        return {"campaigns": self.backfill_campaigns(), "messages": self.backfill_messages()}
+
+    @staticmethod
+    def day_key(created_at) -> str:
+        # Datetimes and Firestore timestamps bucket by their own calendar day;
+        # legacy ISO strings by their date part
+        if hasattr(created_at, "strftime"):
+            return created_at.strftime("%Y-%m-%d")
+        return str(created_at)[:10]
+
+    def _ref(self, user_id: str, day: str):
+        return self.collection.document(f"{user_id}_{day}")
+
+    def record_messages(self, batch, user_id: str, day_deltas: Dict[str, int]) -> None:
+        """
+        Add counter changes ({day: +n / -n}) to a write batch.
+        """
+        for day, delta in day_deltas.items():
+            if delta:
+                batch.set(self._ref(user_id, day), {
+                    "user_id": user_id,
+                    "date": day,
+                    "count": firestore.Increment(delta),
+                    "updated_at": datetime.now()
+                }, merge=True)
+
+    def message_counts(self, user_id: str, days: List[str]) -> Dict[str, int]:
+        """
+        Read the counters for the given days in one batched lookup.
+        """
+        if not self.ready():
+            return self._message_counts_from_documents(user_id, days)
+        counts = {day: 0 for day in days}
+        for snapshot in self.db.get_all([self._ref(user_id, day) for day in days]):
+            if snapshot.exists:
+                data = snapshot.to_dict()
+                counts[data["date"]] = max(0, data.get("count", 0))
+        return counts
+
+    def _message_counts_from_documents(self, user_id: str, days: List[str]) -> Dict[str, int]:
+        # Pre-backfill fallback: count the user's saved messages directly
+        counts = {day: 0 for day in days}
+        campaigns = self.db.collection("campaigns").where("user_id", "==", user_id)
+        for campaign in campaigns.select(["user_id"]).stream():
+            for msg in campaign.reference.collection("saved_messages").select(["created_at"]).stream():
+                created_at = msg.to_dict().get("created_at")
+                if created_at and self.day_key(created_at) in counts:
+                    counts[self.day_key(created_at)] += 1
+        return counts
+
+    # --- Campaign counters ---
+
+    def _campaign_ref(self, user_id: str, period: str, key: str = None):
+        return self.campaigns.document(f"{user_id}_{ALL}" if period == ALL else f"{user_id}_{period}_{key}")
+
+    def _campaign_docs(self, user_id: str, created_at) -> List[Tuple[Any, Dict[str, str]]]:
+        day = self.day_key(created_at)
+        return [
+            (self._campaign_ref(user_id, DAY, day), {"period": DAY, "key": day}),
+            (self._campaign_ref(user_id, MONTH, day[:7]), {"period": MONTH, "key": day[:7]}),
+            (self._campaign_ref(user_id, ALL), {"period": ALL, "key": ALL})
+        ]
+
+    def record_campaign(self, batch, user_id: str, created_at, created: int = 0,
+                        status_deltas: Dict[str, int] = None, customer_deltas: Dict[str, int] = None) -> None:
+        """
+        Add campaign counter changes to a write batch, applied to the day,
+        month and all-time counters of the campaign's creation date.
+        """
+        status_changes = {k: firestore.Increment(v) for k, v in (status_deltas or {}).items() if k and v}
+        customer_changes = {k: firestore.Increment(v) for k, v in (customer_deltas or {}).items() if k and v}
+        if not (created or status_changes or customer_changes):
+            return
+
+        change: Dict[str, Any] = {"user_id": user_id, "updated_at": datetime.now()}
+        if created:
+            change["created"] = firestore.Increment(created)
+        if status_changes:
+            change["by_status"] = status_changes
+        if customer_changes:
+            change["by_customer"] = customer_changes
+        for ref, identity in self._campaign_docs(user_id, created_at):
+            batch.set(ref, {**change, **identity}, merge=True)
+
+    def campaign_counters(self, user_id: str, month: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Read the all-time and the given month's (YYYY-MM) counters in one
+        batched lookup.
+        """
+        if not self.ready():
+            pieces = self._campaign_pieces_from_documents(user_id)
+            return {"created": len(pieces)}, {"created": sum(1 for p in pieces if p["key"].startswith(month))}
+        all_ref = self._campaign_ref(user_id, ALL)
+        month_ref = self._campaign_ref(user_id, MONTH, month)
+        found = {snapshot.id: snapshot.to_dict() for snapshot in self.db.get_all([all_ref, month_ref]) if snapshot.exists}
+        return found.get(all_ref.id, {}), found.get(month_ref.id, {})
+
+    def _campaign_range(self, user_id: str, period: str, first: str, last: str) -> List[Dict[str, Any]]:
+        """
+        Stream the counters of one period type with keys in [first, last].
+        """
+        docs = (self.campaigns
+                .where(FieldPath.document_id(), ">=", self._campaign_ref(user_id, period, first))
+                .where(FieldPath.document_id(), "<=", self._campaign_ref(user_id, period, last))
+                .stream())
+        return [doc.to_dict() for doc in docs]
+
+    def _campaign_pieces_from_documents(self, user_id: str, first: str = None, last: str = None) -> List[Dict[str, Any]]:
+        """
+        Pre-backfill fallback: one day counter per campaign created in
+        [first, last], read from the campaign documents themselves.
+        """
+        pieces = []
+        query = self.db.collection("campaigns").where("user_id", "==", user_id)
+        for campaign in query.select(["created_at", "status", "customer_id"]).stream():
+            data = campaign.to_dict()
+            if not data.get("created_at"):
+                continue
+            day = self.day_key(data["created_at"])
+            if (first and day < first) or (last and day > last):
+                continue
+            pieces.append({
+                "key": day, "created": 1,
+                "by_status": {data["status"]: 1} if data.get("status") else {},
+                "by_customer": {data["customer_id"]: 1} if data.get("customer_id") else {}
+            })
+        return pieces
+
+    def campaign_analytics(self, user_id: str, start: date, end: date, granularity: str = "day") -> Dict[str, Any]:
+        """
+        Campaigns created between start and end (inclusive): total, counts by
+        current status and by customer, and a day/week/month series.
+        Reads at most one counter per day (day/week series) or one per month
+        plus the days of partial edge months (month series), independent of
+        how many campaigns the user has.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+        if end < start:
+            raise ValueError("end must not be before start")
+
+        if granularity != "month" and (end - start).days + 1 > MAX_DAILY_RANGE_DAYS:
+            raise ValueError(f"{granularity} series cover at most {MAX_DAILY_RANGE_DAYS} days; use month")
+
+        pieces = []
+        if not self.ready():
+            pieces = self._campaign_pieces_from_documents(user_id, start.isoformat(), end.isoformat())
+        elif granularity == "month":
+            # Full months come from month counters, partial edge months from day counters
+            first_full = start if start.day == 1 else _next_month(start)
+            after_last_full = _next_month(end) if end + timedelta(days=1) == _next_month(end) else end.replace(day=1)
+            edges = [(start, end)]
+            if first_full < after_last_full:
+                pieces += self._campaign_range(user_id, MONTH, first_full.strftime("%Y-%m"),
+                                               (after_last_full - timedelta(days=1)).strftime("%Y-%m"))
+                edges = [(start, first_full - timedelta(days=1)), (after_last_full, end)]
+            for first, last in edges:
+                if first <= last:
+                    pieces += self._campaign_range(user_id, DAY, first.isoformat(), last.isoformat())
+        else:
+            pieces = self._campaign_range(user_id, DAY, start.isoformat(), end.isoformat())
+
+        series = {bucket: 0 for bucket in _buckets(start, end, granularity)}
+        by_status: Counter = Counter()
+        by_customer: Counter = Counter()
+        for piece in pieces:
+            series[_bucket(piece["key"], granularity)] += piece.get("created", 0)
+            by_status.update(piece.get("by_status", {}))
+            by_customer.update(piece.get("by_customer", {}))
+
+        return {
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "granularity": granularity,
+            "total_campaigns": sum(series.values()),
+            "by_status": {k: v for k, v in by_status.items() if v > 0},
+            "by_customer": {k: v for k, v in by_customer.items() if v > 0},
+            "series": [{"period": bucket, "count": count} for bucket, count in series.items()]
+        }
+
+    # --- Backfill ---
+
+    def backfill_messages(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Rebuild the message counters from the saved messages of every
+        campaign (or only those of user_id). Counters are overwritten, so the
+        job can be rerun; messages saved or deleted while it runs may need
+        another run.
+        """
+        campaigns = self.db.collection("campaigns")
+        query = campaigns.where("user_id", "==", user_id) if user_id else campaigns
+        totals: Counter = Counter()
+        campaigns_scanned = 0
+        for campaign in query.stream():
+            owner = campaign.to_dict().get("user_id")
+            if not owner:
+                continue
+            campaigns_scanned += 1
+            for msg in campaign.reference.collection("saved_messages").select(["created_at"]).stream():
+                created_at = msg.to_dict().get("created_at")
+                if created_at:
+                    totals[(owner, self.day_key(created_at))] += 1
+
+        now = datetime.now()
+        rebuilt = {
+            self._ref(owner, day).id: {"user_id": owner, "date": day, "count": count, "updated_at": now}
+            for (owner, day), count in totals.items()
+        }
+        deleted = self._replace(self.collection, user_id, rebuilt)
+        return {
+            "campaigns_scanned": campaigns_scanned,
+            "messages_counted": sum(totals.values()),
+            "rollups_written": len(rebuilt),
+            "rollups_deleted": deleted
+        }
+
+    def backfill_campaigns(self, user_id: Optional[str] = None) -> Dict[str, int]:
+        """
+        Rebuild the campaign counters from the campaigns collection (or only
+        user_id's campaigns). Rerunnable, like backfill_messages.
+        """
+        campaigns = self.db.collection("campaigns")
+        query = campaigns.where("user_id", "==", user_id) if user_id else campaigns
+        now = datetime.now()
+        rebuilt: Dict[str, Dict[str, Any]] = {}
+        campaigns_counted = 0
+        for campaign in query.select(["user_id", "created_at", "status", "customer_id"]).stream():
+            data = campaign.to_dict()
+            owner, created_at = data.get("user_id"), data.get("created_at")
+            if not owner or not created_at:
+                continue
+            campaigns_counted += 1
+            for ref, identity in self._campaign_docs(owner, created_at):
+                doc = rebuilt.setdefault(ref.id, {
+                    "user_id": owner, **identity, "created": 0,
+                    "by_status": defaultdict(int), "by_customer": defaultdict(int), "updated_at": now
+                })
+                doc["created"] += 1
+                if data.get("status"):
+                    doc["by_status"][data["status"]] += 1
+                if data.get("customer_id"):
+                    doc["by_customer"][data["customer_id"]] += 1
+
+        for doc in rebuilt.values():
+            doc["by_status"] = dict(doc["by_status"])
+            doc["by_customer"] = dict(doc["by_customer"])
+        deleted = self._replace(self.campaigns, user_id, rebuilt)
+        return {
+            "campaigns_counted": campaigns_counted,
+            "rollups_written": len(rebuilt),
+            "rollups_deleted": deleted
+        }
+
+    def _replace(self, collection, user_id: Optional[str], rebuilt: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Overwrite the counters in a collection (all users', or only user_id's)
+        with the rebuilt documents, deleting counters no longer backed by data.
+        """
+        existing = collection.where("user_id", "==", user_id) if user_id else collection
+        stale = [doc.reference for doc in existing.select(["user_id"]).stream() if doc.id not in rebuilt]
+        writes = [("delete", ref, None) for ref in stale]
+        writes += [("set", collection.document(doc_id), data) for doc_id, data in rebuilt.items()]
+        self._commit_in_chunks(writes)
+        return len(stale)
+
+    def _commit_in_chunks(self, writes: Iterable) -> None:
+        writes = list(writes)
+        for start in range(0, len(writes), BATCH_LIMIT):
+            batch = self.db.batch()
+            for op, ref, data in writes[start:start + BATCH_LIMIT]:
+                if op == "delete":
+                    batch.delete(ref)
+                else:
+                    batch.set(ref, data)
+            batch.commit()
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def _bucket(day_or_month: str, granularity: str) -> str:
+    if granularity == "month":
+        return day_or_month[:7]
+    if granularity == "week":
+        # Weeks are labelled by their Monday
+        day = date.fromisoformat(day_or_month)
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day_or_month
+
+
+def _buckets(start: date, end: date, granularity: str) -> List[str]:
+    buckets = []
+    day = start
+    while day <= end:
+        bucket = _bucket(day.isoformat(), granularity)
+        if not buckets or buckets[-1] != bucket:
+            buckets.append(bucket)
+        day = _next_month(day) if granularity == "month" else day + timedelta(days=1)
+    return buckets
@@ -1,25 +1,48 @@
-import httpx
 import re
-from bs4 import BeautifulSoup
 from app.clients.gemini_client import GeminiClient
 from app.models.request_models import SMSRequest, RefineRequest, RefinementType
 from app.models.response_models import SMSResponse, SMSDraft
 import asyncio
+import json
 
 from app.services.website_scraper import WebsiteScraper
+from app.services.draft_parser import DraftParser
+from app.services.tone_recommender import ToneRecommender, FALLBACK_TONES
 from app.services.user_preferences_service import UserPreferencesService
 from app.models.user_preferences_models import UserPreferences
+from app.core.cache import ResultCache, create_cache_backend, make_cache_key
+from app.core.hedging import Hedger
+from app.exceptions.api_exceptions import AIServiceUnavailableError
+from app.config.settings import (
+    DRAFT_CACHE_BACKEND, DRAFT_CACHE_TTL_SECONDS, DRAFT_CACHE_MAX_ENTRIES,
+    REFINE_BATCH_MAX_ITEMS, REFINE_BATCH_MAX_CHARS, REFINE_BATCH_MAX_CONCURRENCY,
+    DRAFT_FANOUT_ENABLED, DRAFT_FANOUT_GROUP_SIZE, DRAFT_HEDGE_PERCENTILE, DRAFT_HEDGE_DEFAULT_DELAY_SECONDS
+)
+
+REFINE_INSTRUCTIONS = {
+    RefinementType.SHORTEN: "Bu mesajı daha kısa ve net hale getir (max 160 karakter).",
+    RefinementType.CLARIFY: "Bu mesajı daha anlaşılır ve net bir dille yeniden yaz.",
+    RefinementType.MORE_EXCITING: "Bu mesajı daha heyecan verici, coşkulu ve harekete geçirici bir dille yaz.",
+    RefinementType.MORE_FORMAL: "Bu mesajı daha kurumsal, resmi ve profesyonel bir dille yaz."
+}
 
 class SMSService:
     def __init__(self):
         self.client = GeminiClient()
         self.scraper = WebsiteScraper()
         self.prefs_service = UserPreferencesService()
+        self.draft_cache = ResultCache(
+            create_cache_backend(DRAFT_CACHE_BACKEND, DRAFT_CACHE_MAX_ENTRIES, "draft_cache"),
+            ttl=DRAFT_CACHE_TTL_SECONDS
+        )
         self.draft_types = [
             "Klasik", "Acil", "Samimi", "Minimalist", 
             "Hikaye Odaklı", "Soru & Cevap", "Modern", 
             "Lüks", "Genç", "Vurucu"
         ]
+        self.parser = DraftParser(self.draft_types)
+        self.tone_recommender = ToneRecommender(self.draft_types, self.client)
+        self.hedger = Hedger(DRAFT_HEDGE_PERCENTILE, DRAFT_HEDGE_DEFAULT_DELAY_SECONDS)
 
     def _sanitize_input(self, text: str) -> str:
         """Sanitize input to prevent prompt injection by removing potential system instructions."""
@@ -32,7 +55,7 @@ class SMSService:
         text = text.replace("<", "&lt;").replace(">", "&gt;")
         return text
 
-    def _construct_prompt(self, data: SMSRequest, scraped_info: str, phone_number: str, preferences: UserPreferences = None) -> str:
+    def _construct_prompt(self, data: SMSRequest, scraped_info: str, phone_number: str, preferences: UserPreferences = None, draft_types: list = None) -> str:
         products_str = self._sanitize_input(", ".join(data.products))
         scraped_info_safe = self._sanitize_input(scraped_info)
         website_url_safe = self._sanitize_input(data.website_url)
@@ -40,8 +63,8 @@ class SMSService:
         
         preference_bias = self._apply_preference_bias(preferences) if preferences else ""
         
-        count = min(max(data.message_count, 1), 10)
-        selected_types = self.draft_types[:count]
+        selected_types = draft_types or self._selected_types(data)
+        count = len(selected_types)
         
         # Prepare dynamic discount text
         discount_text = f"%{data.discount_rate}" if data.discount_rate > 0 else "İndirim Belirtilmedi (Fırsat/Hediye Odaklı)"
@@ -103,23 +126,20 @@ class SMSService:
             
         return prompt
 
-    async def generate_campaign_drafts(self, data: SMSRequest, user_id: str = None) -> SMSResponse:
-        print(f"DEBUG: Generating drafts for {data.website_url}")
-        
-        # Get user preferences
-        preferences = None
-        if user_id:
-            try:
-                preferences = self.prefs_service.get_preferences(user_id)
-            except Exception as e:
-                print(f"Error fetching preferences: {e}")
+    async def _load_preferences(self, user_id: str = None) -> UserPreferences:
+        if not user_id:
+            return None
+        try:
+            return await self.prefs_service.get_preferences(user_id)
+        except Exception as e:
+            print(f"Error fetching preferences: {e}")
+            return None
 
-        # Scrape website content
-        scraped_data = await self.scraper.scrape_site_info(data.website_url)
-        print(f"DEBUG: Scraped candidates: {scraped_data['candidates']}")
-        
-        # Determine the best phone number to use
-        # Prioritize the number provided in the request (e.g. from customer record)
+    async def _resolve_phone(self, data: SMSRequest, scraped_data: dict) -> str:
+        """
+        Determine the best phone number to use.
+        Prioritize the number provided in the request (e.g. from customer record).
+        """
         best_phone = data.phone_number
         
         if not best_phone:
@@ -127,8 +147,9 @@ class SMSService:
             try:
                 identified_phone = await self.scraper.identify_best_phone(
                     data.website_url, 
-                    scraped_data["info_text"], 
-                    scraped_data["candidates"]
+                    scraped_data["phone_context"],
+                    scraped_data["candidates"],
+                    scraped_data.get("phone_evidence")
                 )
                 best_phone = identified_phone or "Belirtilmedi"
             except Exception as e:
@@ -138,43 +159,191 @@ class SMSService:
             print(f"DEBUG: Using provided phone number: {best_phone}")
         
         print(f"DEBUG: Final contact phone used for SMS: {best_phone}")
-        
-        # Prepare Gemini Prompt
-        prompt = self._construct_prompt(data, scraped_data["info_text"], best_phone, preferences)
-        
-        # Call Gemini with retry for 429
-        print("DEBUG: Calling Gemini for drafts...")
-        max_retries = 2
-        for attempt in range(max_retries):
-            try:
-                generated_text = await self.client.generate_text(prompt)
-                print(f"DEBUG: Generated text length: {len(generated_text) if generated_text else 0}")
-                break
-            except Exception as e:
-                if "429" in str(e) and attempt < max_retries - 1:
-                    print(f"DEBUG: 429 detected, retrying in 5s... (Attempt {attempt+1})")
-                    await asyncio.sleep(5)
-                else:
-                    raise e
-        
-        # Parse Response
-        drafts = self._parse_generated_text(generated_text)
+        return best_phone
+
+    def _selected_types(self, data: SMSRequest) -> list:
+        count = min(max(data.message_count, 1), 10)
+        return self.draft_types[:count]
+
+    async def _prepare_generation_prompt(self, data: SMSRequest, user_id: str = None) -> str:
+        """
+        Gather preferences, scraped site info and contact phone, then build the draft prompt.
+        """
+        preferences = await self._load_preferences(user_id)
+        scraped_data = await self.scraper.scrape_site_info(data.website_url, data.products)
+        print(f"DEBUG: Scraped candidates: {scraped_data['candidates']}")
+        best_phone = await self._resolve_phone(data, scraped_data)
+        return self._construct_prompt(data, scraped_data["info_text"], best_phone, preferences)
+
+    def _preference_bucket(self, preferences: UserPreferences) -> dict:
+        """
+        Summarize preferences into the same bands _apply_preference_bias uses,
+        so users whose preferences produce the same prompt share cache entries.
+        """
+        if not preferences or preferences.total_saved_messages < 3:
+            return {}
+        if preferences.avg_message_length < 140:
+            length_band = "short"
+        elif preferences.avg_message_length > 200:
+            length_band = "long"
+        else:
+            length_band = "medium"
+        if preferences.emoji_usage_rate > 0.6:
+            emoji_band = "high"
+        elif preferences.emoji_usage_rate < 0.2:
+            emoji_band = "low"
+        else:
+            emoji_band = "medium"
+        return {
+            "length": length_band,
+            "emoji": emoji_band,
+            "tones": sorted(t for t, w in preferences.preferred_tones.items() if w > 0.4)
+        }
+
+    def _draft_cache_key(self, data: SMSRequest, scraped_data: dict, preferences: UserPreferences) -> str:
+        normalized_request = {
+            "website_url": data.website_url.strip().lower().rstrip("/"),
+            "products": sorted(" ".join(p.split()).lower() for p in data.products if p.strip()),
+            "start_date": data.start_date,
+            "end_date": data.end_date,
+            "discount_rate": data.discount_rate,
+            "message_count": min(max(data.message_count, 1), 10),
+            "target_audience": " ".join(data.target_audience.split()).lower(),
+            "phone_number": re.sub(r'\D', '', data.phone_number or "")
+        }
+        scraped_hash = make_cache_key(scraped_data["info_text"], sorted(scraped_data["candidates"]))
+        return make_cache_key(normalized_request, scraped_hash, self._preference_bucket(preferences))
+
+    async def generate_campaign_drafts(self, data: SMSRequest, user_id: str = None) -> SMSResponse:
+        print(f"DEBUG: Generating drafts for {data.website_url}")
+        preferences = await self._load_preferences(user_id)
+
+        # Scrape website content
+        scraped_data = await self.scraper.scrape_site_info(data.website_url, data.products)
+        print(f"DEBUG: Scraped candidates: {scraped_data['candidates']}")
+
+        # Serve identical requests from cache unless the user asked to regenerate
+        cache_key = self._draft_cache_key(data, scraped_data, preferences)
+        if data.regenerate:
+            self.draft_cache.record_bypass()
+        else:
+            cached = await self.draft_cache.get_async(cache_key)
+            if cached is not None:
+                print("DEBUG: Draft cache hit")
+                return SMSResponse(**cached)
+
+        best_phone = await self._resolve_phone(data, scraped_data)
+
+        fan_out = DRAFT_FANOUT_ENABLED if data.fan_out is None else data.fan_out
+        if fan_out:
+            drafts = await self._generate_fanned_out(data, scraped_data["info_text"], best_phone, preferences)
+        else:
+            # Prepare Gemini Prompt
+            prompt = self._construct_prompt(data, scraped_data["info_text"], best_phone, preferences)
+            print("DEBUG: Calling Gemini for drafts...")
+            generated_text = await self.client.generate_text(prompt)
+            print(f"DEBUG: Generated text length: {len(generated_text) if generated_text else 0}")
+
+            # Parse Response
+            drafts = self._parse_generated_text(generated_text)
         print(f"DEBUG: Parsed {len(drafts)} drafts")
         
         # Ensure we return at most the requested count
-        return SMSResponse(drafts=drafts[:data.message_count])
+        response = SMSResponse(drafts=drafts[:data.message_count])
+
+        # Don't cache parse failures
+        if drafts and all(d.type != "Hata" for d in drafts):
+            await self.draft_cache.set_async(cache_key, response.model_dump())
+        return response
+
+    async def _generate_fanned_out(self, data: SMSRequest, scraped_info: str, phone_number: str, preferences: UserPreferences) -> list[SMSDraft]:
+        """
+        Generate the selected draft types in small concurrent groups, hedging
+        slow groups with a duplicate request, and merge them in type order.
+        A failed group only loses its own drafts.
+        """
+        selected_types = self._selected_types(data)
+        groups = [
+            selected_types[i:i + DRAFT_FANOUT_GROUP_SIZE]
+            for i in range(0, len(selected_types), DRAFT_FANOUT_GROUP_SIZE)
+        ]
+        print(f"DEBUG: Fanning out {len(selected_types)} drafts into {len(groups)} groups")
+
+        async def generate_group(group: list) -> list[SMSDraft]:
+            prompt = self._construct_prompt(data, scraped_info, phone_number, preferences, draft_types=group)
+            # A hedge duplicates the prompt on purpose, so it must not join the slow call
+            text = await self.hedger.run(lambda: self.client.generate_text(prompt, coalesce=False))
+            return self.parser.parse_blocks(text)
+
+        results = await asyncio.gather(*(generate_group(g) for g in groups), return_exceptions=True)
+        drafts = []
+        errors = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"Draft group failed: {result}")
+                errors.append(result)
+            else:
+                drafts.extend(result)
+
+        if not drafts:
+            if errors:
+                raise errors[0]
+            return self._parse_generated_text("")
+        max(drafts, key=lambda d: d.score).is_recommended = True
+        return drafts
+
+    async def stream_campaign_drafts(self, data: SMSRequest, user_id: str = None):
+        """
+        Stream drafts as Server-Sent Events.
+        Each draft is sent as soon as its ---TYPE--- block is closed by the next
+        delimiter (or by the end of the stream); a final "done" event marks the
+        recommended draft.
+        """
+        print(f"DEBUG: Streaming drafts for {data.website_url}")
+        drafts = []
+        try:
+            prompt = await self._prepare_generation_prompt(data, user_id)
+            buffer = ""
+            async for chunk in self.client.stream_text(prompt):
+                buffer += chunk
+                blocks, buffer = self.parser.split_closed_blocks(buffer)
+                for block in blocks:
+                    for draft in self.parser.parse_blocks(block):
+                        if len(drafts) < data.message_count:
+                            drafts.append(draft)
+                            yield self._format_sse("draft", draft.model_dump())
+
+            # The last block is closed by the end of the stream
+            for draft in self.parser.parse_blocks(buffer):
+                if len(drafts) < data.message_count:
+                    drafts.append(draft)
+                    yield self._format_sse("draft", draft.model_dump())
+        except AIServiceUnavailableError as e:
+            print(f"Streaming error: {e}")
+            yield self._format_sse("error", {"detail": str(e), "retry_after": e.retry_after})
+            return
+        except Exception as e:
+            print(f"Streaming error: {e}")
+            yield self._format_sse("error", {"detail": str(e)})
+            return
+
+        recommended_index = None
+        if drafts:
+            recommended_index = max(range(len(drafts)), key=lambda i: drafts[i].score)
+            drafts[recommended_index].is_recommended = True
+
+        yield self._format_sse("done", {
+            "recommended_index": recommended_index,
+            "drafts": [d.model_dump() for d in drafts]
+        })
+
+    def _format_sse(self, event: str, payload: dict) -> str:
+        return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
 
     async def refine_sms_draft(self, request: RefineRequest) -> SMSDraft:
         print(f"DEBUG: Refining SMS with action: {request.refinement_type}")
         
-        instructions = {
-            RefinementType.SHORTEN: "Bu mesajı daha kısa ve net hale getir (max 160 karakter).",
-            RefinementType.CLARIFY: "Bu mesajı daha anlaşılır ve net bir dille yeniden yaz.",
-            RefinementType.MORE_EXCITING: "Bu mesajı daha heyecan verici, coşkulu ve harekete geçirici bir dille yaz.",
-            RefinementType.MORE_FORMAL: "Bu mesajı daha kurumsal, resmi ve profesyonel bir dille yaz."
-        }
-        
-        specific_instruction = instructions.get(request.refinement_type, "Bu mesajı yeniden yaz.")
+        specific_instruction = REFINE_INSTRUCTIONS.get(request.refinement_type, "Bu mesajı yeniden yaz.")
         
         prompt = f"""
         Profesyonel bir SMS metin yazarı olarak hareket et.
@@ -198,25 +367,96 @@ class SMSService:
             generated_text = await self.client.generate_text(prompt)
             print(f"DEBUG: Refined text: {generated_text}")
             
-            # Simple parsing for single message
-            score = 0
-            content = generated_text.strip()
-            
-            score_match = re.search(r'\[Puan:\s*(\d+)\]', content)
-            if score_match:
-                score = int(score_match.group(1))
-                content = re.sub(r'\[Puan:\s*(\d+)\]', '', content).strip()
-            
-            return SMSDraft(
-                type=request.refinement_type.value, 
-                content=content,
-                score=score
-            )
-            
+            return self.parser.parse_single(generated_text, request.refinement_type.value)
         except Exception as e:
             print(f"Refinement error: {e}")
             raise e
 
+    async def refine_sms_drafts(self, requests: list[RefineRequest]) -> list[SMSDraft]:
+        """
+        Refine several (content, action) pairs, packing them into as few
+        Gemini calls as possible. Large batches are split into chunks that
+        run concurrently (bounded); results keep the request order.
+        """
+        if len(requests) == 1:
+            return [await self.refine_sms_draft(requests[0])]
+
+        chunks = self._chunk_refine_requests(requests)
+        semaphore = asyncio.Semaphore(REFINE_BATCH_MAX_CONCURRENCY)
+
+        async def run(chunk: list[RefineRequest]) -> list[SMSDraft]:
+            async with semaphore:
+                return await self._refine_chunk(chunk)
+
+        print(f"DEBUG: Refining {len(requests)} drafts in {len(chunks)} call(s)")
+        results = await asyncio.gather(*(run(chunk) for chunk in chunks))
+        return [draft for chunk_result in results for draft in chunk_result]
+
+    def _chunk_refine_requests(self, requests: list[RefineRequest]) -> list[list[RefineRequest]]:
+        chunks = []
+        current = []
+        current_chars = 0
+        for request in requests:
+            size = len(request.content)
+            if current and (len(current) >= REFINE_BATCH_MAX_ITEMS or current_chars + size > REFINE_BATCH_MAX_CHARS):
+                chunks.append(current)
+                current = []
+                current_chars = 0
+            current.append(request)
+            current_chars += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _refine_chunk(self, chunk: list[RefineRequest]) -> list[SMSDraft]:
+        if len(chunk) == 1:
+            return [await self.refine_sms_draft(chunk[0])]
+
+        items = "\n".join(
+            f"""<message id="{i}">
+        <instruction>{REFINE_INSTRUCTIONS.get(request.refinement_type, "Bu mesajı yeniden yaz.")}</instruction>
+        <original_message>
+        {request.content}
+        </original_message>
+        </message>"""
+            for i, request in enumerate(chunk, start=1)
+        )
+        prompt = f"""
+        Profesyonel bir SMS metin yazarı olarak hareket et.
+        Aşağıdaki {len(chunk)} SMS taslağının her birini kendi direktifine göre AYRI AYRI yeniden yaz.
+        Anlamı bozmadan, markanın ses tonunu koruyarak revize et. Mesajları birbirine karıştırma.
+        
+        <messages>
+        {items}
+        </messages>
+        
+        Çıktıyı TAM OLARAK aşağıdaki formatta ver, her mesaj için kendi numarasıyla (markdown yok):
+        ---1---
+        [Puan: 85]
+        [Revize Edilmiş İçerik]
+        ---2---
+        [Puan: 80]
+        [Revize Edilmiş İçerik]
+        """
+
+        try:
+            generated_text = await self.client.generate_text(prompt)
+            print(f"DEBUG: Batch refined text: {generated_text}")
+            blocks = self.parser.split_numbered(generated_text)
+        except Exception as e:
+            print(f"Batch refinement error: {e}")
+            blocks = {}
+
+        drafts = []
+        for i, request in enumerate(chunk, start=1):
+            body = blocks.get(i)
+            draft = self.parser.parse_single(body, request.refinement_type.value) if body else None
+            if draft is None or not draft.content:
+                # Missing or empty answer for this item: refine it on its own
+                draft = await self.refine_sms_draft(request)
+            drafts.append(draft)
+        return drafts
+
     def _apply_preference_bias(self, preferences: UserPreferences) -> str:
         """Inject user preferences into prompt as quality hints."""
         if not preferences or preferences.total_saved_messages < 3:
@@ -247,142 +487,15 @@ class SMSService:
         bias_text += "</personalization_hints>\n"
         return bias_text
 
-    def _construct_analysis_prompt(self, discount_rate: int, duration_days: int, products: list, audience: str) -> str:
-        return f"""
-        Profesyonel bir pazarlama stratejisti olarak hareket et.
-        Aşağıdaki kampanya detaylarını analiz et ve bu kampanya için en etkili 3 ses tonunu belirle.
-        
-        <campaign_details>
-        Ürünler: {', '.join(products) if products else 'Genel Ürünler'}
-        Hedef Kitle: {audience or 'Genel'}
-        İndirim Oranı: %{discount_rate}
-        Süre: {duration_days} gün
-        </campaign_details>
-        
-        <available_tones>
-        {', '.join(self.draft_types)}
-        </available_tones>
-        
-        Analiz Kriterleri:
-        1. Ürün-Ton Uyumu: Teknoloji ise modern, Giyim ise estetik, Gıda ise samimi vb.
-        2. Kitle-Ton Uyumu: Gençler için dinamik/vurucu, profesyoneller için kurumsal/klasik.
-        3. Kampanya Aciliyeti: Kısa süre ve yüksek indirim varsa 'Acil', uzun dönemse 'Hikaye Odaklı'.
-        
-        Sadece en uygun 3 tonu, virgülle ayırarak yaz. Açıklama yapma.
-        Örnek Çıktı: Modern, Vurucu, Klasik
-        """
-
     async def get_tone_recommendations(self, discount_rate: int, duration_days: int, products: list = None, audience: str = None) -> list[str]:
         """
-        Analyze campaign context using AI to recommend 3 suitable tones.
+        Recommend 3 suitable tones for the campaign context.
         """
-        # Default fallback
-        fallback = ["Klasik", "Modern", "Minimalist"]
-        
         try:
-            print(f"DEBUG: Analyzing tone for discount={discount_rate}, duration={duration_days}, products={products}")
-            prompt = self._construct_analysis_prompt(discount_rate, duration_days, products or [], audience)
-            
-            # Call Gemini
-            analysis = await self.client.generate_text(prompt)
-            print(f"DEBUG: AI Tone Analysis Result: {analysis}")
-            
-            if not analysis:
-                return fallback
-                
-            # Parse result (clean up and split)
-            suggested_tones = [t.strip() for t in analysis.split(',') if t.strip()]
-            
-            # Validate against allowed types
-            valid_suggestions = [t for t in suggested_tones if t in self.draft_types]
-            
-            # If we got at least 1 valid suggestion, fill the rest with fallback if needed
-            if valid_suggestions:
-                # Add fallbacks if less than 3, preserving uniqueness
-                for backup in fallback:
-                    if len(valid_suggestions) < 3 and backup not in valid_suggestions:
-                        valid_suggestions.append(backup)
-                return valid_suggestions[:3]
-            
-            return fallback
-
+            return await self.tone_recommender.recommend(discount_rate, duration_days, products or [], audience)
         except Exception as e:
             print(f"Tone analysis failed: {e}")
-            return fallback
+            return list(FALLBACK_TONES)
 
     def _parse_generated_text(self, text: str) -> list[SMSDraft]:
-        drafts = []
-        try:
-            parts = text.split("---")
-            type_map = {t.upper(): t for t in self.draft_types}
-            
-            current_type = None
-            
-            for part in parts:
-                clean_part = part.strip()
-                if not clean_part:
-                    continue
-                
-                # Check line by line
-                lines = clean_part.split('\n')
-                if not lines:
-                    continue
-                    
-                # First line is usually the TYPE if split by ---
-                # But since we split by ---, the TYPE is actually implicit or part of the previous block
-                # Let's use flexible parsing:
-                # Format: ---TIP--- \n [Puan: 85] \n Content
-                
-                current_score = 0
-                current_content = ""
-                
-                # The split("---") removes the delimiters. 
-                # Gemini usually outputs: ---TIP1--- Content ---TIP2--- Content
-                # So part[0] is usually "TIP1\n[Puan: 85]\nContent"
-                
-                first_line = lines[0].strip()
-                
-                # Extract Type
-                if first_line in type_map:
-                    current_type = type_map[first_line]
-                
-                # Extract Score
-                # Look for [Puan: \d+]
-                score_match = re.search(r'\[Puan:\s*(\d+)\]', clean_part)
-                if score_match:
-                    current_score = int(score_match.group(1))
-                    # Remove the score line from content
-                    clean_part = re.sub(r'\[Puan:\s*(\d+)\]', '', clean_part)
-                
-                # Validate Type if strictly mapped
-                if not current_type:
-                    # Fallback: try to find any known type in the first line
-                    for t_upper, t_display in type_map.items():
-                        if t_upper in first_line:
-                            current_type = t_display
-                            break
-                            
-                # Cleanup content
-                # Remove the type line if it's there
-                if current_type and current_type.upper() in lines[0]:
-                    clean_part = "\n".join(lines[1:])
-                
-                current_content = clean_part.strip()
-                
-                if current_type and current_content:
-                    drafts.append(SMSDraft(
-                        type=current_type, 
-                        content=current_content, 
-                        score=current_score
-                    ))
-            
-            # Identify the recommended draft (highest score)
-            if drafts:
-                best_draft = max(drafts, key=lambda d: d.score)
-                best_draft.is_recommended = True
-                
-        except Exception as e:
-            print(f"Parsing error: {e}")
-            drafts.append(SMSDraft(type="Hata", content="AI yanıtı ayrıştırılamadı.", score=0))
-
-        return drafts
+        return self.parser.parse(text)
@@ -0,0 +1,142 @@
+import threading
+import time as clock
+from collections import deque
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, List, Optional
+from firebase_admin import firestore
+from app.config.settings import STATUS_CHECK_MAX_INTERVAL_HOURS, SCHEDULER_RUN_RETENTION_DAYS
+from app.core.lease import FirestoreLease
+
+
+class StatusScheduler:
+    """
+    Runs the campaign status transition job at the next known boundary
+    instead of polling.
+
+    The job returns the next date on which a campaign becomes due (start or
+    end boundary) and is rescheduled for that midnight. Campaign writes in
+    this process nudge the schedule forward when they create an earlier
+    boundary; writes from other processes are picked up by a fallback run
+    at most STATUS_CHECK_MAX_INTERVAL_HOURS later.
+
+    With a lease, only the process holding it runs the job; a process that
+    takes the lease over runs it immediately. Every run is recorded in
+    scheduler_runs with its holder and duration, so the history survives a
+    failover; each record carries an expires_at SCHEDULER_RUN_RETENTION_DAYS
+    ahead for a Firestore TTL policy on that field to purge.
+    """
+    JOB_ID = "campaign_status_transitions"
+    # Runs reported by stats()
+    HISTORY_SIZE = 20
+
+    def __init__(self):
+        self._scheduler = None
+        self._job: Optional[Callable[[], Optional[date]]] = None
+        self.lease: Optional[FirestoreLease] = None
+        self._runs = None
+        self._next_run: Optional[datetime] = None
+        self._lock = threading.Lock()
+        # This process's runs, for stats() when Firestore can't be read
+        self.recent_runs: deque = deque(maxlen=self.HISTORY_SIZE)
+
+    def start(self, scheduler, job: Callable[[], Optional[date]], lease: FirestoreLease = None) -> None:
+        """
+        Attach to a started APScheduler scheduler and run the job now (or,
+        with a lease, as soon as this process holds it).
+        """
+        self._scheduler = scheduler
+        self._job = job
+        self.lease = lease
+        self._runs = firestore.client().collection("scheduler_runs")
+        if lease is not None:
+            lease.start(scheduler, on_elected=lambda: self._schedule(datetime.now()))
+        else:
+            self._schedule(datetime.now())
+
+    def nudge(self, due_on: Optional[date]) -> None:
+        """
+        Make sure the job runs by the start of due_on.
+        """
+        if self._scheduler is None or due_on is None:
+            return
+        if self.lease is not None and not self.lease.is_leader():
+            # The leader's fallback run picks it up
+            return
+        self._schedule(self._boundary(due_on))
+
+    def _run(self) -> None:
+        with self._lock:
+            self._next_run = None
+        if self.lease is not None and not self.lease.is_leader():
+            print("Campaign status check skipped: this process does not hold the scheduler lease")
+            return
+
+        started_at = datetime.now(timezone.utc)
+        started = clock.perf_counter()
+        next_due = None
+        error = None
+        try:
+            next_due = self._job()
+        except Exception as e:
+            error = str(e)
+            print(f"Campaign status job failed: {e}")
+        self._record(started_at, clock.perf_counter() - started, next_due, error)
+
+        fallback = datetime.now() + timedelta(hours=STATUS_CHECK_MAX_INTERVAL_HOURS)
+        self._schedule(min(self._boundary(next_due), fallback) if next_due else fallback)
+
+    def _record(self, started_at: datetime, duration: float, next_due: Optional[date], error: Optional[str]) -> None:
+        run = {
+            "job": self.JOB_ID,
+            "holder": self.lease.holder_id if self.lease else None,
+            "started_at": started_at,
+            "duration_ms": round(duration * 1000),
+            "status": "failed" if error else "ok",
+            "error": error,
+            "next_due": next_due.isoformat() if next_due else None
+        }
+        self.recent_runs.append(run)
+        try:
+            self._runs.add({**run, "expires_at": started_at + timedelta(days=SCHEDULER_RUN_RETENTION_DAYS)})
+        except Exception as e:
+            print(f"Error recording scheduler run: {e}")
+
+    def _schedule(self, run_at: datetime) -> None:
+        with self._lock:
+            if self._next_run is not None and self._next_run <= run_at:
+                return
+            self._next_run = run_at
+            self._scheduler.add_job(self._run, "date", run_date=run_at, id=self.JOB_ID,
+                                    replace_existing=True, misfire_grace_time=None)
+        print(f"Campaign status check scheduled for {run_at}")
+
+    @staticmethod
+    def _boundary(day: date) -> datetime:
+        # Transitions are day-granular: run just after that day starts
+        return max(datetime.combine(day, time(0, 0, 5)), datetime.now())
+
+    def history(self) -> List[dict]:
+        """
+        The latest runs by any process, newest first (blocking Firestore read).
+        """
+        if self._runs is None:
+            return list(reversed(self.recent_runs))
+        try:
+            docs = (self._runs.where("job", "==", self.JOB_ID)
+                    .order_by("started_at", direction=firestore.Query.DESCENDING)
+                    .limit(self.HISTORY_SIZE)
+                    .stream())
+            return [doc.to_dict() for doc in docs]
+        except Exception as e:
+            print(f"Error reading scheduler runs: {e}")
+            return list(reversed(self.recent_runs))
+
+    def stats(self) -> dict:
+        return {
+            "next_run": self._next_run.isoformat() if self._next_run else None,
+            "lease": self.lease.stats() if self.lease else None,
+            "recent_runs": self.history()
+        }
+
+
+status_scheduler = StatusScheduler()
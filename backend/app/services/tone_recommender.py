@@ -0,0 +1,256 @@
+import asyncio
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.clients.gemini_client import GeminiClient
+from app.core.cache import InMemoryCache, ResultCache
+from app.config.settings import TONE_CACHE_TTL_SECONDS, TONE_CACHE_MAX_ENTRIES
+from app.utils.text import fold_text
+
+FALLBACK_TONES = ["Klasik", "Modern", "Minimalist"]
+UNKNOWN = "diger"
+
+# Keyword stems (ASCII-folded) for product categories and audiences
+PRODUCT_CATEGORIES = {
+    "teknoloji": ("telefon", "bilgisayar", "laptop", "tablet", "elektronik", "teknoloji", "kulaklik",
+                  "televizyon", "kamera", "oyun", "yazilim", "akilli", "saat"),
+    "giyim": ("giyim", "elbise", "ayakkabi", "canta", "mont", "ceket", "pantolon", "gomlek", "tisort",
+              "etek", "moda", "kazak", "aksesuar"),
+    "gida": ("gida", "yemek", "kahve", "cay", "pizza", "burger", "tatli", "pasta", "restoran", "menu",
+             "icecek", "market", "meyve", "kahvalti"),
+    "kozmetik": ("kozmetik", "parfum", "makyaj", "cilt", "bakim", "sac", "ruj", "krem", "guzellik"),
+    "ev": ("mobilya", "dekorasyon", "ev", "mutfak", "beyaz esya", "hali", "yatak", "koltuk"),
+    "hediye": ("hediye", "gift"),
+    "hizmet": ("kurs", "egitim", "uyelik", "abonelik", "hizmet", "seyahat", "otel", "tatil", "spor salonu")
+}
+AUDIENCES = {
+    "genc": ("genc", "ogrenci", "universite", "z kusagi", "lise"),
+    "profesyonel": ("profesyonel", "kurumsal", "is insani", "calisan", "yonetici", "b2b", "sirket"),
+    "aile": ("aile", "anne", "baba", "cocuk", "ebeveyn"),
+    "premium": ("premium", "luks", "vip", "ust gelir", "seckin"),
+    "kadin": ("kadin", "bayan"),
+    "erkek": ("erkek", "bay")
+}
+
+# Tone weights per signal, mirroring the analysis prompt's three criteria
+CATEGORY_TONES = {
+    "teknoloji": {"Modern": 3, "Vurucu": 1, "Minimalist": 1},
+    "giyim": {"Lüks": 2, "Minimalist": 2, "Modern": 1},
+    "gida": {"Samimi": 3, "Hikaye Odaklı": 1},
+    "kozmetik": {"Lüks": 3, "Samimi": 1},
+    "ev": {"Samimi": 2, "Klasik": 1, "Hikaye Odaklı": 1},
+    "hediye": {"Samimi": 2, "Hikaye Odaklı": 1},
+    "hizmet": {"Klasik": 2, "Soru & Cevap": 1}
+}
+AUDIENCE_TONES = {
+    "genc": {"Genç": 3, "Vurucu": 2},
+    "profesyonel": {"Klasik": 3, "Minimalist": 1},
+    "aile": {"Samimi": 2, "Hikaye Odaklı": 1},
+    "premium": {"Lüks": 3, "Minimalist": 1},
+    "kadin": {"Samimi": 1, "Modern": 1},
+    "erkek": {"Vurucu": 1, "Minimalist": 1}
+}
+URGENCY_TONES = {
+    "short_high": {"Acil": 4, "Vurucu": 2},
+    "short": {"Acil": 3},
+    "high": {"Vurucu": 2, "Acil": 1},
+    "long": {"Hikaye Odaklı": 3, "Soru & Cevap": 1}
+}
+
+
+def _fold_phrase(text: str) -> str:
+    # Folded with runs of whitespace collapsed, so it can key the memo table
+    return " ".join(fold_text(text).split())
+
+
+def discount_band(discount_rate: int) -> str:
+    if discount_rate <= 0:
+        return "none"
+    if discount_rate < 20:
+        return "low"
+    if discount_rate < 40:
+        return "mid"
+    return "high"
+
+
+def duration_band(duration_days: int) -> str:
+    if duration_days <= 0:
+        return "none"
+    if duration_days <= 3:
+        return "short"
+    if duration_days <= 14:
+        return "medium"
+    return "long"
+
+
+def _compile(table: Dict[str, tuple]) -> List[Tuple[str, re.Pattern]]:
+    # Stems must start a word: "ev" should match "ev tekstili", not "devam"
+    return [(label, re.compile(r'\b(?:' + '|'.join(map(re.escape, stems)) + ')')) for label, stems in table.items()]
+
+
+PRODUCT_PATTERNS = _compile(PRODUCT_CATEGORIES)
+AUDIENCE_PATTERNS = _compile(AUDIENCES)
+
+
+def _match(text: str, patterns: List[Tuple[str, re.Pattern]]) -> Optional[str]:
+    for label, pattern in patterns:
+        if pattern.search(text):
+            return label
+    return None
+
+
+class ToneRecommender:
+    """
+    Tone recommendations from campaign inputs.
+    Inputs are bucketed (discount band, duration band, product categories,
+    audience) and answered from a memo table; unseen buckets are scored by
+    rules mirroring the analysis prompt. Gemini is only asked about products
+    or audiences the rules don't recognize, in the background, so the
+    endpoint never waits on it.
+    """
+
+    def __init__(self, draft_types: List[str], client: GeminiClient = None):
+        self.draft_types = draft_types
+        self.client = client or GeminiClient()
+        self.memo = ResultCache(InMemoryCache(TONE_CACHE_MAX_ENTRIES), ttl=TONE_CACHE_TTL_SECONDS)
+        self.rule_answers = 0
+        self.ai_lookups = 0
+        self._pending: Set[str] = set()
+        self._background_tasks: Set[asyncio.Task] = set()
+
+    def bucket(self, discount_rate: int, duration_days: int, products: list, audience: str) -> Tuple[tuple, bool]:
+        """
+        Return the memo bucket for the inputs and whether the rules recognize
+        every product and the audience.
+        """
+        categories = set()
+        unknown_products = set()
+        for product in products or []:
+            folded = _fold_phrase(product)
+            if not folded:
+                continue
+            category = _match(folded, PRODUCT_PATTERNS)
+            if category:
+                categories.add(category)
+            else:
+                # Unrecognized products stay distinct so AI answers don't leak between them
+                unknown_products.add(folded)
+
+        folded_audience = _fold_phrase(audience or "")
+        audience_key = "genel"
+        if folded_audience and folded_audience != "genel":
+            audience_key = _match(folded_audience, AUDIENCE_PATTERNS) or f"{UNKNOWN}:{folded_audience}"
+
+        known = not unknown_products and not audience_key.startswith(UNKNOWN)
+        key = (
+            discount_band(discount_rate),
+            duration_band(duration_days),
+            tuple(sorted(categories)),
+            tuple(sorted(unknown_products)),
+            audience_key
+        )
+        return key, known
+
+    def rule_based(self, key: tuple) -> List[str]:
+        discount, duration, categories, _, audience = key
+        scores: Dict[str, float] = {}
+
+        def add(weights: Dict[str, int]) -> None:
+            for tone, weight in weights.items():
+                scores[tone] = scores.get(tone, 0) + weight
+
+        for category in categories:
+            add(CATEGORY_TONES[category])
+        if audience in AUDIENCE_TONES:
+            add(AUDIENCE_TONES[audience])
+        if duration == "short" and discount == "high":
+            add(URGENCY_TONES["short_high"])
+        elif duration == "short":
+            add(URGENCY_TONES["short"])
+        elif discount == "high":
+            add(URGENCY_TONES["high"])
+        elif duration == "long":
+            add(URGENCY_TONES["long"])
+
+        # Ties keep the draft_types order, so results are deterministic
+        ranked = sorted(
+            (tone for tone in scores if tone in self.draft_types and scores[tone] > 0),
+            key=lambda tone: (-scores[tone], self.draft_types.index(tone))
+        )
+        return self._fill(ranked)
+
+    def _fill(self, tones: List[str]) -> List[str]:
+        tones = list(tones[:3])
+        for backup in FALLBACK_TONES:
+            if len(tones) < 3 and backup not in tones:
+                tones.append(backup)
+        return tones
+
+    async def recommend(self, discount_rate: int, duration_days: int, products: list = None, audience: str = None) -> List[str]:
+        key, known = self.bucket(discount_rate, duration_days, products or [], audience)
+        memo_key = repr(key)
+        cached = self.memo.get(memo_key)
+        if cached is not None:
+            return cached["tones"]
+
+        tones = self.rule_based(key)
+        self.rule_answers += 1
+        if known:
+            self.memo.set(memo_key, {"tones": tones, "source": "rules"})
+        elif memo_key not in self._pending:
+            # Answer with the rules now; the AI answer serves the next request for this bucket
+            self._pending.add(memo_key)
+            task = asyncio.create_task(
+                self._ask_ai(memo_key, discount_rate, duration_days, products or [], audience)
+            )
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return tones
+
+    async def _ask_ai(self, memo_key: str, discount_rate: int, duration_days: int, products: list, audience: str) -> None:
+        try:
+            self.ai_lookups += 1
+            prompt = self._construct_analysis_prompt(discount_rate, duration_days, products, audience)
+            analysis = await self.client.generate_text(prompt)
+            print(f"DEBUG: AI Tone Analysis Result: {analysis}")
+            suggested = [t.strip() for t in (analysis or "").split(',') if t.strip()]
+            valid = [t for t in suggested if t in self.draft_types]
+            if valid:
+                self.memo.set(memo_key, {"tones": self._fill(valid), "source": "ai"})
+        except Exception as e:
+            print(f"Tone analysis failed: {e}")
+        finally:
+            self._pending.discard(memo_key)
+
+    def _construct_analysis_prompt(self, discount_rate: int, duration_days: int, products: list, audience: str) -> str:
+        return f"""
+        Profesyonel bir pazarlama stratejisti olarak hareket et.
+        Aşağıdaki kampanya detaylarını analiz et ve bu kampanya için en etkili 3 ses tonunu belirle.
+
+        <campaign_details>
+        Ürünler: {', '.join(products) if products else 'Genel Ürünler'}
+        Hedef Kitle: {audience or 'Genel'}
+        İndirim Oranı: %{discount_rate}
+        Süre: {duration_days} gün
+        </campaign_details>
+
+        <available_tones>
+        {', '.join(self.draft_types)}
+        </available_tones>
+
+        Analiz Kriterleri:
+        1. Ürün-Ton Uyumu: Teknoloji ise modern, Giyim ise estetik, Gıda ise samimi vb.
+        2. Kitle-Ton Uyumu: Gençler için dinamik/vurucu, profesyoneller için kurumsal/klasik.
+        3. Kampanya Aciliyeti: Kısa süre ve yüksek indirim varsa 'Acil', uzun dönemse 'Hikaye Odaklı'.
+
+        Sadece en uygun 3 tonu, virgülle ayırarak yaz. Açıklama yapma.
+        Örnek Çıktı: Modern, Vurucu, Klasik
+        """
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **self.memo.stats(),
+            "memo_entries": len(self.memo.backend),
+            "rule_answers": self.rule_answers,
+            "ai_lookups": self.ai_lookups
+        }
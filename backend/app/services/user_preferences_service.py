@@ -1,39 +1,109 @@
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from firebase_admin import firestore
+from google.api_core.exceptions import Conflict, FailedPrecondition, NotFound
 from app.models.user_preferences_models import UserPreferences
 from app.models.campaign_models import SavedMessage
+from app.core.executor import firestore_io
+from app.core.cache import InMemoryCache, ResultCache
+from app.config.settings import PREFERENCES_CACHE_TTL_SECONDS, PREFERENCES_CACHE_MAX_ENTRIES
+
+# Read-modify-write attempts before giving up when other writers keep winning
+WRITE_ATTEMPTS = 3
 
 class UserPreferencesService:
+    """
+    Per-user preference statistics, learned from saved and deleted messages.
+
+    Reads go through a per-process LRU cache shared by every instance, holding
+    each user's preferences and the document's update time. Writes update the
+    cache in place, and are conditional on that update time, so a write based
+    on a copy made stale by another worker fails, re-reads from Firestore and
+    retries instead of overwriting the newer statistics. Reads may be up to
+    PREFERENCES_CACHE_TTL_SECONDS behind writes made by other workers.
+    """
+    _cache = ResultCache(InMemoryCache(max_entries=PREFERENCES_CACHE_MAX_ENTRIES), ttl=PREFERENCES_CACHE_TTL_SECONDS)
+
     def __init__(self):
         self.db = firestore.client()
         self.collection = self.db.collection("user_preferences")
 
+    @firestore_io
     def get_preferences(self, user_id: str) -> UserPreferences:
         """
         Get user preferences from Firestore. If not exists, return default.
         """
+        return self._read_preferences(user_id)
+
+    def _read_preferences(self, user_id: str) -> UserPreferences:
+        return self._load(user_id)[0]
+
+    def _load(self, user_id: str, use_cache: bool = True) -> Tuple[UserPreferences, Optional[datetime]]:
+        """
+        The user's preferences and their document's update time
+        (None if the document doesn't exist yet).
+        """
+        cached = self._cache.get(user_id) if use_cache else None
+        if cached is not None:
+            # A fresh model per call, so callers can't modify the cached copy
+            return UserPreferences(**cached["prefs"]), cached["update_time"]
+
         doc_ref = self.collection.document(user_id)
         doc = doc_ref.get()
 
         if doc.exists:
             data = doc.to_dict()
             # Convert timestamp to datetime if needed (though Pydantic handles it usually)
-            return UserPreferences(**data)
-        
-        # Return default preferences
-        return UserPreferences(
-            user_id=user_id,
-            updated_at=datetime.now()
-        )
+            prefs, update_time = UserPreferences(**data), doc.update_time
+        else:
+            # Return default preferences
+            prefs, update_time = UserPreferences(
+                user_id=user_id,
+                updated_at=datetime.now()
+            ), None
+        self._cache.set(user_id, {"prefs": prefs.model_dump(), "update_time": update_time})
+        return prefs, update_time
+
+    def _modify(self, user_id: str, apply: Callable[[UserPreferences], bool]) -> Optional[UserPreferences]:
+        """
+        Apply a change to the user's preferences and save them, guarded by the
+        update time they were read at. Returns None if apply made no change.
+        """
+        for attempt in range(WRITE_ATTEMPTS):
+            # Retries re-read from Firestore: the cached copy lost the race
+            prefs, update_time = self._load(user_id, use_cache=attempt == 0)
+            if not apply(prefs):
+                return None
 
+            doc_ref = self.collection.document(user_id)
+            try:
+                if update_time is None:
+                    result = doc_ref.create(prefs.model_dump())
+                else:
+                    result = doc_ref.update(
+                        prefs.model_dump(), option=self.db.write_option(last_update_time=update_time)
+                    )
+            except (Conflict, FailedPrecondition, NotFound):
+                self._cache.invalidate(user_id)
+                continue
+            self._cache.set(user_id, {"prefs": prefs.model_dump(), "update_time": result.update_time})
+            return prefs
+        raise RuntimeError(f"Preferences for user {user_id} kept changing; gave up after {WRITE_ATTEMPTS} attempts")
+
+    @classmethod
+    def cache_stats(cls) -> Dict[str, Any]:
+        return {**cls._cache.stats(), "entries": len(cls._cache.backend)}
+
+    @firestore_io
     def update_from_saved_message(self, user_id: str, message: SavedMessage, tone: str) -> None:
         """
         Update user preferences based on a newly saved message.
         Analyzes message traits (length, emojis) and updates rolling averages.
         """
-        prefs = self.get_preferences(user_id)
-        
+        prefs = self._modify(user_id, lambda prefs: self._learn(prefs, message, tone))
+        print(f"DEBUG: Updated preferences for user {user_id}: {prefs.model_dump()}")
+
+    def _learn(self, prefs: UserPreferences, message: SavedMessage, tone: str) -> bool:
         # 1. Analyze Message
         content_length = len(message.content)
         has_emoji = self._contains_emoji(message.content)
@@ -69,48 +139,54 @@ class UserPreferencesService:
         prefs.preferred_tones = current_tones
         prefs.total_saved_messages = new_n
         prefs.updated_at = datetime.now()
-        
-        # 3. Save to Firestore
-        self.collection.document(user_id).set(prefs.model_dump())
-        print(f"DEBUG: Updated preferences for user {user_id}: {prefs.model_dump()}")
+        return True
 
-    def unlearn_from_deleted_message(self, user_id: str, message: SavedMessage) -> None:
+    @firestore_io
+    def unlearn_from_deleted_messages(self, user_id: str, messages: List[SavedMessage]) -> None:
         """
-        Reverse the preference update when a message is deleted. 
-        Helps correct accidental saves.
+        Reverse the preference updates of deleted messages in one write.
+        Helps correct accidental saves; cascading deletes pass all the
+        messages they removed at once.
         """
-        prefs = self.get_preferences(user_id)
-        if prefs.total_saved_messages <= 0:
-            return
+        prefs = self._modify(user_id, lambda prefs: self._unlearn(prefs, messages))
+        if prefs:
+            print(f"DEBUG: 'Unlearned' {len(messages)} deleted messages for user {user_id}: {prefs.model_dump()}")
 
-        # 1. Analyze Message
-        content_length = len(message.content)
-        has_emoji = self._contains_emoji(message.content)
-        tone = message.type
+    def _unlearn(self, prefs: UserPreferences, messages: List[SavedMessage]) -> bool:
+        if prefs.total_saved_messages <= 0 or not messages:
+            return False
+
+        # 1. Analyze Messages
+        removed = min(len(messages), prefs.total_saved_messages)
+        total_length = sum(len(message.content) for message in messages)
+        emoji_count = sum(1 for message in messages if self._contains_emoji(message.content))
+        tone_counts: Dict[str, int] = {}
+        for message in messages:
+            if message.type:
+                tone_counts[message.type] = tone_counts.get(message.type, 0) + 1
         
         # 2. Reverse Stats (De-incremental Average)
         n = prefs.total_saved_messages
-        new_n = n - 1
+        new_n = n - removed
         
         if new_n > 0:
             # Reverse Average Length
-            new_avg_length = int(((prefs.avg_message_length * n) - content_length) / new_n)
+            new_avg_length = int(((prefs.avg_message_length * n) - total_length) / new_n)
             # Reverse Emoji Usage Rate
-            emoji_score = 1.0 if has_emoji else 0.0
-            new_emoji_rate = ((prefs.emoji_usage_rate * n) - emoji_score) / new_n
+            new_emoji_rate = ((prefs.emoji_usage_rate * n) - emoji_count) / new_n
         else:
             new_avg_length = 0
             new_emoji_rate = 0.0
 
-        # Reverse Tone Preference
+        # Reverse Tone Preference (0.05 per deleted message of that tone)
         current_tones = prefs.preferred_tones.copy()
-        if tone in current_tones:
-            current_weight = current_tones.get(tone, 0.0)
-            new_weight = max(current_weight - 0.05, 0.0)
-            if new_weight == 0.0:
-                del current_tones[tone]
-            else:
-                current_tones[tone] = new_weight
+        for tone, count in tone_counts.items():
+            if tone in current_tones:
+                new_weight = max(current_tones[tone] - 0.05 * count, 0.0)
+                if new_weight == 0.0:
+                    del current_tones[tone]
+                else:
+                    current_tones[tone] = new_weight
         
         # Update Model
         prefs.avg_message_length = max(0, new_avg_length)
@@ -118,10 +194,7 @@ class UserPreferencesService:
         prefs.preferred_tones = current_tones
         prefs.total_saved_messages = new_n
         prefs.updated_at = datetime.now()
-        
-        # 3. Save to Firestore
-        self.collection.document(user_id).set(prefs.model_dump())
-        print(f"DEBUG: 'Unlearned' preferences for user {user_id} (deleted {tone}): {prefs.model_dump()}")
+        return True
 
     def _contains_emoji(self, text: str) -> bool:
         # Simple check for common emoji ranges or use a library if available.
@@ -1,86 +1,72 @@
-import httpx
-import re
-from bs4 import BeautifulSoup
-import idna
-from urllib.parse import urlparse, urlunparse
-from typing import Dict, List, Optional
+from typing import List
 from app.clients.gemini_client import GeminiClient
+from app.services.page_analyzer import PageAnalyzer
+from app.services.phone_ranker import PhoneRanker, evidence_from_candidates
+from app.services.context_compactor import ContextCompactor, CONTACT_KEYWORDS
+from app.config.settings import (
+    PHONE_LOCAL_CONFIDENCE_THRESHOLD, SCRAPE_CONTEXT_TOKEN_BUDGET, PHONE_CONTEXT_TOKEN_BUDGET
+)
 
 class WebsiteScraper:
     def __init__(self):
         self.client = GeminiClient()
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+        self.page_analyzer = PageAnalyzer()
+        self.phone_ranker = PhoneRanker()
+        self.compactor = ContextCompactor()
 
-    def _normalize_url(self, url: str) -> str:
-        """
-        Convert IDN (Internationalized Domain Names) to Punycode.
-        """
-        try:
-            parsed = urlparse(url)
-            hostname = parsed.hostname
-            if hostname:
-                puny_host = idna.encode(hostname).decode('ascii')
-                return urlunparse(parsed._replace(netloc=puny_host if not parsed.port else f"{puny_host}:{parsed.port}"))
-            return url
-        except Exception as e:
-            print(f"URL normalization error: {e}")
-            return url
-
-    async def scrape_site_info(self, url: str) -> dict:
+    async def scrape_site_info(self, url: str, products: List[str] = None) -> dict:
         """
         Fetch website content and extract phone candidates and info text.
+        Built on the shared (cached) page analysis, so the page is not refetched
+        when logo extraction already analyzed it. "fetched" is False when the
+        page could not be fetched and the placeholder text is returned.
+
+        The page text is compacted into two token-budgeted contexts: info_text
+        (ranked by relevance to the campaign products) for draft prompts and
+        phone_context (ranked by contact wording) for phone identification.
         """
-        normalized_url = self._normalize_url(url)
-        scraped_data = {
-            "info_text": "Web sitesi içeriği alınamadı.",
-            "candidates": []
+        analysis = await self.page_analyzer.analyze(url)
+        if analysis is None:
+            return {
+                "fetched": False,
+                "info_text": "Web sitesi içeriği alınamadı.",
+                "phone_context": "",
+                "candidates": [],
+                "phone_evidence": [],
+                "context_stats": {}
+            }
+        summary, context_stats = self.compactor.compact(
+            analysis["text_blocks"], products or [], SCRAPE_CONTEXT_TOKEN_BUDGET
+        )
+        phone_context, phone_stats = self.compactor.compact(
+            analysis["text_blocks"], CONTACT_KEYWORDS, PHONE_CONTEXT_TOKEN_BUDGET
+        )
+        print(f"DEBUG: Site context for {url}: {context_stats['raw_tokens']} -> {context_stats['context_tokens']} tokens "
+              f"(phone context {phone_stats['context_tokens']} tokens)")
+        return {
+            "fetched": True,
+            "info_text": f"Başlık: {analysis['title']}\nDescription: {analysis['meta_description']}\nİçerik Özeti: {summary}",
+            "phone_context": phone_context,
+            "candidates": list(set(analysis["tel_links"] + analysis["phone_candidates"])),
+            "phone_evidence": analysis["phone_evidence"],
+            "context_stats": {**context_stats, "phone_context_tokens": phone_stats["context_tokens"]}
         }
-        try:
-            async with httpx.AsyncClient(timeout=10.0, follow_redirects=True, headers=self.headers) as client:
-                response = await client.get(normalized_url)
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # 1. Collect tel: links
-                    candidates = []
-                    for link in soup.find_all("a", href=True):
-                        if link["href"].startswith("tel:"):
-                            candidates.append(link["href"].replace("tel:", "").strip())
 
-                    # 2. Extract using regex
-                    phone_pattern = r'((?:\+90|0?)\s?\(?[2-9]\d{2}\)?\s?\d{3}\s?\d{2}\s?\d{2})|(444\s?\d{4})|(0850\s?\d{3}\s?\d{2}\s?\d{2})'
-                    text_content = soup.get_text()
-                    for match in re.finditer(phone_pattern, text_content):
-                        num = match.group().strip()
-                        if len(re.sub(r'\D', '', num)) >= 7:
-                            candidates.append(num)
-                    
-                    scraped_data["candidates"] = list(set(candidates))
-
-                    # Extract meta and body
-                    title = soup.title.string if soup.title else ""
-                    meta_desc = ""
-                    meta_tag = soup.find("meta", attrs={"name": "description"})
-                    if meta_tag:
-                        meta_desc = meta_tag.get("content", "")
-                    
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    body_text = soup.get_text(separator=' ', strip=True)[:5000]
-                    
-                    scraped_data["info_text"] = f"Başlık: {title}\nDescription: {meta_desc}\nİçerik Özeti: {body_text}"
-        except Exception as e:
-            print(f"Scraping error: {e}")
-        return scraped_data
-
-    async def identify_best_phone(self, url: str, text: str, candidates: list) -> str:
+    async def identify_best_phone(self, url: str, text: str, candidates: list, evidence: list = None) -> str:
         """
-        Use AI to identify the best contact phone number from candidates.
+        Identify the best contact phone number from candidates.
+        Candidates are ranked locally first (tel: links, contact/footer context,
+        frequency, call-center lines); AI is only consulted when the local
+        ranking is not confident enough; AI errors propagate to the caller.
         """
         if not candidates:
             return None
+
+        local_phone, confidence = self.phone_ranker.best_phone(evidence or evidence_from_candidates(candidates))
+        if local_phone and confidence >= PHONE_LOCAL_CONFIDENCE_THRESHOLD:
+            print(f"DEBUG: Phone resolved locally: {local_phone} (confidence {confidence})")
+            return local_phone
+        print(f"DEBUG: Local phone confidence {confidence} below threshold, asking AI")
             
         prompt = f"""
         You are working inside a real backend service.
@@ -99,8 +85,8 @@ class WebsiteScraper:
         * Customer service section
 
         ---
-        ## Extracted Website Text (truncated)
-        {text[:3000]}
+        ## Extracted Website Text (contact-related excerpts)
+        {text}
 
         ---
         ## Phone Number Candidates
@@ -122,8 +108,5 @@ class WebsiteScraper:
         }}
         ```
         """
-        try:
-            result = await self.client.generate_json(prompt)
-            return result.get("phone")
-        except Exception:
-            return None
+        result = await self.client.generate_json(prompt)
+        return result.get("phone")
@@ -0,0 +1,8 @@
+# Turkish letters folded to ASCII, so keyword matching works on text typed
+# with or without them ("İletişim", "ILETISIM" and "iletisim" all match)
+_TURKISH_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i", "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+                               "Ü": "u", "ü": "u", "Ö": "o", "ö": "o", "Ç": "c", "ç": "c"})
+
+
+def fold_text(text: str) -> str:
+    return text.translate(_TURKISH_FOLD).lower()
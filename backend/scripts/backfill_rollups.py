@@ -0,0 +1,38 @@
+import os
+import sys
+import time
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.config.firebase_config import initialize_firebase
+from app.services.rollup_service import BACKFILL_MIGRATION, RollupService
+
+# Initialize Firebase
+initialize_firebase()
+
+
+def main():
+    """
+    Build the analytics counters (campaigns and per-day saved messages) from existing data.
+    The server runs the full backfill once on its own; use this to run it
+    ahead of an upgrade, or to rebuild one user's counters.
+    Usage: python scripts/backfill_rollups.py [user_id]
+    """
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    print(f"--- Backfilling analytics rollups ({'user ' + user_id if user_id else 'all users'}) ---")
+    service = RollupService()
+    for name, job in [("campaign rollups", service.backfill_campaigns), ("message rollups", service.backfill_messages)]:
+        start = time.perf_counter()
+        result = job(user_id)
+        print(f"\n[{name}]")
+        for key, value in result.items():
+            print(f"  {key}: {value}")
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+    if not user_id:
+        # The server skips its own backfill and stops falling back to document scans
+        service.markers.mark_done(BACKFILL_MIGRATION)
+
+
+if __name__ == "__main__":
+    main()
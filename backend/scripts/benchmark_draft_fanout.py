@@ -0,0 +1,107 @@
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.clients.gemini_client import GeminiClient
+from app.core.hedging import Hedger, LatencyTracker
+from app.models.request_models import SMSRequest
+from app.services.draft_parser import DraftParser
+from app.services.sms_service import SMSService
+
+GENERATIONS = 100
+BASE_LATENCY = 0.01       # Simulated time to first token (seconds)
+PER_DRAFT_LATENCY = 0.015 # Simulated decode time per draft
+SLOW_PROBABILITY = 0.05   # Share of calls that hit a slow replica
+SLOW_FACTOR = 6
+GROUP_SIZE = 3
+SEED = 7
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Latency grows with the number of requested drafts, with an occasional slow call."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        types = re.findall(r'^---(.+)---$', prompt, re.MULTILINE)
+        latency = (BASE_LATENCY + PER_DRAFT_LATENCY * len(types)) * self.rng.lognormvariate(0, 0.2)
+        if self.rng.random() < SLOW_PROBABILITY:
+            latency *= SLOW_FACTOR
+        await asyncio.sleep(latency)
+        return FakeResponse("\n".join(f"---{t}---\n[Puan: 80]\nTaslak {t}" for t in types))
+
+
+def build_service(rng: random.Random, hedge_percentile: float = None) -> SMSService:
+    # Only the parts of SMSService that draft generation touches; no Firestore or scraping
+    service = SMSService.__new__(SMSService)
+    service.client = GeminiClient(model=FakeModel(rng))
+    service.draft_types = [
+        "Klasik", "Acil", "Samimi", "Minimalist",
+        "Hikaye Odaklı", "Soru & Cevap", "Modern",
+        "Lüks", "Genç", "Vurucu"
+    ]
+    service.parser = DraftParser(service.draft_types)
+    if hedge_percentile is None:
+        # A tracker that never has enough samples keeps the (unreachable) default delay
+        service.hedger = Hedger(100, default_delay=60, tracker=LatencyTracker(min_samples=sys.maxsize))
+    else:
+        service.hedger = Hedger(hedge_percentile, default_delay=60)
+    return service
+
+
+async def run_scenario(name: str, fan_out: bool, hedge_percentile: float = None) -> None:
+    import app.services.sms_service as sms_module
+    sms_module.DRAFT_FANOUT_GROUP_SIZE = GROUP_SIZE
+
+    service = build_service(random.Random(SEED), hedge_percentile)
+    request = SMSRequest(website_url="https://example.com", products=["Elbise"], discount_rate=20,
+                         message_count=10, target_audience="Genel")
+    timings = []
+    drafts = 0
+    for _ in range(GENERATIONS):
+        start = time.perf_counter()
+        if fan_out:
+            result = await service._generate_fanned_out(request, "", "Belirtilmedi", None)
+        else:
+            prompt = service._construct_prompt(request, "", "Belirtilmedi")
+            result = service._parse_generated_text(await service.client.generate_text(prompt))
+        timings.append(time.perf_counter() - start)
+        drafts += len(result)
+
+    timings.sort()
+    pct = lambda p: timings[min(len(timings) - 1, int(len(timings) * p))] * 1000
+    stats = service.hedger.stats()
+    print(f"\n[{name}]")
+    print(f"  drafts/generation:  {drafts / GENERATIONS:.1f}")
+    print(f"  latency p50:        {pct(0.50):.0f}ms")
+    print(f"  latency p95:        {pct(0.95):.0f}ms")
+    print(f"  latency p99:        {pct(0.99):.0f}ms")
+    if fan_out:
+        print(f"  hedges sent/won:    {stats['hedges_sent']}/{stats['hedges_won']} "
+              f"({stats['hedge_rate']:.1%} of group calls)")
+
+
+async def main():
+    print("--- Draft Fan-out Benchmark ---")
+    print(f"{GENERATIONS} generations of 10 drafts, {SLOW_PROBABILITY:.0%} of calls {SLOW_FACTOR}x slower, "
+          f"groups of {GROUP_SIZE}")
+
+    await run_scenario("single completion", fan_out=False)
+    await run_scenario("fan-out, no hedging", fan_out=True)
+    await run_scenario("fan-out, hedged at p90", fan_out=True, hedge_percentile=90)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,147 @@
+import contextlib
+import json
+import os
+import random
+import re
+import sys
+import time
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.models.response_models import SMSDraft
+from app.services.draft_parser import DraftParser
+
+CORPUS_PATH = os.path.join("scripts", "fixtures", "draft_parser_fuzz_corpus.json")
+DRAFT_TYPES = [
+    "Klasik", "Acil", "Samimi", "Minimalist",
+    "Hikaye Odaklı", "Soru & Cevap", "Modern",
+    "Lüks", "Genç", "Vurucu"
+]
+ITERATIONS = 2000
+FUZZ_CASES = 500
+SEED = 42
+
+
+def legacy_parse(text: str) -> list[SMSDraft]:
+    """The split-based parser SMSService used before DraftParser, kept for comparison."""
+    drafts = []
+    try:
+        parts = text.split("---")
+        type_map = {t.upper(): t for t in DRAFT_TYPES}
+        current_type = None
+        for part in parts:
+            clean_part = part.strip()
+            if not clean_part:
+                continue
+            lines = clean_part.split('\n')
+            current_score = 0
+            first_line = lines[0].strip()
+            if first_line in type_map:
+                current_type = type_map[first_line]
+            score_match = re.search(r'\[Puan:\s*(\d+)\]', clean_part)
+            if score_match:
+                current_score = int(score_match.group(1))
+                clean_part = re.sub(r'\[Puan:\s*(\d+)\]', '', clean_part)
+            if not current_type:
+                for t_upper, t_display in type_map.items():
+                    if t_upper in first_line:
+                        current_type = t_display
+                        break
+            if current_type and current_type.upper() in lines[0]:
+                clean_part = "\n".join(lines[1:])
+            current_content = clean_part.strip()
+            if current_type and current_content:
+                drafts.append(SMSDraft(type=current_type, content=current_content, score=current_score))
+        if drafts:
+            max(drafts, key=lambda d: d.score).is_recommended = True
+    except Exception as e:
+        drafts.append(SMSDraft(type="Hata", content="AI yanıtı ayrıştırılamadı.", score=0))
+    return drafts
+
+
+def mutate(text: str, rng: random.Random) -> str:
+    """Apply one random corruption that real completions exhibit."""
+    mutation = rng.choice(["truncate", "crlf", "markdown", "drop_score", "turkish_upper", "preamble", "dash_noise"])
+    if mutation == "truncate":
+        return text[:rng.randint(0, len(text))]
+    if mutation == "crlf":
+        return text.replace("\n", "\r\n")
+    if mutation == "markdown":
+        return re.sub(r'^(---[^\n]+---)$', r'**\1**', text, flags=re.MULTILINE)
+    if mutation == "drop_score":
+        return re.sub(r'\[Puan: \d+\]\n', '', text, count=1)
+    if mutation == "turkish_upper":
+        return text.replace("---KLASIK---", "---KLASİK---").replace("---ACIL---", "---ACİL---")
+    if mutation == "preamble":
+        return "İşte taslaklar:\n\n" + text
+    return text.replace(" fırsatı!", " fırsatı --- kaçırma!", 1)
+
+
+def build_fuzz_cases(corpus: list) -> list:
+    rng = random.Random(SEED)
+    sources = [c["text"] for c in corpus if c["expected"] > 0]
+    return [mutate(rng.choice(sources), rng) for _ in range(FUZZ_CASES)]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence parser logging (e.g. DraftParser's 'Parsing error' line) so it neither floods nor gets timed."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def time_parser(parse, texts: list) -> float:
+    with quiet():
+        start = time.perf_counter()
+        for _ in range(ITERATIONS // len(texts) + 1):
+            for text in texts:
+                parse(text)
+        elapsed = time.perf_counter() - start
+    runs = (ITERATIONS // len(texts) + 1) * len(texts)
+    return elapsed / runs * 1_000_000
+
+
+def count_valid(drafts: list) -> int:
+    return sum(1 for d in drafts if d.type != "Hata")
+
+
+def main():
+    with open(CORPUS_PATH, encoding="utf-8") as f:
+        corpus = json.load(f)
+    parser = DraftParser(DRAFT_TYPES)
+    parsers = {"legacy split parser": legacy_parse, "DraftParser": parser.parse}
+
+    print("--- Draft Parser Benchmark ---")
+    print(f"{len(corpus)} corpus cases, {FUZZ_CASES} fuzzed cases (seed {SEED})\n")
+
+    print("Corpus (drafts recovered / expected):")
+    for name, parse in parsers.items():
+        exact = 0
+        misses = []
+        for case in corpus:
+            with quiet():
+                got = count_valid(parse(case["text"]))
+            if got == case["expected"]:
+                exact += 1
+            else:
+                misses.append(f"{case['name']}({got}/{case['expected']})")
+        print(f"  {name:<20} {exact}/{len(corpus)} exact")
+        if misses:
+            print(f"    misses: {', '.join(misses)}")
+
+    fuzz_cases = build_fuzz_cases(corpus)
+    print("\nFuzz (share of mutated outputs yielding no usable draft):")
+    for name, parse in parsers.items():
+        with quiet():
+            failures = sum(1 for text in fuzz_cases if count_valid(parse(text)) == 0)
+        print(f"  {name:<20} {failures / len(fuzz_cases):.1%} parse failures")
+
+    texts = [c["text"] for c in corpus]
+    print("\nParse cost (mean per completion):")
+    for name, parse in parsers.items():
+        print(f"  {name:<20} {time_parser(parse, texts):.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from unittest import mock
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+import httpx
+from fastapi import FastAPI
+
+REQUESTS = 200
+RPC_LATENCY = 0.02          # Simulated Firestore round trip (seconds), blocking like the gRPC SDK
+CONCURRENCY_LEVELS = [1, 4, 16, 64]
+CAMPAIGNS_PER_USER = 5
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeDocument:
+    def __init__(self, collection, doc_id):
+        self.collection = collection
+        self.id = doc_id
+
+    def get(self):
+        time.sleep(RPC_LATENCY)
+        return FakeSnapshot(self.id, self.collection.docs.get(self.id))
+
+
+class FakeQuery:
+    def __init__(self, collection, filters):
+        self.collection = collection
+        self.filters = filters
+
+    def where(self, field, op, value):
+        return FakeQuery(self.collection, self.filters + [(field, value)])
+
+    def stream(self):
+        time.sleep(RPC_LATENCY)
+        for doc_id, data in self.collection.docs.items():
+            if all(data.get(field) == value for field, value in self.filters):
+                yield FakeSnapshot(doc_id, data)
+
+
+class FakeCollection(FakeQuery):
+    def __init__(self):
+        super().__init__(self, [])
+        self.docs = {}
+
+    def document(self, doc_id=None):
+        return FakeDocument(self, doc_id)
+
+
+class FakeFirestore:
+    """Read-only stand-in for the synchronous Firestore client."""
+
+    def __init__(self):
+        self.collections = {}
+
+    def collection(self, name):
+        return self.collections.setdefault(name, FakeCollection())
+
+
+def build_app(db: FakeFirestore) -> FastAPI:
+    with mock.patch("firebase_admin.firestore.client", return_value=db):
+        from app.controllers.campaign_controller import router
+    from app.middleware.auth_middleware import get_current_user
+
+    campaigns = db.collection("campaigns")
+    for i in range(CAMPAIGNS_PER_USER):
+        campaigns.docs[f"c{i}"] = {
+            "name": f"Kampanya {i}", "customer_id": "cust", "user_id": "bench-user",
+            "start_date": datetime(2026, 1, 1), "end_date": datetime(2026, 2, 1),
+            "products": ["Elbise"], "discount_rate": 20.0, "status": "Taslak",
+            "created_at": datetime(2026, 1, i + 1)
+        }
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "bench-user"}
+    return app
+
+
+async def inline_run(func, *args, **kwargs):
+    """Reproduces the old services: blocking Firestore calls on the event loop."""
+    return func(*args, **kwargs)
+
+
+async def run_level(client: httpx.AsyncClient, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            path = "/campaigns/" if i % 2 else f"/campaigns/c{i % CAMPAIGNS_PER_USER}"
+            response = await client.get(path)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(REQUESTS)))
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def run_scenario(name: str, app: FastAPI) -> None:
+    print(f"\n[{name}]")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for concurrency in CONCURRENCY_LEVELS:
+            throughput = await run_level(client, concurrency)
+            print(f"  concurrency {concurrency:>3}:   {throughput:7.1f} req/s")
+
+
+async def main():
+    from app.core.executor import firestore_executor
+
+    print("--- Firestore Concurrency Load Test ---")
+    print(f"{REQUESTS} requests per level (list + get campaign), {RPC_LATENCY * 1000:.0f}ms simulated "
+          f"Firestore round trip, FIRESTORE_MAX_WORKERS={firestore_executor.max_workers}")
+
+    app = build_app(FakeFirestore())
+    with mock.patch.object(firestore_executor, "run", inline_run):
+        await run_scenario("blocking on the event loop (old)", app)
+    await run_scenario("bounded Firestore executor", app)
+    firestore_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.clients.gemini_client import GeminiClient
+from app.config.settings import GEMINI_MAX_CONCURRENCY
+
+GENERATIONS = 20
+LLM_LATENCY = 0.5    # Simulated Gemini round trip (seconds)
+PROBE_INTERVAL = 0.01
+
+
+class FakeResponse:
+    text = "---KLASIK---\n[Puan: 80]\nTest"
+
+
+class FakeModel:
+    """Stand-in for genai.GenerativeModel with a fixed round-trip latency."""
+
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(LLM_LATENCY)
+        return FakeResponse()
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        await asyncio.sleep(LLM_LATENCY)
+        return FakeResponse()
+
+
+class BlockingClient:
+    """Reproduces the old client: async signature, synchronous SDK call."""
+
+    def __init__(self):
+        self.model = FakeModel()
+
+    async def generate_text(self, prompt: str) -> str:
+        return self.model.generate_content(prompt).text
+
+
+async def probe_loop_latency(samples: list, stop: asyncio.Event):
+    """Measure how late the event loop wakes up a 10ms timer."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        samples.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+
+async def run_scenario(name: str, client) -> None:
+    samples = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(probe_loop_latency(samples, stop))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.generate_text("prompt") for _ in range(GENERATIONS)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await probe
+
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1] if samples else 0.0
+    print(f"\n[{name}]")
+    print(f"  wall time:          {elapsed:.2f}s")
+    print(f"  loop lag samples:   {len(samples)}")
+    print(f"  loop lag p50:       {statistics.median(samples) if samples else 0.0:.2f}ms")
+    print(f"  loop lag p99:       {p99:.2f}ms")
+    print(f"  loop lag max:       {max(samples) if samples else 0.0:.2f}ms")
+
+
+async def main():
+    print("--- Gemini Client Concurrency Benchmark ---")
+    print(f"{GENERATIONS} generations, {LLM_LATENCY}s simulated latency, "
+          f"GEMINI_MAX_CONCURRENCY={GEMINI_MAX_CONCURRENCY}")
+
+    await run_scenario("blocking (old)", BlockingClient())
+    await run_scenario("non-blocking GeminiClient", GeminiClient(model=FakeModel()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
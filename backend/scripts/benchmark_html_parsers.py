@@ -0,0 +1,268 @@
+"""
+Compare the HTML parser backends used for page analysis: time, Python heap
+peak and RSS peak, plus whether they all extract the same signals.
+
+The corpus is the saved homepages in scripts/fixtures/html_corpus. Save them
+with --fetch (the URLs in scripts/fixtures/html_corpus/urls.txt, or the ones
+given). Until some are saved, the script benchmarks synthetic homepages:
+deterministic e-commerce pages with the bulk of real ones (inline JSON and
+scripts, mega menus, product grids, a contact footer) at 70 KB - 1 MB each.
+They exercise the same extraction paths, but real markup is messier, so
+confirm results on saved homepages.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.services.html_extractors import available_backends, get_extractor
+from app.services.page_analyzer import PageAnalyzer
+
+CORPUS_DIR = os.path.join("scripts", "fixtures", "html_corpus")
+URL_LIST = os.path.join(CORPUS_DIR, "urls.txt")
+REPEATS = 5
+# Product cards per synthetic homepage (page size grows with them)
+SYNTHETIC_PAGES = [12, 40, 80, 160, 320]
+
+CATEGORIES = ["Kadın", "Erkek", "Çocuk", "Ev & Yaşam", "Kozmetik", "Ayakkabı & Çanta", "Elektronik", "Spor & Outdoor"]
+WORDS = ["pamuklu", "oversize", "basic", "slim", "fit", "örme", "kazak", "gömlek", "elbise", "pantolon", "ceket",
+         "sneaker", "çanta", "nevresim", "havlu", "parfüm", "krem", "saat", "kulaklık", "tişört", "şort", "mont"]
+
+
+def _product_card(rng: random.Random, i: int) -> str:
+    name = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 6))).title()
+    price = rng.randint(99, 4999)
+    old = price + rng.randint(50, 900)
+    badge = rng.choice(["", '<span class="badge badge--sale">%{}</span>'.format(rng.randint(10, 60)),
+                        '<span class="badge badge--new">Yeni</span>'])
+    colors = "".join(f'<li class="swatch" style="background:#{rng.randrange(0xFFFFFF):06x}"></li>' for _ in range(rng.randint(1, 5)))
+    return (
+        f'<div class="product-card" data-id="{100000 + i}" data-price="{price}">'
+        f'<a class="product-card__link" href="/urun/{name.lower().replace(" ", "-")}-p-{100000 + i}">'
+        f'<div class="product-card__image"><img loading="lazy" src="https://cdn.example.com/p/{i}/1.jpg" '
+        f'srcset="https://cdn.example.com/p/{i}/1.jpg 1x, https://cdn.example.com/p/{i}/1@2x.jpg 2x" alt="{name}">'
+        f'{badge}</div><div class="product-card__body"><h3 class="product-card__name">{name}</h3>'
+        f'<div class="product-card__price"><del>{old},99 TL</del> <strong>{price},99 TL</strong></div>'
+        f'<ul class="swatches">{colors}</ul><button class="btn btn--cart" type="button">Sepete Ekle</button>'
+        f'</div></a></div>'
+    )
+
+
+def synthetic_homepage(products: int) -> str:
+    """
+    A deterministic e-commerce homepage shaped like real ones: large inline
+    state and scripts, a mega menu, a product grid and a contact footer.
+    """
+    rng = random.Random(products)
+    state = {"products": [{"id": 100000 + i, "name": " ".join(rng.choice(WORDS) for _ in range(4)),
+                           "price": rng.randint(99, 4999), "stock": rng.randint(0, 500)} for i in range(products)]}
+    menu = "".join(
+        f'<li class="menu__item"><a href="/{c.lower()}">{c}</a><div class="mega"><ul>'
+        + "".join(f'<li><a href="/{c.lower()}/{w}">{w.title()}</a></li>' for w in rng.sample(WORDS, 12))
+        + "</ul></div></li>"
+        for c in CATEGORIES
+    )
+    icons = "".join(
+        f'<svg class="icon" viewBox="0 0 24 24"><path d="M{rng.randint(0, 24)} {rng.randint(0, 24)}L'
+        + " ".join(f"{rng.randint(0, 24)} {rng.randint(0, 24)}" for _ in range(12)) + 'Z"/></svg>'
+        for _ in range(20)
+    )
+    cards = "".join(_product_card(rng, i) for i in range(products))
+    styles = "".join(f".c{i}{{margin:{i % 7}px;color:#{rng.randrange(0xFFFFFF):06x}}}" for i in range(products * 4))
+    return f"""<!DOCTYPE html>
+<html lang="tr"><head>
+<meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Örnek Mağaza | Online Alışveriş {products}</title>
+<meta name="description" content="Kadın, erkek ve çocuk modasında binlerce ürün, hızlı kargo ve kolay iade.">
+<meta property="og:title" content="Örnek Mağaza"><meta property="og:image" content="https://cdn.example.com/og/share.jpg">
+<link rel="icon" href="/favicon.ico"><link rel="apple-touch-icon" href="/apple-touch-icon.png">
+<link rel="stylesheet" href="https://cdn.example.com/css/main.{products}.css">
+<style>{styles}</style>
+<script>window.dataLayer=window.dataLayer||[];function gtag(){{dataLayer.push(arguments)}}gtag('js',new Date());</script>
+<script type="application/ld+json">{{"@context":"https://schema.org","@type":"Organization","name":"Örnek Mağaza","telephone":"+90 850 123 45 67"}}</script>
+<script id="__NEXT_DATA__" type="application/json">{json.dumps(state, ensure_ascii=False)}</script>
+</head><body>
+<div class="cookie-banner" role="dialog"><p>Deneyiminizi iyileştirmek için çerezler kullanıyoruz. <a href="/cerez-politikasi">Detaylar</a></p><button>Kabul Et</button></div>
+<div class="topbar"><span>500 TL üzeri ücretsiz kargo</span><a href="tel:+908501234567">0850 123 45 67</a></div>
+<header class="header"><a href="/" class="header__brand"><img class="header__logo" src="/assets/img/logo.svg" alt="Örnek Mağaza"></a>
+<form class="search" action="/arama"><input type="search" name="q" placeholder="Ürün, kategori veya marka ara"></form>
+<nav class="menu"><ul>{menu}</ul></nav><div class="icons" hidden>{icons}</div></header>
+<main>
+<section class="hero"><div class="slider">{"".join(f'<div class="slide"><img src="https://cdn.example.com/b/{i}.jpg" alt="Kampanya {i}"><h2>Sezon indirimi %{rng.randint(20, 70)}</h2></div>' for i in range(6))}</div></section>
+<section class="showcase"><h2>Çok Satanlar</h2><div class="grid">{cards}</div></section>
+<section class="newsletter"><h2>Kampanyalardan ilk sen haberdar ol</h2><form><input type="email" placeholder="E-posta adresiniz"><button>Abone Ol</button></form></section>
+</main>
+<footer class="footer"><div class="footer__cols">{"".join(f'<div class="footer__col"><h4>{c}</h4><ul>' + "".join(f'<li><a href="/{w}">{w.title()}</a></li>' for w in rng.sample(WORDS, 8)) + "</ul></div>" for c in CATEGORIES[:5])}</div>
+<div class="footer__contact" id="iletisim"><p>Müşteri Hizmetleri: <a href="tel:08501234567">0850 123 45 67</a></p>
+<p>WhatsApp: 0532 765 43 21 · Hafta içi 09:00-18:00</p><p>Örnek Mah. Deneme Cad. No:1 Kadıköy / İstanbul</p></div>
+<p class="footer__copy">© 2026 Örnek Mağaza A.Ş. Tüm hakları saklıdır.</p></footer>
+<script src="https://cdn.example.com/js/vendor.{products}.js" defer></script>
+<script>{"".join(f"window.__c{i}=function(e){{return e&&e.target&&e.target.dataset&&e.target.dataset.id==={i}}};" for i in range(products * 2))}</script>
+</body></html>"""
+
+
+def load_corpus(corpus_dir: str) -> dict:
+    paths = sorted(glob.glob(os.path.join(corpus_dir, "*.html")))
+    if not paths:
+        print(f"No saved homepages in {corpus_dir}; benchmarking {len(SYNTHETIC_PAGES)} synthetic homepages instead.")
+        print("Save real ones with: python scripts/benchmark_html_parsers.py --fetch")
+        return {f"synthetic_{n}_products.html": synthetic_homepage(n) for n in SYNTHETIC_PAGES}
+    corpus = {}
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            corpus[path] = f.read()
+    return corpus
+
+
+def read_url_list(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+async def fetch_corpus(urls: list, corpus_dir: str) -> None:
+    from app.clients.http_client import http_pool
+
+    os.makedirs(corpus_dir, exist_ok=True)
+    analyzer = PageAnalyzer()
+    for url in urls:
+        try:
+            response = await http_pool.get(analyzer.normalize_url(url), headers=analyzer.headers)
+            name = response.url.host.replace(".", "_") + ".html"
+            with open(os.path.join(corpus_dir, name), "w", encoding="utf-8") as f:
+                f.write(response.text)
+            print(f"Saved {url} -> {name} ({len(response.text) // 1024} KB)")
+        except Exception as e:
+            print(f"Failed to fetch {url}: {e}")
+    await http_pool.close()
+
+
+def measure_backend(backend: str, corpus: dict) -> dict:
+    """Time and Python-heap peak for the full page analysis on one backend."""
+    analyzer = PageAnalyzer(parser_backend=backend)
+    timings = []
+    for html in corpus.values():
+        runs = []
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            analyzer.analyze_html(html, "https://example.com")
+            runs.append(time.perf_counter() - start)
+        timings.append(statistics.median(runs))
+
+    tracemalloc.start()
+    for html in corpus.values():
+        analyzer.analyze_html(html, "https://example.com")
+    _, heap_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend,
+        "total_ms": sum(timings) * 1000,
+        "median_page_ms": statistics.median(timings) * 1000,
+        "max_page_ms": max(timings) * 1000,
+        "heap_peak_kb": heap_peak / 1024
+    }
+
+
+def measure_rss(backend: str, corpus_dir: str) -> float:
+    """
+    Peak RSS growth (KB) of a fresh process analyzing the corpus once.
+    Unlike tracemalloc this includes the C allocations of lxml/lexbor.
+    """
+    result = subprocess.run(
+        [sys.executable, __file__, "--rss-child", backend, "--corpus", corpus_dir],
+        capture_output=True, text=True
+    )
+    try:
+        return float(result.stdout.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        return float("nan")
+
+
+def _read_status_kb(field: str) -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return float(line.split()[1])
+    return float("nan")
+
+
+def rss_child(backend: str, corpus_dir: str) -> None:
+    corpus = load_corpus(corpus_dir)
+    analyzer = PageAnalyzer(parser_backend=backend)
+    try:
+        # Reset the peak-RSS watermark so import-time allocations don't hide the parse cost (Linux only)
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        baseline = _read_status_kb("VmRSS")
+        for html in corpus.values():
+            analyzer.analyze_html(html, "https://example.com")
+        print(_read_status_kb("VmHWM") - baseline)
+    except OSError:
+        baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        for html in corpus.values():
+            analyzer.analyze_html(html, "https://example.com")
+        print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline)
+
+
+def check_agreement(corpus: dict, backends: list) -> None:
+    """Every backend should extract the same signals as html.parser."""
+    reference = PageAnalyzer(parser_backend="html.parser")
+    for backend in backends[1:]:
+        analyzer = PageAnalyzer(parser_backend=backend)
+        mismatches = []
+        for path, html in corpus.items():
+            expected = reference.analyze_html(html, "https://example.com")
+            actual = analyzer.analyze_html(html, "https://example.com")
+            for field in ("title", "tel_links", "logo_candidates", "phone_candidates"):
+                if expected[field] != actual[field]:
+                    mismatches.append(f"{os.path.basename(path)}:{field}")
+        status = "identical" if not mismatches else f"differs in {', '.join(mismatches)}"
+        print(f"  {backend:<12} vs html.parser: {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends for page analysis.")
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--fetch", nargs="*", metavar="URL",
+                        help=f"Save homepages into the corpus and exit (default: the URLs in {URL_LIST})")
+    parser.add_argument("--rss-child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.rss_child:
+        rss_child(args.rss_child, args.corpus)
+        return
+    if args.fetch is not None:
+        asyncio.run(fetch_corpus(args.fetch or read_url_list(URL_LIST), args.corpus))
+        return
+
+    corpus = load_corpus(args.corpus)
+    total_kb = sum(len(html) for html in corpus.values()) / 1024
+    backends = available_backends()
+    print("--- HTML Parser Backend Benchmark ---")
+    print(f"{len(corpus)} pages, {total_kb:.0f} KB total, median of {REPEATS} runs per page")
+    print(f"auto backend resolves to: {get_extractor('auto').name}\n")
+
+    print(f"{'backend':<12} {'total ms':>10} {'median/page':>12} {'max/page':>10} {'heap peak KB':>13} {'rss KB':>8}")
+    for backend in backends:
+        r = measure_backend(backend, corpus)
+        rss = measure_rss(backend, args.corpus)
+        print(f"{backend:<12} {r['total_ms']:>10.1f} {r['median_page_ms']:>12.2f} "
+              f"{r['max_page_ms']:>10.2f} {r['heap_peak_kb']:>13.0f} {rss:>8.0f}")
+
+    print("\nExtraction agreement:")
+    check_agreement(corpus, backends)
+
+
+if __name__ == "__main__":
+    main()
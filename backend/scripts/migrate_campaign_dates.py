@@ -0,0 +1,34 @@
+import os
+import sys
+import time
+
+# Ensure backend directory is in path
+sys.path.append(os.getcwd())
+
+from app.config.firebase_config import initialize_firebase
+from app.services.campaign_service import DATES_MIGRATION, CampaignService
+
+# Initialize Firebase
+initialize_firebase()
+
+
+def main():
+    """
+    Normalize campaign dates (legacy strings -> timestamps) and fill the
+    start_on / end_on / transition_due_on fields used by the status scheduler.
+    The server runs this once on its own; use the script to run it ahead of
+    an upgrade.
+    Usage: python scripts/migrate_campaign_dates.py
+    """
+    print("--- Migrating campaign dates ---")
+    start = time.perf_counter()
+    service = CampaignService()
+    result = service.migrate_campaign_dates()
+    service.migrations.mark_done(DATES_MIGRATION, result, time.perf_counter() - start)
+    for key, value in result.items():
+        print(f"  {key}: {value}")
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,8 +33,12 @@ async def main():
     camp = await service.create_campaign(camp_data, user_id)
     print(f"Created campaign {camp.id} (Status: {camp.status})")
     
-    # Manually set to 'Planlandı' to simulate user scheduling
-    service.collection.document(camp.id).update({"status": CampaignStatus.PLANLANDI.value})
+    # Manually set to 'Planlandı' to simulate user scheduling (bypasses the immediate check in update_campaign)
+    today = datetime.now().date().isoformat()
+    service.collection.document(camp.id).update({
+        "status": CampaignStatus.PLANLANDI.value,
+        **service._date_fields(CampaignStatus.PLANLANDI.value, today, today)
+    })
     print("Set status to 'Planlandı'")
     
     # Run Automation Logic (Sync)
@@ -0,0 +1,18 @@
+import React from 'react';
+
+const LoadMoreButton = ({ onClick, loading, label = 'Daha Fazla Yükle' }) => {
+    return (
+        <button
+            onClick={onClick}
+            disabled={loading}
+            className="inline-flex items-center justify-center gap-2 px-4 py-2 rounded-lg border border-slate-200 bg-white text-sm font-medium text-slate-600 hover:bg-slate-50 hover:text-primary disabled:opacity-50 disabled:cursor-not-allowed transition-all"
+        >
+            <span className={`material-symbols-outlined text-[18px] ${loading ? 'animate-spin' : ''}`}>
+                {loading ? 'progress_activity' : 'expand_more'}
+            </span>
+            <span>{loading ? 'Yükleniyor...' : label}</span>
+        </button>
+    );
+};
+
+export default LoadMoreButton;
@@ -0,0 +1,73 @@
+import { useState, useEffect, useRef } from 'react';
+
+// Loads a cursor-paginated list one page at a time. fetchPage(pageToken)
+// resolves to { items, next_page_token }; the list restarts from the first
+// page whenever deps change. With loadAll (e.g. while a search or a sort the
+// API can't do is active) the remaining pages are fetched automatically.
+export const usePagedList = (fetchPage, deps = [], { loadAll = false } = {}) => {
+    const [items, setItems] = useState([]);
+    const [nextPageToken, setNextPageToken] = useState(null);
+    const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [failed, setFailed] = useState(false);
+    // Pages that arrive for an earlier list (before deps changed) are dropped
+    const generation = useRef(0);
+    // Taken by loadMore while a page is in flight, so it is fetched only once
+    const pageToken = useRef(null);
+
+    useEffect(() => {
+        const current = ++generation.current;
+        pageToken.current = null;
+        const fetchFirstPage = async () => {
+            try {
+                setLoading(true);
+                setFailed(false);
+                setNextPageToken(null);
+                const page = await fetchPage(null);
+                if (current !== generation.current) return;
+                setItems(page.items);
+                pageToken.current = page.next_page_token;
+                setNextPageToken(page.next_page_token);
+            } catch (error) {
+                console.error("Failed to fetch list:", error);
+            } finally {
+                if (current === generation.current) setLoading(false);
+            }
+        };
+
+        fetchFirstPage();
+    }, deps);
+
+    const loadMore = async () => {
+        const token = pageToken.current;
+        if (!token) return;
+        const current = generation.current;
+        pageToken.current = null;
+        try {
+            setLoadingMore(true);
+            setFailed(false);
+            const page = await fetchPage(token);
+            if (current !== generation.current) return;
+            setItems(prev => [...prev, ...page.items]);
+            pageToken.current = page.next_page_token;
+            setNextPageToken(page.next_page_token);
+        } catch (error) {
+            console.error("Failed to fetch next page:", error);
+            if (current === generation.current) {
+                pageToken.current = token;
+                // Stops loadAll from retrying; the load more button still can
+                setFailed(true);
+            }
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
+    useEffect(() => {
+        if (loadAll && nextPageToken && !loading && !loadingMore && !failed) {
+            loadMore();
+        }
+    }, [loadAll, nextPageToken, loading, loadingMore, failed]);
+
+    return { items, setItems, loading, loadingMore, hasMore: Boolean(nextPageToken), loadMore };
+};
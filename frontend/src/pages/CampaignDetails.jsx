@@ -1,7 +1,13 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, Link, useNavigate } from 'react-router-dom';
+import { usePagedList } from '../hooks/usePagedList';
 import { campaignsApi, customersApi, generateSms, refineSms, getToneRecommendations } from '../services/api';
 import CampaignModal from '../components/CampaignModal';
+import LoadMoreButton from '../components/LoadMoreButton';
+
+const MESSAGE_PAGE_SIZE = 20;
+// Fields the saved message bubbles use
+const MESSAGE_FIELDS = 'content,target_audience,type,created_at';
 
 const CampaignDetails = () => {
     const { campaignId } = useParams();
@@ -16,7 +22,6 @@ const CampaignDetails = () => {
     const [audienceInput, setAudienceInput] = useState('');
 
     const [drafts, setDrafts] = useState([]);
-    const [savedMessages, setSavedMessages] = useState([]);
     const [isGenerating, setIsGenerating] = useState(false);
     const [isRefining, setIsRefining] = useState(false); // New state for refinement loading
     const [editingDraftIdx, setEditingDraftIdx] = useState(null);
@@ -24,11 +29,26 @@ const CampaignDetails = () => {
     const [copiedIdx, setCopiedIdx] = useState(null);
     const [error, setError] = useState(null);
     const [isEditModalOpen, setIsEditModalOpen] = useState(false);
-    const [customers, setCustomers] = useState([]);
     const [recommendedTones, setRecommendedTones] = useState([]);
     const [isRecsLoading, setIsRecsLoading] = useState(false);
     const [aiFeedback, setAiFeedback] = useState(null); // { message: string, type: 'success' | 'info' }
 
+    // Newest first; older messages are loaded on demand
+    const {
+        items: savedMessages,
+        setItems: setSavedMessages,
+        loadingMore: loadingOlderMessages,
+        hasMore: hasOlderMessages,
+        loadMore: loadOlderMessages
+    } = usePagedList(
+        (pageToken) => campaignsApi.getMessagesPage(campaignId, {
+            limit: MESSAGE_PAGE_SIZE,
+            page_token: pageToken || undefined,
+            fields: MESSAGE_FIELDS
+        }),
+        [campaignId]
+    );
+
     useEffect(() => {
         const fetchAllData = async () => {
             try {
@@ -40,13 +60,6 @@ const CampaignDetails = () => {
                     const customerData = await customersApi.getOne(campaignData.customer_id);
                     setCustomer(customerData);
                 }
-
-                const saved = await campaignsApi.getMessages(campaignId);
-                setSavedMessages(saved);
-
-                // Fetch customers for the edit modal
-                const customersList = await customersApi.getAll();
-                setCustomers(customersList);
             } catch (err) {
                 console.error("Error fetching campaign details:", err);
                 setError("Kampanya detayları yüklenirken bir hata oluştu.");
@@ -700,7 +713,7 @@ const CampaignDetails = () => {
                             <span className="material-symbols-outlined text-slate-700 text-[24px]">smartphone</span>
                             Kayıtlı Mesajlar
                             {savedMessages.length > 0 && (
-                                <span className="bg-slate-800/10 text-slate-800 px-2.5 py-0.5 rounded-lg text-[12px] font-black">{savedMessages.length}</span>
+                                <span className="bg-slate-800/10 text-slate-800 px-2.5 py-0.5 rounded-lg text-[12px] font-black">{savedMessages.length}{hasOlderMessages ? '+' : ''}</span>
                             )}
                         </h2>
 
@@ -754,6 +767,11 @@ const CampaignDetails = () => {
                                         </div>
                                     ) : (
                                         <div className="space-y-4">
+                                            {hasOlderMessages && (
+                                                <div className="flex justify-center">
+                                                    <LoadMoreButton onClick={loadOlderMessages} loading={loadingOlderMessages} label="Daha Eski Mesajlar" />
+                                                </div>
+                                            )}
                                             {[...savedMessages].reverse().map((msg) => (
                                                 <div key={msg.id} className="flex flex-col items-start gap-1 group">
                                                     {/* Audience & Type Tags - Above message */}
@@ -832,7 +850,7 @@ const CampaignDetails = () => {
                     setCampaign(updated);
                 }}
                 campaign={campaign}
-                customers={customers}
+                customers={customer ? [customer] : []}
                 lockedCustomerId={campaign?.customer_id}
             />
         </div>
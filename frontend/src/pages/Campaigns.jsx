@@ -1,49 +1,61 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
+import { usePagedList } from '../hooks/usePagedList';
 import { campaignsApi, customersApi } from '../services/api';
 import CampaignModal from '../components/CampaignModal';
+import LoadMoreButton from '../components/LoadMoreButton';
+
+const PAGE_SIZE = 20;
+// Fields the campaign table uses; the edit modal fetches the full campaign
+const CAMPAIGN_FIELDS = 'name,customer_id,status,start_date,end_date,created_at';
 
 const Campaigns = () => {
     const navigate = useNavigate();
-    const [campaigns, setCampaigns] = useState([]);
     const [customers, setCustomers] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const [customersLoading, setCustomersLoading] = useState(true);
     const [searchTerm, setSearchTerm] = useState('');
-    const [customerFilter, setCustomerFilter] = useState('Tüm Müşteriler');
+    const [customerFilter, setCustomerFilter] = useState('');
     const [statusFilter, setStatusFilter] = useState('Tüm Durumlar');
     const [sortOption, setSortOption] = useState('recently_added');
-    const [currentPage, setCurrentPage] = useState(1);
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [editingCampaign, setEditingCampaign] = useState(null);
-    const itemsPerPage = 10;
+
+    // The API filters by customer and status and returns campaigns newest first;
+    // a name search or any other sort needs every matching campaign loaded
+    const loadAll = Boolean(searchTerm) || sortOption !== 'recently_added';
+
+    const { items: campaigns, setItems: setCampaigns, loading, loadingMore, hasMore, loadMore } = usePagedList(
+        (pageToken) => campaignsApi.getPage({
+            limit: PAGE_SIZE,
+            page_token: pageToken || undefined,
+            customer_id: customerFilter || undefined,
+            status: statusFilter === 'Tüm Durumlar' ? undefined : statusFilter,
+            fields: CAMPAIGN_FIELDS
+        }),
+        [customerFilter, statusFilter],
+        { loadAll }
+    );
 
     useEffect(() => {
-        const fetchData = async () => {
+        // Customer names and logos for the table, the filter and the modal
+        const fetchCustomers = async () => {
             try {
-                setLoading(true);
-                const [campaignsData, customersData] = await Promise.all([
-                    campaignsApi.getAll(),
-                    customersApi.getAll()
-                ]);
-                setCampaigns(campaignsData);
+                setCustomersLoading(true);
+                const customersData = await customersApi.getAll({ fields: 'name,logo_url' });
                 setCustomers(customersData);
             } catch (error) {
-                console.error("Error fetching campaigns data:", error);
+                console.error("Error fetching customers:", error);
             } finally {
-                setLoading(false);
+                setCustomersLoading(false);
             }
         };
 
-        fetchData();
+        fetchCustomers();
     }, []);
 
-    const filteredCampaigns = campaigns.filter(campaign => {
-        const matchesSearch = campaign.name.toLowerCase().includes(searchTerm.toLowerCase());
-        const customer = customers.find(c => c.id === campaign.customer_id);
-        const matchesCustomer = customerFilter === 'Tüm Müşteriler' || customer?.name === customerFilter;
-        const matchesStatus = statusFilter === 'Tüm Durumlar' || campaign.status === statusFilter;
-        return matchesSearch && matchesCustomer && matchesStatus;
-    });
+    const filteredCampaigns = campaigns.filter(campaign =>
+        campaign.name.toLowerCase().includes(searchTerm.toLowerCase())
+    );
 
     // Sort campaigns
     const sortedCampaigns = [...filteredCampaigns].sort((a, b) => {
@@ -65,20 +77,22 @@ const Campaigns = () => {
         }
     });
 
-    const totalPages = Math.ceil(sortedCampaigns.length / itemsPerPage);
-    const paginatedCampaigns = sortedCampaigns.slice((currentPage - 1) * itemsPerPage, currentPage * itemsPerPage);
-
     const clearFilters = () => {
         setSearchTerm('');
-        setCustomerFilter('Tüm Müşteriler');
+        setCustomerFilter('');
         setStatusFilter('Tüm Durumlar');
         setSortOption('recently_added');
-        setCurrentPage(1);
     };
 
-    const handleEditClick = (campaign) => {
-        setEditingCampaign(campaign);
-        setIsModalOpen(true);
+    const handleEditClick = async (campaign) => {
+        try {
+            // List rows only carry the table's fields
+            const fullCampaign = await campaignsApi.getOne(campaign.id);
+            setEditingCampaign(fullCampaign);
+            setIsModalOpen(true);
+        } catch (error) {
+            console.error("Failed to fetch campaign:", error);
+        }
     };
 
     const handleCreateClick = () => {
@@ -93,7 +107,7 @@ const Campaigns = () => {
                 setCampaigns(campaigns.map(c => c.id === updated.id ? updated : c));
             } else {
                 const created = await campaignsApi.create(formData);
-                setCampaigns([...campaigns, created]);
+                setCampaigns([created, ...campaigns]);
             }
         } catch (error) {
             console.error("Failed to save campaign:", error);
@@ -101,7 +115,7 @@ const Campaigns = () => {
         }
     };
 
-    if (loading) {
+    if (customersLoading) {
         return (
             <div className="flex items-center justify-center h-full">
                 <div className="animate-spin rounded-full h-12 w-12 border-b-2 border-primary"></div>
@@ -136,7 +150,7 @@ const Campaigns = () => {
                             placeholder="Kampanya adı ile ara..."
                             type="text"
                             value={searchTerm}
-                            onChange={(e) => { setSearchTerm(e.target.value); setCurrentPage(1); }}
+                            onChange={(e) => setSearchTerm(e.target.value)}
                         />
                     </div>
                     <div className="flex flex-wrap items-center gap-3 w-full lg:w-auto">
@@ -144,11 +158,11 @@ const Campaigns = () => {
                             <select
                                 className="appearance-none pl-3 pr-10 py-2.5 rounded-lg border border-slate-200 text-sm text-slate-600 focus:outline-none focus:border-primary bg-white cursor-pointer min-w-[160px] hover:border-slate-300 transition-colors"
                                 value={customerFilter}
-                                onChange={(e) => { setCustomerFilter(e.target.value); setCurrentPage(1); }}
+                                onChange={(e) => setCustomerFilter(e.target.value)}
                             >
-                                <option>Tüm Müşteriler</option>
+                                <option value="">Tüm Müşteriler</option>
                                 {customers.map(customer => (
-                                    <option key={customer.id}>{customer.name}</option>
+                                    <option key={customer.id} value={customer.id}>{customer.name}</option>
                                 ))}
                             </select>
                             <span className="material-symbols-outlined absolute right-2 top-1/2 -translate-y-1/2 text-slate-400 pointer-events-none text-[20px]">keyboard_arrow_down</span>
@@ -157,7 +171,7 @@ const Campaigns = () => {
                             <select
                                 className="appearance-none pl-3 pr-10 py-2.5 rounded-lg border border-slate-200 text-sm text-slate-600 focus:outline-none focus:border-primary bg-white cursor-pointer min-w-[160px] hover:border-slate-300 transition-colors"
                                 value={statusFilter}
-                                onChange={(e) => { setStatusFilter(e.target.value); setCurrentPage(1); }}
+                                onChange={(e) => setStatusFilter(e.target.value)}
                             >
                                 <option>Tüm Durumlar</option>
                                 <option>Aktif</option>
@@ -171,7 +185,7 @@ const Campaigns = () => {
                             <select
                                 className="appearance-none pl-3 pr-10 py-2.5 rounded-lg border border-slate-200 text-sm text-slate-600 focus:outline-none focus:border-primary bg-white cursor-pointer min-w-[180px] hover:border-slate-300 transition-colors"
                                 value={sortOption}
-                                onChange={(e) => { setSortOption(e.target.value); setCurrentPage(1); }}
+                                onChange={(e) => setSortOption(e.target.value)}
                             >
                                 <option value="recently_added">En Son Eklenen</option>
                                 <option value="first_added">İlk Eklenen</option>
@@ -206,12 +220,16 @@ const Campaigns = () => {
                                 </tr>
                             </thead>
                             <tbody className="divide-y divide-slate-100 text-sm">
-                                {paginatedCampaigns.length === 0 ? (
+                                {loading || (sortedCampaigns.length === 0 && hasMore) ? (
+                                    <tr>
+                                        <td colSpan="5" className="px-6 py-10 text-center text-slate-400 whitespace-nowrap">Kampanyalar yükleniyor...</td>
+                                    </tr>
+                                ) : sortedCampaigns.length === 0 ? (
                                     <tr>
                                         <td colSpan="5" className="px-6 py-10 text-center text-slate-400 whitespace-nowrap">Herhangi bir kampanya bulunamadı.</td>
                                     </tr>
                                 ) : (
-                                    paginatedCampaigns.map(campaign => {
+                                    sortedCampaigns.map(campaign => {
                                         const customer = customers.find(c => c.id === campaign.customer_id);
                                         return (
                                             <tr key={campaign.id} className="hover:bg-slate-50/80 transition-colors group">
@@ -268,30 +286,16 @@ const Campaigns = () => {
                             </tbody>
                         </table>
                     </div>
-                    {/* Pagination */}
-                    {totalPages > 1 && (
+                    {/* Load More */}
+                    {!loading && hasMore && (
                         <div className="flex items-center justify-between px-6 py-4 bg-slate-50 border-t border-slate-200">
                             <p className="text-sm text-slate-500 text-left">
-                                Toplam <span className="font-bold text-slate-700">{sortedCampaigns.length}</span> kampanya arasından <span className="font-bold text-slate-700">
-                                    {Math.min((currentPage - 1) * itemsPerPage + 1, sortedCampaigns.length)}-{Math.min(currentPage * itemsPerPage, sortedCampaigns.length)}
-                                </span> arası gösteriliyor
+                                <span className="font-bold text-slate-700">{sortedCampaigns.length}</span> kampanya gösteriliyor
+                                {loadAll && <span> · Tüm kampanyalar yükleniyor...</span>}
                             </p>
-                            <div className="flex items-center gap-2">
-                                <button
-                                    onClick={() => setCurrentPage(prev => Math.max(1, prev - 1))}
-                                    disabled={currentPage === 1}
-                                    className="p-2 border border-slate-200 bg-white rounded-lg text-slate-400 hover:text-primary hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed transition-all"
-                                >
-                                    <span className="material-symbols-outlined text-[18px]">chevron_left</span>
-                                </button>
-                                <button
-                                    onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
-                                    disabled={currentPage === totalPages}
-                                    className="p-2 border border-slate-200 bg-white rounded-lg text-slate-400 hover:text-primary hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed transition-all"
-                                >
-                                    <span className="material-symbols-outlined text-[18px]">chevron_right</span>
-                                </button>
-                            </div>
+                            {!loadAll && (
+                                <LoadMoreButton onClick={loadMore} loading={loadingMore} label="Daha Fazla Kampanya Yükle" />
+                            )}
                         </div>
                     )}
                 </div>
@@ -1,74 +1,82 @@
 import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate, Link, NavLink } from 'react-router-dom';
+import { usePagedList } from '../hooks/usePagedList';
 import { customersApi, campaignsApi } from '../services/api';
 import CampaignModal from '../components/CampaignModal';
+import LoadMoreButton from '../components/LoadMoreButton';
+
+const PAGE_SIZE = 10;
+// Fields the campaign table uses; the edit modal fetches the full campaign
+const CAMPAIGN_FIELDS = 'name,products,status,start_date,end_date,created_at';
 
 const CustomerDetails = () => {
     const { customerId } = useParams();
     const navigate = useNavigate();
 
     const [customer, setCustomer] = useState(null);
-    const [campaigns, setCampaigns] = useState([]);
     const [loading, setLoading] = useState(true);
     const [searchTerm, setSearchTerm] = useState('');
     const [statusFilter, setStatusFilter] = useState('Tümü');
-    const [currentPage, setCurrentPage] = useState(1);
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [editingCampaign, setEditingCampaign] = useState(null);
-    const itemsPerPage = 5;
+
+    // The API filters by status; a name search needs every campaign loaded
+    const loadAll = Boolean(searchTerm);
+
+    const {
+        items: campaigns,
+        setItems: setCampaigns,
+        loading: campaignsLoading,
+        loadingMore,
+        hasMore,
+        loadMore
+    } = usePagedList(
+        (pageToken) => campaignsApi.getPage({
+            customer_id: customerId,
+            status: statusFilter === 'Tümü' ? undefined : statusFilter,
+            limit: PAGE_SIZE,
+            page_token: pageToken || undefined,
+            fields: CAMPAIGN_FIELDS
+        }),
+        [customerId, statusFilter],
+        { loadAll }
+    );
 
     useEffect(() => {
-        const fetchData = async () => {
-            console.log("Fetching data for customerId:", customerId);
+        const fetchCustomer = async () => {
             setLoading(true);
-
-            // Fetch Customer
             try {
                 const customerData = await customersApi.getOne(customerId);
-                console.log("Customer data received:", customerData);
                 setCustomer(customerData);
             } catch (error) {
                 console.error("Error fetching customer details:", error);
             }
-
-            // Fetch Campaigns
-            try {
-                const campaignsData = await campaignsApi.getAll(customerId);
-                console.log("Campaigns data received:", campaignsData);
-                setCampaigns(campaignsData);
-            } catch (error) {
-                console.error("Error fetching campaigns:", error);
-                // If it's a 500 error, it might be the Firestore index issue
-                if (error.response?.status === 500) {
-                    console.warn("Possible missing Firestore index for campaigns query.");
-                }
-            }
-
             setLoading(false);
         };
 
         if (customerId) {
-            fetchData();
+            fetchCustomer();
         }
     }, [customerId]);
 
-    const filteredCampaigns = campaigns.filter(campaign => {
-        const matchesSearch = campaign.name.toLowerCase().includes(searchTerm.toLowerCase());
-        const matchesStatus = statusFilter === 'Tümü' || campaign.status === statusFilter;
-        return matchesSearch && matchesStatus;
-    });
-
-    const totalPages = Math.ceil(filteredCampaigns.length / itemsPerPage);
-    const paginatedCampaigns = filteredCampaigns.slice((currentPage - 1) * itemsPerPage, currentPage * itemsPerPage);
+    const filteredCampaigns = campaigns.filter(campaign =>
+        campaign.name.toLowerCase().includes(searchTerm.toLowerCase())
+    );
 
     const handleCreateClick = () => {
         setEditingCampaign(null);
         setIsModalOpen(true);
     };
 
-    const handleEditClick = (campaign) => {
-        setEditingCampaign(campaign);
-        setIsModalOpen(true);
+    const handleEditClick = async (campaign) => {
+        try {
+            // List rows only carry the table's fields
+            const fullCampaign = await campaignsApi.getOne(campaign.id);
+            setEditingCampaign(fullCampaign);
+            setIsModalOpen(true);
+        } catch (error) {
+            console.error("Failed to fetch campaign:", error);
+        }
     };
 
     const handleSaveCampaign = async (formData) => {
@@ -78,7 +86,7 @@ const CustomerDetails = () => {
                 setCampaigns(campaigns.map(c => c.id === updated.id ? updated : c));
             } else {
                 const created = await campaignsApi.create(formData);
-                setCampaigns([...campaigns, created]);
+                setCampaigns([created, ...campaigns]);
             }
         } catch (error) {
             console.error("Failed to save campaign:", error);
@@ -209,12 +217,16 @@ const CustomerDetails = () => {
                                 </tr>
                             </thead>
                             <tbody className="bg-white divide-y divide-slate-100">
-                                {paginatedCampaigns.length === 0 ? (
+                                {campaignsLoading || (filteredCampaigns.length === 0 && hasMore) ? (
+                                    <tr>
+                                        <td colSpan="4" className="px-6 py-10 text-center text-slate-400">Kampanyalar yükleniyor...</td>
+                                    </tr>
+                                ) : filteredCampaigns.length === 0 ? (
                                     <tr>
                                         <td colSpan="4" className="px-6 py-10 text-center text-slate-400">Kampanya bulunamadı.</td>
                                     </tr>
                                 ) : (
-                                    paginatedCampaigns.map(campaign => (
+                                    filteredCampaigns.map(campaign => (
                                         <tr key={campaign.id} className="hover:bg-slate-50/80 transition-colors group">
                                             <td className="px-6 py-4 whitespace-nowrap">
                                                 <div className="flex items-center">
@@ -264,30 +276,16 @@ const CustomerDetails = () => {
                             </tbody>
                         </table>
                     </div>
-                    {/* Pagination */}
-                    {totalPages > 1 && (
+                    {/* Load More */}
+                    {!campaignsLoading && hasMore && (
                         <div className="px-6 py-4 border-t border-slate-100 flex items-center justify-between">
                             <div className="text-sm text-slate-500 text-left">
-                                Toplam <span className="font-medium text-slate-900">{filteredCampaigns.length}</span> kampanyadan <span className="font-medium text-slate-900">
-                                    {Math.min((currentPage - 1) * itemsPerPage + 1, filteredCampaigns.length)}-{Math.min(currentPage * itemsPerPage, filteredCampaigns.length)}
-                                </span> arası gösteriliyor
-                            </div>
-                            <div className="flex gap-2">
-                                <button
-                                    onClick={() => setCurrentPage(prev => Math.max(1, prev - 1))}
-                                    disabled={currentPage === 1}
-                                    className="px-3 py-1 border border-slate-200 rounded-md text-sm text-slate-500 hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed"
-                                >
-                                    Önceki
-                                </button>
-                                <button
-                                    onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
-                                    disabled={currentPage === totalPages}
-                                    className="px-3 py-1 border border-slate-200 rounded-md text-sm text-slate-900 hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed"
-                                >
-                                    Sonraki
-                                </button>
+                                <span className="font-medium text-slate-900">{filteredCampaigns.length}</span> kampanya gösteriliyor
+                                {loadAll && <span> · Tüm kampanyalar yükleniyor...</span>}
                             </div>
+                            {!loadAll && (
+                                <LoadMoreButton onClick={loadMore} loading={loadingMore} label="Daha Fazla Kampanya Yükle" />
+                            )}
                         </div>
                     )}
                 </div>
@@ -1,44 +1,78 @@
 import React, { useState, useEffect } from 'react';
 import { useNavigate, Link } from 'react-router-dom';
 import { useAuth } from '../hooks/useAuth';
+import { usePagedList } from '../hooks/usePagedList';
 import { customersApi, campaignsApi } from '../services/api';
 import CustomerCard from '../components/CustomerCard';
 import CustomerModal from '../components/CustomerModal';
+import LoadMoreButton from '../components/LoadMoreButton';
+
+const PAGE_SIZE = 24;
+// Fields the customer cards and the edit modal use
+const CUSTOMER_FIELDS = 'name,website_url,phone_number,logo_url,enrichment_status,created_at';
+// Order the API returns customers in for each sort option; "recently operated"
+// depends on campaigns, so it is sorted here once every customer is loaded
+const SERVER_SORTS = {
+    alphabetical: 'name',
+    recently_added: '-created_at',
+    first_added: 'created_at',
+    recently_operated: 'created_at'
+};
+const STATUS_FILTERS = { active: 'Aktif', planned: 'Planlandı', draft: 'Taslak', completed: 'Tamamlandı' };
 
 const Customers = () => {
-    const [customers, setCustomers] = useState([]);
-    const [campaigns, setCampaigns] = useState([]);
-    const [loading, setLoading] = useState(true);
+    const [campaignLookup, setCampaignLookup] = useState({ key: null, items: [] });
+    const [campaignsLoading, setCampaignsLoading] = useState(false);
     const [searchTerm, setSearchTerm] = useState('');
     const [sortOption, setSortOption] = useState('alphabetical');
     const [filterOption, setFilterOption] = useState('all');
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [selectedCustomer, setSelectedCustomer] = useState(null);
-    const [currentPage, setCurrentPage] = useState(1);
     const { user } = useAuth();
     const navigate = useNavigate();
 
-    const ITEMS_PER_PAGE = 8;
+    // Search and campaign filters only see loaded customers, so they load the rest
+    const serverSort = SERVER_SORTS[sortOption];
+    const loadAll = Boolean(searchTerm) || filterOption !== 'all' || sortOption === 'recently_operated';
+
+    const { items: customers, setItems: setCustomers, loading, loadingMore, hasMore, loadMore } = usePagedList(
+        (pageToken) => customersApi.getPage({
+            limit: PAGE_SIZE,
+            page_token: pageToken || undefined,
+            fields: CUSTOMER_FIELDS,
+            sort: serverSort
+        }),
+        [serverSort],
+        { loadAll }
+    );
+
+    // Campaign filters and the "recently operated" sort need campaigns of every
+    // customer: a status filter only fetches campaigns with that status, the
+    // others every campaign, with just the fields the filter and sort read
+    const statusFilter = STATUS_FILTERS[filterOption];
+    const needsCampaigns = filterOption !== 'all' || sortOption === 'recently_operated';
+    const campaignsKey = !needsCampaigns ? null
+        : statusFilter && sortOption !== 'recently_operated' ? statusFilter : 'all';
+    const campaigns = campaignLookup.key === campaignsKey ? campaignLookup.items : [];
 
     useEffect(() => {
-        fetchData();
-    }, []);
+        if (!campaignsKey || campaignLookup.key === campaignsKey) return;
+        const fetchCampaigns = async () => {
+            try {
+                setCampaignsLoading(true);
+                const campaignsData = campaignsKey === 'all'
+                    ? await campaignsApi.getAll({ fields: 'customer_id,status,created_at' })
+                    : await campaignsApi.getAll({ status: campaignsKey, fields: 'customer_id,status' });
+                setCampaignLookup({ key: campaignsKey, items: campaignsData });
+            } catch (error) {
+                console.error("Failed to fetch campaigns:", error);
+            } finally {
+                setCampaignsLoading(false);
+            }
+        };
 
-    const fetchData = async () => {
-        try {
-            setLoading(true);
-            const [customersData, campaignsData] = await Promise.all([
-                customersApi.getAll(),
-                campaignsApi.getAll()
-            ]);
-            setCustomers(customersData);
-            setCampaigns(campaignsData);
-        } catch (error) {
-            console.error("Failed to fetch data:", error);
-        } finally {
-            setLoading(false);
-        }
-    };
+        fetchCampaigns();
+    }, [campaignsKey]);
 
     // Helper: Get campaigns for a customer
     const getCustomerCampaigns = (customerId) => {
@@ -72,6 +106,28 @@ const Customers = () => {
         setIsModalOpen(true);
     };
 
+    // Logo and phone are filled in by background enrichment after creation
+    const pollEnrichment = async (customerId, attempts = 10) => {
+        for (let i = 0; i < attempts; i++) {
+            await new Promise(resolve => setTimeout(resolve, 1500));
+            try {
+                const enrichment = await customersApi.getEnrichment(customerId);
+                if (enrichment.enrichment_status !== 'pending') {
+                    setCustomers(prev => prev.map(c => c.id === customerId ? {
+                        ...c,
+                        enrichment_status: enrichment.enrichment_status,
+                        logo_url: enrichment.logo_url,
+                        phone_number: enrichment.phone_number
+                    } : c));
+                    return;
+                }
+            } catch (error) {
+                console.error("Failed to fetch enrichment status:", error);
+                return;
+            }
+        }
+    };
+
     const handleSave = async (formData) => {
         try {
             if (selectedCustomer) {
@@ -80,6 +136,7 @@ const Customers = () => {
             } else {
                 const created = await customersApi.create(formData);
                 setCustomers([...customers, created]);
+                pollEnrichment(created.id);
             }
         } catch (error) {
             console.error("Failed to save customer:", error);
@@ -115,13 +172,10 @@ const Customers = () => {
             case 'without_campaigns':
                 return customerCampaigns.length === 0;
             case 'active':
-                return hasStatusCampaign(customer.id, 'Aktif');
             case 'planned':
-                return hasStatusCampaign(customer.id, 'Planlandı');
             case 'draft':
-                return hasStatusCampaign(customer.id, 'Taslak');
             case 'completed':
-                return hasStatusCampaign(customer.id, 'Tamamlandı');
+                return hasStatusCampaign(customer.id, statusFilter);
             default:
                 return true;
         }
@@ -145,20 +199,6 @@ const Customers = () => {
         }
     });
 
-    // Pagination calculations
-    const totalItems = sortedCustomers.length + 1;
-    const totalPages = Math.ceil(totalItems / ITEMS_PER_PAGE);
-    const startIndex = (currentPage - 1) * ITEMS_PER_PAGE;
-    const endIndex = startIndex + ITEMS_PER_PAGE;
-    const paginatedCustomers = sortedCustomers.slice(startIndex, endIndex);
-
-    const showAddCard = paginatedCustomers.length < ITEMS_PER_PAGE && currentPage === totalPages;
-
-    // Reset to page 1 when filters change
-    useEffect(() => {
-        setCurrentPage(1);
-    }, [searchTerm, sortOption, filterOption]);
-
     return (
         <div className="h-full overflow-y-auto p-4 md:p-6">
             <div className="max-w-7xl mx-auto flex flex-col min-h-full space-y-4">
@@ -244,7 +284,7 @@ const Customers = () => {
                 {/* Customer Grid */}
                 {/* Customer Grid */}
                 <div className="flex-1">
-                    {loading ? (
+                    {loading || campaignsLoading ? (
                         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
                             {[...Array(8)].map((_, i) => (
                                 <div key={i} className="bg-surface-light rounded-xl border border-slate-200 p-5 h-[270px] animate-pulse">
@@ -263,7 +303,7 @@ const Customers = () => {
                         </div>
                     ) : (
                         <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 xl:grid-cols-4 gap-6">
-                            {paginatedCustomers.map((customer) => (
+                            {sortedCustomers.map((customer) => (
                                 <CustomerCard
                                     key={customer.id}
                                     customer={customer}
@@ -273,7 +313,7 @@ const Customers = () => {
                                 />
                             ))}
                             {/* "Add New" Card */}
-                            {showAddCard && (
+                            {!hasMore && (
                                 <div
                                     onClick={handleAddClick}
                                     className="group bg-background-light rounded-xl border-2 border-dashed border-slate-300 p-5 hover:border-primary hover:bg-slate-50 transition-all duration-300 cursor-pointer flex flex-col items-center justify-center h-full min-h-[270px]"
@@ -288,38 +328,16 @@ const Customers = () => {
                     )}
                 </div>
 
-                {/* Pagination Info */}
+                {/* Load More */}
                 {!loading && (
                     <div className="flex items-center justify-between border-t border-slate-200 pt-6 mt-auto">
-                        <div className="text-sm text-slate-500">
-                            Toplam <span className="font-medium text-slate-900">{filteredCustomers.length}</span> müşteriden <span className="font-medium text-slate-900">
-                                {filteredCustomers.length > 0 && paginatedCustomers.length > 0
-                                    ? `${Math.min(startIndex + 1, filteredCustomers.length)}-${Math.min(endIndex, filteredCustomers.length)}`
-                                    : filteredCustomers.length === 0
-                                        ? "0"
-                                        : "-"
-                                }
-                            </span> arası gösteriliyor
-                        </div>
-                        <div className="flex items-center gap-3">
-                            <button
-                                onClick={() => setCurrentPage(prev => Math.max(1, prev - 1))}
-                                disabled={currentPage === 1}
-                                className="p-2 rounded-lg border border-slate-200 hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed text-slate-600 transition-all"
-                            >
-                                <span className="material-symbols-outlined text-[20px]">chevron_left</span>
-                            </button>
-                            <span className="text-sm font-medium text-slate-700 min-w-[60px] text-center">
-                                {currentPage} / {totalPages}
-                            </span>
-                            <button
-                                onClick={() => setCurrentPage(prev => Math.min(totalPages, prev + 1))}
-                                disabled={currentPage === totalPages}
-                                className="p-2 rounded-lg border border-slate-200 hover:bg-slate-50 disabled:opacity-50 disabled:cursor-not-allowed text-slate-600 transition-all"
-                            >
-                                <span className="material-symbols-outlined text-[20px]">chevron_right</span>
-                            </button>
+                        <div className="text-sm text-slate-500 text-left">
+                            <span className="font-medium text-slate-900">{filteredCustomers.length}</span> müşteri gösteriliyor
+                            {loadAll && hasMore && <span> · Tüm müşteriler yükleniyor...</span>}
                         </div>
+                        {hasMore && !loadAll && (
+                            <LoadMoreButton onClick={loadMore} loading={loadingMore} label="Daha Fazla Müşteri Yükle" />
+                        )}
                     </div>
                 )}
             </div>
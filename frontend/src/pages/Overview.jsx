@@ -23,24 +23,17 @@ const Overview = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const [customersData, campaignsData] = await Promise.all([
-                    customersApi.getAll(),
-                    campaignsApi.getAll()
+                // Customer names and logos for the activity table and the modal;
+                // only the five newest campaigns are fetched
+                const [customersData, campaignsPage] = await Promise.all([
+                    customersApi.getAll({ fields: 'name,logo_url' }),
+                    campaignsApi.getPage({ limit: 5, fields: 'name,products,customer_id,status,created_at' })
                 ]);
 
                 setCustomers(customersData);
 
-                // Calculate stats
-                const activeCustomersCount = customersData.length;
-                const totalCampaignsCount = campaignsData.length;
-
-                // Recent 5 activities - sorted by most recently operated
-                const sortedCampaigns = [...campaignsData].sort((a, b) => {
-                    const dateA = new Date(a.updated_at || a.created_at);
-                    const dateB = new Date(b.updated_at || b.created_at);
-                    return dateB - dateA;
-                });
-                const recent = sortedCampaigns.slice(0, 5).map(c => {
+                // Recent 5 activities, newest first
+                const recent = campaignsPage.items.map(c => {
                     const customer = customersData.find(cust => cust.id === c.customer_id);
                     return {
                         ...c,
@@ -52,9 +45,8 @@ const Overview = () => {
 
                 setStats(prev => ({
                     ...prev,
-                    totalCampaigns: totalCampaignsCount,
-                    // messagesThisMonth is managed by fetchTrendData, preserve it
-                    activeCustomers: activeCustomersCount,
+                    // totalCampaigns comes from fetchCampaignStats, messagesThisMonth from fetchTrendData
+                    activeCustomers: customersData.length,
                     totalCustomers: customersData.length
                 }));
                 setRecentActivities(recent);
@@ -82,6 +74,7 @@ const Overview = () => {
             try {
                 const statsData = await analyticsApi.getCampaignStats();
                 setCampaignStats(statsData);
+                setStats(prev => ({ ...prev, totalCampaigns: statsData.total_campaigns }));
             } catch (error) {
                 console.error("Error fetching campaign stats:", error);
             }
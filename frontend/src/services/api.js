@@ -32,6 +32,11 @@ export const refineSms = async (data) => {
   return response.data;
 };
 
+export const refineSmsBatch = async (items) => {
+  const response = await api.post('/refine-sms/batch', { items });
+  return response.data;
+};
+
 export const getToneRecommendations = async (params) => {
   const response = await api.get('/tone-recommendations', { params });
   return response.data;
@@ -42,9 +47,26 @@ export const healthCheck = async () => {
   return response.data;
 };
 
+// List endpoints return { items, next_page_token } instead of a bare array.
+// List views fetch one page at a time (see usePagedList); walking every page
+// is only for lookups that really need the whole list, so pass fields.
+const getAllPages = async (url, params = {}) => {
+  const items = [];
+  let pageToken = null;
+  do {
+    const response = await api.get(url, { params: { ...params, page_token: pageToken || undefined } });
+    items.push(...response.data.items);
+    pageToken = response.data.next_page_token;
+  } while (pageToken);
+  return items;
+};
+
 export const customersApi = {
-  getAll: async () => {
-    const response = await api.get('/customers/');
+  // Every customer; params: { fields }
+  getAll: async (params = {}) => getAllPages('/customers/', params),
+  // params: { limit, page_token, fields, sort: 'created_at' | '-created_at' | 'name' }
+  getPage: async (params = {}) => {
+    const response = await api.get('/customers/', { params });
     return response.data;
   },
   getOne: async (id) => {
@@ -55,6 +77,10 @@ export const customersApi = {
     const response = await api.post('/customers/', data);
     return response.data;
   },
+  getEnrichment: async (id) => {
+    const response = await api.get(`/customers/${id}/enrichment`);
+    return response.data;
+  },
   update: async (id, data) => {
     const response = await api.put(`/customers/${id}`, data);
     return response.data;
@@ -66,9 +92,11 @@ export const customersApi = {
 };
 
 export const campaignsApi = {
-  getAll: async (customerId = null) => {
-    const url = customerId ? `/campaigns/?customer_id=${customerId}` : '/campaigns/';
-    const response = await api.get(url);
+  // Every campaign; params: { customer_id, status, fields }
+  getAll: async (params = {}) => getAllPages('/campaigns/', params),
+  // params: { customer_id, status, limit, page_token, fields }
+  getPage: async (params = {}) => {
+    const response = await api.get('/campaigns/', { params });
     return response.data;
   },
   getOne: async (id) => {
@@ -91,8 +119,9 @@ export const campaignsApi = {
     const response = await api.post(`/campaigns/${campaignId}/messages`, data);
     return response.data;
   },
-  getMessages: async (campaignId) => {
-    const response = await api.get(`/campaigns/${campaignId}/messages`);
+  // params: { limit, page_token, fields }
+  getMessagesPage: async (campaignId, params = {}) => {
+    const response = await api.get(`/campaigns/${campaignId}/messages`, { params });
     return response.data;
   },
   deleteMessage: async (campaignId, messageId) => {
@@ -109,6 +138,10 @@ export const analyticsApi = {
   getCampaignStats: async () => {
     const response = await api.get('/campaigns/analytics/campaign-stats');
     return response.data;
+  },
+  getSummary: async (params = {}) => {
+    const response = await api.get('/campaigns/analytics/summary', { params });
+    return response.data;
   }
 };
 